@@ -0,0 +1,177 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Generic, Hashable, Optional, TypeVar
+import hashlib
+import threading
+import time
+import os
+from dotenv import load_dotenv
+
+from app.core.compression import encode_all
+
+load_dotenv()
+
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+PUBLIC_PORTFOLIO_CACHE_TTL_SECONDS = float(os.getenv("PUBLIC_PORTFOLIO_CACHE_TTL_SECONDS", "300"))
+PUBLIC_PORTFOLIO_CACHE_MAX_ENTRIES = int(os.getenv("PUBLIC_PORTFOLIO_CACHE_MAX_ENTRIES", "5000"))
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """
+    Thread-safe in-process cache with per-entry expiry and LRU eviction.
+
+    A ttl of 0 (or max_entries of 0) disables the cache: every lookup misses
+    and nothing is stored.
+
+    To fill on a miss without racing writers, take generation() before
+    loading the value and pass it to set(): if the key was invalidated in
+    between, the value may predate the write and is not stored.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        # Bumped by every invalidation. _invalidated keeps the generation of
+        # each key's latest one (at most max_entries of them); _forgotten is
+        # the newest generation dropped from it, and fills that started
+        # before it are refused since we can no longer tell.
+        self._generation = 0
+        self._invalidated: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._forgotten = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def set(self, key: Hashable, value: V, generation: Optional[int] = None) -> None:
+        """
+        Store value under key. With a generation from generation(), nothing
+        is stored if key was invalidated since it was taken.
+        """
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            if generation is not None and (
+                generation < self._forgotten or self._invalidated.get(key, 0) > generation
+            ):
+                return
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._generation += 1
+            self._invalidated[key] = self._generation
+            self._invalidated.move_to_end(key)
+            while len(self._invalidated) > self.max_entries:
+                self._forgotten = self._invalidated.popitem(last=False)[1]
+            if self._data.pop(key, None) is not None:
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            # Fills already in flight must not repopulate the cache
+            self._generation += 1
+            self._forgotten = self._generation
+            self._invalidated.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+            }
+
+
+# Authenticated users keyed by token subject (the user id). Entries are
+# detached ORM objects; writes to a user must call invalidate_principal.
+# Other workers only see a change once their entry expires, so keep the
+# TTL short.
+principal_cache: "TTLCache[Any]" = TTLCache(PRINCIPAL_CACHE_TTL_SECONDS, PRINCIPAL_CACHE_MAX_ENTRIES)
+
+def invalidate_principal(user_id: Any) -> None:
+    """
+    Drop the cached principal for a user after their row changed
+    """
+    principal_cache.invalidate(str(user_id))
+
+
+@dataclass(frozen=True)
+class RenderedResponse:
+    """
+    A serialized JSON body, its strong ETag, and the body compressed in
+    each content coding worth sending (see app.core.compression.encode_all),
+    so compression is paid once per cache fill rather than per request
+    """
+    body: bytes
+    etag: str
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "RenderedResponse":
+        return cls(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"', encoded=encode_all(body))
+
+    def etag_for(self, coding: Optional[str]) -> str:
+        # Each coding is a different representation, so it gets its own tag
+        return self.etag if coding is None else f'{self.etag[:-1]}-{coding}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches etag. The comparison is weak,
+    so a W/ prefix on either side still matches.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in (tag.removeprefix("W/") for tag in candidates)
+
+
+# Public portfolio bodies keyed by user id. Every crud write that touches a
+# user's portfolio calls invalidate_portfolio, so entries only go stale
+# across workers, and then for at most the TTL.
+portfolio_cache: "TTLCache[RenderedResponse]" = TTLCache(
+    PUBLIC_PORTFOLIO_CACHE_TTL_SECONDS, PUBLIC_PORTFOLIO_CACHE_MAX_ENTRIES
+)
+
+def invalidate_portfolio(user_id: Any) -> None:
+    """
+    Drop the cached public portfolio for a user after any of its rows changed
+    """
+    portfolio_cache.invalidate(str(user_id))
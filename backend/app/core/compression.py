@@ -0,0 +1,219 @@
+import gzip
+import os
+import zlib
+from typing import Dict, Iterable, Optional
+
+from dotenv import load_dotenv
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pinned in requirements.txt; responses are only gzipped without it
+    brotli = None
+
+load_dotenv()
+
+# Compress responses for clients that send Accept-Encoding: br or gzip.
+# Bodies under COMPRESSION_MIN_BYTES are sent as they are; framing and
+# headers would eat most of the saving.
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+# Per-response levels favour speed; bodies compressed once for a cache
+# entry use the slower, tighter CACHED_* levels
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+CACHED_GZIP_LEVEL = 9
+CACHED_BROTLI_QUALITY = 9
+
+# Codings we can produce, best first
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+}
+
+
+def accepted_encodings(accept_encoding: str) -> set:
+    """
+    The content codings an Accept-Encoding header allows (those without q=0)
+    """
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def choose_encoding(accept_encoding: str, available: Iterable[str] = ENCODINGS) -> Optional[str]:
+    """
+    The first of available the client accepts, or None for identity
+    """
+    if not accept_encoding:
+        return None
+    accepted = accepted_encodings(accept_encoding)
+    for coding in available:
+        if coding in accepted:
+            return coding
+    return None
+
+
+def encode(body: bytes, coding: str, gzip_level: int = CACHED_GZIP_LEVEL, brotli_quality: int = CACHED_BROTLI_QUALITY) -> bytes:
+    if coding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+def encode_all(body: bytes) -> Dict[str, bytes]:
+    """
+    body in every coding we can produce, for storing next to a cached
+    body. Empty when compression is off, body is under the threshold, or
+    no coding makes it smaller.
+    """
+    if not COMPRESSION_ENABLED or len(body) < COMPRESSION_MIN_BYTES:
+        return {}
+    encoded = {coding: encode(body, coding) for coding in ENCODINGS}
+    return {coding: data for coding, data in encoded.items() if len(data) < len(body)}
+
+
+def _compressible_type(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+    return content_type.startswith("text/") or content_type in COMPRESSIBLE_TYPES
+
+
+def _compressible(message: Message, headers: Headers) -> bool:
+    if message["status"] < 200 or message["status"] in (204, 206, 304):
+        return False
+    if "content-encoding" in headers or "no-transform" in headers.get("cache-control", ""):
+        return False
+    return _compressible_type(headers)
+
+
+def _vary_on_encoding(start: Message) -> None:
+    """
+    Mark a compressible response as depending on Accept-Encoding, whether
+    or not this one was compressed: a shared cache must not hand an
+    identity copy to a client that accepts br, or a small body's entry to
+    a later, larger one.
+    """
+    headers = MutableHeaders(scope=start)
+    if _compressible_type(headers) and "accept-encoding" not in headers.get("vary", "").lower():
+        headers.add_vary_header("Accept-Encoding")
+
+
+class _Encoder:
+    def __init__(self, coding: str):
+        if coding == "br":
+            self._compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+            self._compress = self._compressor.process
+        else:
+            self._compressor = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+            self._compress = self._compressor.compress
+        self.coding = coding
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish() if self.coding == "br" else self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """
+    Compress text and JSON responses with br or gzip, whichever the client
+    accepts (br preferred, when the brotli package is installed).
+
+    Responses that already carry a Content-Encoding (precompressed cache
+    entries and static files, gzipped exports) pass through untouched, as
+    do partial, empty and HEAD responses and bodies smaller than
+    minimum_size. Streamed bodies are compressed chunk by chunk. Strong
+    ETags become weak, since the compressed bytes differ from the ones
+    they were computed for. Every response of a compressible type gets
+    Vary: Accept-Encoding, compressed or not.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = None
+        if scope["method"] != "HEAD":
+            coding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if coding is None:
+            async def vary_send(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    _vary_on_encoding(message)
+                await send(message)
+
+            await self.app(scope, receive, vary_send)
+            return
+
+        start: Optional[Message] = None
+        encoder: Optional[_Encoder] = None
+        passthrough = False
+
+        async def compressing_send(message: Message) -> None:
+            nonlocal start, encoder, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows whether the
+                # response is worth compressing
+                _vary_on_encoding(message)
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is not None:
+                data = encoder.compress(body)
+                if not more_body:
+                    data += encoder.finish()
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+                return
+
+            headers = MutableHeaders(scope=start)
+            content_length = headers.get("content-length")
+            known_size = int(content_length) if content_length and content_length.isdigit() else None
+            if not _compressible(start, headers) or (
+                len(body) < self.minimum_size if not more_body else (known_size is not None and known_size < self.minimum_size)
+            ):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            encoder = _Encoder(coding)
+            data = encoder.compress(body)
+            if not more_body:
+                data += encoder.finish()
+                if len(data) >= len(body):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                headers["content-length"] = str(len(data))
+            elif "content-length" in headers:
+                del headers["content-length"]
+            headers["content-encoding"] = coding
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["etag"] = f"W/{etag}"
+            await send(start)
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, compressing_send)
@@ -1,40 +1,208 @@
 import logging
-from typing import Dict
+import os
+import smtplib
+from abc import ABC, abstractmethod
+import uuid
+from dataclasses import dataclass
+from email.message import EmailMessage
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from dotenv import load_dotenv
+
+load_dotenv()
 
-# In a real app, you would use an email sending service like SendGrid, SMTP, etc.
-# This is a mock implementation
 logger = logging.getLogger(__name__)
 
+# Delivery backend: "log" only logs the message (the default for local
+# development), "file" writes .eml files to EMAIL_FILE_DIR and "smtp" sends
+# through EMAIL_SMTP_HOST. For an SMTP stand-in while testing, run
+# `python -m aiosmtpd -n -l localhost:1025` and point the smtp backend at it.
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "log")
+EMAIL_FROM = os.getenv("EMAIL_FROM", "Showcasify <no-reply@showcasify.local>")
+EMAIL_FILE_DIR = os.getenv("EMAIL_FILE_DIR", "./sent_emails")
+EMAIL_SMTP_HOST = os.getenv("EMAIL_SMTP_HOST", "localhost")
+EMAIL_SMTP_PORT = int(os.getenv("EMAIL_SMTP_PORT", "1025"))
+EMAIL_SMTP_USERNAME = os.getenv("EMAIL_SMTP_USERNAME")
+EMAIL_SMTP_PASSWORD = os.getenv("EMAIL_SMTP_PASSWORD")
+EMAIL_SMTP_STARTTLS = os.getenv("EMAIL_SMTP_STARTTLS", "false").lower() == "true"
+EMAIL_SMTP_TIMEOUT = float(os.getenv("EMAIL_SMTP_TIMEOUT", "10"))
+FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
+
+TEMPLATES: Dict[str, str] = {
+    "reset_password.html": (
+        "Hi {username},\n\n"
+        "We received a request to reset your Showcasify password. "
+        "Use the link below within 24 hours to choose a new one:\n\n"
+        "{reset_url}\n\n"
+        "If you did not ask for this, you can ignore this email."
+    ),
+}
+
+@dataclass
+class OutgoingEmail:
+    email_to: str
+    subject: str
+    template_name: str
+    template_data: Dict[str, str]
+
+def render_template(template_name: str, template_data: Dict[str, str]) -> str:
+    """
+    Render the plain-text body for a template
+    """
+    template = TEMPLATES.get(template_name)
+    if template is None:
+        return "\n".join(f"{key}: {value}" for key, value in template_data.items())
+    return template.format(**template_data)
+
+def build_message(email: OutgoingEmail) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = EMAIL_FROM
+    message["To"] = email.email_to
+    message["Subject"] = email.subject
+    message.set_content(render_template(email.template_name, email.template_data))
+    return message
+
+
+class EmailBackend(ABC):
+    """
+    Delivers a batch of emails. send_messages returns one entry per email:
+    None when it was delivered, otherwise the error text.
+    """
+
+    @abstractmethod
+    def send_messages(self, emails: Sequence[OutgoingEmail]) -> List[Optional[str]]:
+        ...
+
+
+class LogEmailBackend(EmailBackend):
+    def send_messages(self, emails: Sequence[OutgoingEmail]) -> List[Optional[str]]:
+        for email in emails:
+            # Not the template data: it can hold secrets such as reset links
+            logger.info(
+                f"Mock email sent to: {email.email_to}, subject: {email.subject}, "
+                f"template: {email.template_name}"
+            )
+        return [None] * len(emails)
+
+
+class FileEmailBackend(EmailBackend):
+    """
+    Writes every email to its own .eml file, for local testing
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def send_messages(self, emails: Sequence[OutgoingEmail]) -> List[Optional[str]]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        results: List[Optional[str]] = []
+        for email in emails:
+            try:
+                path = self.directory / f"{uuid.uuid4()}.eml"
+                path.write_bytes(bytes(build_message(email)))
+                results.append(None)
+            except OSError as exc:
+                results.append(str(exc))
+        return results
+
+
+class SMTPEmailBackend(EmailBackend):
+    """
+    Sends a whole batch over a single SMTP connection
+    """
+
+    def __init__(self, host: str, port: int, username: Optional[str] = None, password: Optional[str] = None,
+                 starttls: bool = False, timeout: float = 10):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+
+    def send_messages(self, emails: Sequence[OutgoingEmail]) -> List[Optional[str]]:
+        try:
+            connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        except (OSError, smtplib.SMTPException) as exc:
+            return [f"SMTP connection failed: {exc}"] * len(emails)
+
+        results: List[Optional[str]] = []
+        try:
+            if self.starttls:
+                connection.starttls()
+            if self.username:
+                connection.login(self.username, self.password or "")
+            for email in emails:
+                try:
+                    connection.send_message(build_message(email))
+                    results.append(None)
+                except smtplib.SMTPException as exc:
+                    results.append(str(exc))
+        except (OSError, smtplib.SMTPException) as exc:
+            results.extend([str(exc)] * (len(emails) - len(results)))
+        finally:
+            try:
+                connection.quit()
+            except (OSError, smtplib.SMTPException):
+                pass
+        return results
+
+
+def get_email_backend() -> EmailBackend:
+    if EMAIL_BACKEND == "file":
+        return FileEmailBackend(EMAIL_FILE_DIR)
+    if EMAIL_BACKEND == "smtp":
+        return SMTPEmailBackend(
+            EMAIL_SMTP_HOST,
+            EMAIL_SMTP_PORT,
+            username=EMAIL_SMTP_USERNAME,
+            password=EMAIL_SMTP_PASSWORD,
+            starttls=EMAIL_SMTP_STARTTLS,
+            timeout=EMAIL_SMTP_TIMEOUT,
+        )
+    return LogEmailBackend()
+
 def send_email(email_to: str, subject: str, template_name: str, template_data: Dict[str, str]) -> bool:
     """
-    Send email using the provided template and data.
-    
-    In a real application, this would use an email service or SMTP.
-    For this example, we'll just log the email details.
+    Send email immediately through the configured backend.
+
+    Request handlers should queue mail with app.core.email_queue.enqueue_email
+    instead, so delivery latency and failures stay out of the request.
     """
-    logger.info(
-        f"Mock email sent to: {email_to}, subject: {subject}, "
-        f"template: {template_name}, data: {template_data}"
+    email = OutgoingEmail(email_to=email_to, subject=subject, template_name=template_name, template_data=template_data)
+    error = get_email_backend().send_messages([email])[0]
+    if error:
+        logger.error(f"Failed to send email to {email_to}: {error}")
+    return error is None
+
+def reset_password_email(email_to: str, token: str, username: str) -> OutgoingEmail:
+    """
+    Build the password reset email for a user.
+
+    The link carries the plaintext token, so the outbox row holding it is
+    emptied once the email is sent or given up on (see
+    app.core.email_queue).
+    """
+    reset_url = f"{FRONTEND_URL}/reset-password?token={token}"
+    return OutgoingEmail(
+        email_to=email_to,
+        subject="Password Reset Request",
+        template_name="reset_password.html",
+        template_data={
+            "username": username,
+            "reset_url": reset_url,
+        },
     )
-    return True
 
 def send_reset_password_email(email_to: str, token: str, username: str) -> bool:
     """
     Send a password reset email with the reset token
     """
-    subject = "Password Reset Request"
-    template_name = "reset_password.html"
-    reset_url = f"http://localhost:3000/reset-password?token={token}"
-    
-    template_data = {
-        "username": username,
-        "reset_url": reset_url,
-        "token": token
-    }
-    
+    email = reset_password_email(email_to, token, username)
     return send_email(
-        email_to=email_to,
-        subject=subject,
-        template_name=template_name,
-        template_data=template_data
-    ) 
\ No newline at end of file
+        email_to=email.email_to,
+        subject=email.subject,
+        template_name=email.template_name,
+        template_data=email.template_data
+    )
@@ -0,0 +1,247 @@
+import logging
+import os
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.email import EmailBackend, OutgoingEmail, get_email_backend
+from app.database.database import SessionLocal
+from app.models.outbox import EmailOutbox
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+EMAIL_WORKER_ENABLED = os.getenv("EMAIL_WORKER_ENABLED", "true").lower() == "true"
+EMAIL_WORKER_THREADS = int(os.getenv("EMAIL_WORKER_THREADS", "1"))
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "20"))
+EMAIL_POLL_INTERVAL = float(os.getenv("EMAIL_POLL_INTERVAL", "5"))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "6"))
+EMAIL_RETRY_BASE_SECONDS = float(os.getenv("EMAIL_RETRY_BASE_SECONDS", "10"))
+EMAIL_RETRY_MAX_SECONDS = float(os.getenv("EMAIL_RETRY_MAX_SECONDS", "3600"))
+# How long a claimed row stays invisible to other workers; a worker that dies
+# mid-send releases its batch once the lease runs out.
+EMAIL_CLAIM_LEASE_SECONDS = float(os.getenv("EMAIL_CLAIM_LEASE_SECONDS", "120"))
+# Sent and failed rows are kept this long (for debugging delivery) before
+# purge_finished_emails deletes them
+EMAIL_OUTBOX_RETENTION_HOURS = float(os.getenv("EMAIL_OUTBOX_RETENTION_HOURS", "168"))
+PURGE_BATCH_SIZE = 1000
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+def retry_delay(attempts: int) -> float:
+    """
+    Exponential backoff with jitter for the given number of failed attempts
+    """
+    delay = min(EMAIL_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0)), EMAIL_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+def enqueue_email(db: Session, email: OutgoingEmail) -> EmailOutbox:
+    """
+    Store an email in the outbox and wake the dispatcher.
+
+    The row is committed before this returns, so the email survives a
+    crash even if nothing delivers it right away. Its template data stays
+    in the table only until the email is sent or given up on.
+    """
+    row = EmailOutbox(
+        email_to=email.email_to,
+        subject=email.subject,
+        template_name=email.template_name,
+        template_data=email.template_data,
+    )
+    db.add(row)
+    db.commit()
+    email_dispatcher.notify()
+    return row
+
+async def enqueue_email_async(db: AsyncSession, email: OutgoingEmail) -> EmailOutbox:
+    """
+    Same as enqueue_email, through AsyncSession
+    """
+    row = EmailOutbox(
+        email_to=email.email_to,
+        subject=email.subject,
+        template_name=email.template_name,
+        template_data=email.template_data,
+    )
+    db.add(row)
+    await db.commit()
+    email_dispatcher.notify()
+    return row
+
+
+class EmailDispatcher:
+    """
+    Background worker threads that drain the email outbox.
+
+    Each worker claims a batch of due rows (FOR UPDATE SKIP LOCKED, so
+    several workers or processes never claim the same row), hands the batch
+    to the delivery backend in one go and records the outcome. Failed rows
+    are retried with exponential backoff until EMAIL_MAX_ATTEMPTS.
+    """
+
+    def __init__(self, backend: Optional[EmailBackend] = None, threads: int = 1, batch_size: int = 20,
+                 poll_interval: float = 5):
+        self.backend = backend
+        self.threads = max(1, threads)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._workers: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._sent = 0
+        self._retried = 0
+        self._failed = 0
+
+    @property
+    def running(self) -> bool:
+        return any(worker.is_alive() for worker in self._workers)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        if self.backend is None:
+            self.backend = get_email_backend()
+        self._stopping.clear()
+        self._workers = [
+            threading.Thread(target=self._run, name=f"email-dispatcher-{index}", daemon=True)
+            for index in range(self.threads)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        self._stopping.set()
+        self._wake.set()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"sent": self._sent, "retried": self._retried, "failed": self._failed}
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            try:
+                while not self._stopping.is_set() and self.dispatch_once() == self.batch_size:
+                    pass
+            except Exception:
+                logger.exception("Email dispatcher iteration failed")
+
+    def dispatch_once(self) -> int:
+        """
+        Claim and deliver one batch, returning how many emails were claimed
+        """
+        # Rows must stay loaded across the claim commit and the send
+        db = SessionLocal(expire_on_commit=False)
+        try:
+            batch = self._claim_batch(db)
+            if not batch:
+                return 0
+            emails = [
+                OutgoingEmail(row.email_to, row.subject, row.template_name, row.template_data)
+                for row in batch
+            ]
+            results = self.backend.send_messages(emails)
+            self._record_results(db, batch, results)
+            return len(batch)
+        finally:
+            db.close()
+
+    def _claim_batch(self, db: Session) -> List[EmailOutbox]:
+        now = _utcnow()
+        batch = (
+            db.query(EmailOutbox)
+            .filter(
+                or_(EmailOutbox.status == EmailOutbox.PENDING, EmailOutbox.status == EmailOutbox.SENDING),
+                EmailOutbox.next_attempt_at <= now,
+            )
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        lease_until = now + timedelta(seconds=EMAIL_CLAIM_LEASE_SECONDS)
+        for row in batch:
+            row.status = EmailOutbox.SENDING
+            row.attempts += 1
+            row.next_attempt_at = lease_until
+        db.commit()
+        return batch
+
+    def _record_results(self, db: Session, batch: List[EmailOutbox], results: List[Optional[str]]) -> None:
+        now = _utcnow()
+        sent = retried = failed = 0
+        for row, error in zip(batch, results):
+            if error is None:
+                row.status = EmailOutbox.SENT
+                row.sent_at = now
+                row.last_error = None
+                # Drop secrets such as reset links once nothing will send them
+                row.template_data = {}
+                sent += 1
+            elif row.attempts >= EMAIL_MAX_ATTEMPTS:
+                row.status = EmailOutbox.FAILED
+                row.last_error = error
+                row.template_data = {}
+                failed += 1
+                logger.error(f"Giving up on email {row.id} to {row.email_to} after {row.attempts} attempts: {error}")
+            else:
+                row.status = EmailOutbox.PENDING
+                row.last_error = error
+                row.next_attempt_at = now + timedelta(seconds=retry_delay(row.attempts))
+                retried += 1
+                logger.warning(f"Email {row.id} to {row.email_to} failed, will retry: {error}")
+        db.commit()
+        with self._lock:
+            self._sent += sent
+            self._retried += retried
+            self._failed += failed
+
+
+def purge_finished_emails(db: Session, batch_size: int = PURGE_BATCH_SIZE) -> int:
+    """
+    Delete sent and failed outbox rows older than EMAIL_OUTBOX_RETENTION_HOURS
+    in batches, returning how many were removed. Each batch is its own short
+    transaction, so the purge never holds locks on a large part of the table.
+    """
+    cutoff = _utcnow() - timedelta(hours=EMAIL_OUTBOX_RETENTION_HOURS)
+    purged = 0
+    while True:
+        finished = (
+            select(EmailOutbox.id)
+            .where(
+                EmailOutbox.status.in_([EmailOutbox.SENT, EmailOutbox.FAILED]),
+                EmailOutbox.created_at <= cutoff,
+            )
+            .limit(batch_size)
+        )
+        deleted = db.execute(
+            delete(EmailOutbox).where(EmailOutbox.id.in_(finished.scalar_subquery()))
+        ).rowcount
+        db.commit()
+        purged += deleted
+        if deleted < batch_size:
+            return purged
+
+
+email_dispatcher = EmailDispatcher(
+    threads=EMAIL_WORKER_THREADS,
+    batch_size=EMAIL_BATCH_SIZE,
+    poll_interval=EMAIL_POLL_INTERVAL,
+)
@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+import os
+import uuid
+import zlib
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Users read from the database per server-side cursor fetch
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+# Encoded output is sent in chunks of about this many bytes
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+CSV_COLUMNS = (
+    "id", "email", "name", "role", "bio", "avatar", "created_at",
+    "skills", "contact_info", "social_links", "experiences", "educations", "projects",
+)
+# Nested values are written to CSV cells as JSON
+_CSV_JSON_COLUMNS = {"skills", "contact_info", "social_links", "experiences", "educations", "projects"}
+# Spreadsheets run cells starting with these as formulas
+_CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=_json_default, ensure_ascii=False, separators=(",", ":"))
+
+
+def ndjson_lines(rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    for row in rows:
+        yield (_dumps(row) + "\n").encode()
+
+
+def csv_lines(rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    for row in rows:
+        writer.writerow([
+            _csv_safe(_dumps(row[column]) if column in _CSV_JSON_COLUMNS else _csv_scalar(row[column]))
+            for column in CSV_COLUMNS
+        ])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def _csv_scalar(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _csv_safe(value: Any) -> Any:
+    # User-controlled text such as a name of "=HYPERLINK(...)" must open as
+    # text, not run as a formula; a leading quote makes spreadsheets do so
+    if isinstance(value, str) and value.startswith(_CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def chunked(pieces: Iterable[bytes], size: int = EXPORT_CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    Coalesce small pieces into chunks of about size bytes
+    """
+    buffer = bytearray()
+    for piece in pieces:
+        buffer += piece
+        if len(buffer) >= size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def gzipped(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Gzip a stream on the fly, holding only the compressor's window
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
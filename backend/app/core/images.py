@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Longest edge, in pixels, of each generated variant
+IMAGE_VARIANT_SIZES = [int(size) for size in os.getenv("IMAGE_VARIANT_SIZES", "64,256,1024").split(",")]
+IMAGE_PROCESS_WORKERS = int(os.getenv("IMAGE_PROCESS_WORKERS", "2"))
+IMAGE_WEBP_QUALITY = int(os.getenv("IMAGE_WEBP_QUALITY", "80"))
+# Images with more pixels than this are refused before they are decoded: a
+# small compressed upload can expand to gigabytes of pixels
+IMAGE_MAX_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", "40000000"))
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def generate_variants(
+    source: str, directory: str, stem: str, sizes: List[int], quality: int, max_pixels: int = IMAGE_MAX_PIXELS
+) -> Dict[str, str]:
+    """
+    Write one WebP per size as <stem>_<size>.webp and return {size: filename}.
+
+    Runs in a worker process. The image is re-encoded from pixels only, so
+    EXIF, GPS and other metadata never reach the variants; the EXIF
+    orientation is applied first so the pixels still face the right way.
+    Images are never upscaled.
+
+    Raises ValueError for images over max_pixels, checked from the header
+    before any pixels are decoded. JPEGs are decoded straight at a reduced
+    scale when the largest variant allows it, and each variant is shrunk
+    from the one before it, largest first, so the full-size image is never
+    copied.
+    """
+    from PIL import Image, ImageOps
+
+    # Also the limit for formats Pillow decodes while opening
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    variants: Dict[str, str] = {}
+
+    with Image.open(source) as original:
+        width, height = original.size
+        if width * height > max_pixels:
+            raise ValueError(f"Image is {width}x{height}, over the {max_pixels} pixel limit")
+        largest = max(sizes)
+        original.draft(None, (largest, largest))
+        image = ImageOps.exif_transpose(original)
+        has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+        image = image.convert("RGBA" if has_alpha else "RGB")
+        for size in sorted(sizes, reverse=True):
+            image.thumbnail((size, size), Image.LANCZOS)
+            filename = f"{stem}_{size}.webp"
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".variant-", suffix=".webp")
+            try:
+                with os.fdopen(fd, "wb") as temp:
+                    image.save(temp, "WEBP", quality=quality, method=4)
+                os.replace(temp_path, os.path.join(directory, filename))
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+                raise
+            variants[str(size)] = filename
+    return variants
+
+
+def get_image_pool() -> ProcessPoolExecutor:
+    """
+    Lazily started process pool. Workers are spawned rather than forked so
+    they do not inherit the server's threads or database connections.
+    """
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=IMAGE_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def _discard_broken_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Drop a pool whose worker died (killed, out of memory, crashed in a
+    decoder) so the next upload starts a fresh one. A broken pool fails
+    every later submission, so keeping it would end variant generation
+    until a restart.
+    """
+    global _pool
+    if _pool is pool:
+        logger.warning("Image process pool broke, starting a new one for the next upload")
+        _pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_image_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+
+
+async def create_variants(source: Path, directory: Path, stem: str) -> Optional[Dict[str, str]]:
+    """
+    Generate the resized WebP variants of an uploaded raster image in
+    directory, off the event loop and outside this process. Returns None
+    when the image could not be decoded, in which case only the original
+    is served.
+    """
+    loop = asyncio.get_running_loop()
+    source = source.resolve()
+    pool = get_image_pool()
+    try:
+        return await loop.run_in_executor(
+            pool,
+            generate_variants,
+            str(source),
+            str(directory.resolve()),
+            stem,
+            IMAGE_VARIANT_SIZES,
+            IMAGE_WEBP_QUALITY,
+            IMAGE_MAX_PIXELS,
+        )
+    except BrokenProcessPool:
+        logger.exception(f"Could not generate variants for {source}")
+        _discard_broken_pool(pool)
+        return None
+    except Exception:
+        logger.exception(f"Could not generate variants for {source}")
+        return None
@@ -0,0 +1,96 @@
+import json
+import os
+from typing import AsyncIterator, Dict, List
+
+from dotenv import load_dotenv
+from pydantic import TypeAdapter, ValidationError
+
+from app.schemas.imports import ExperienceLine, ImportLine, ProjectLine, ResumeImport
+
+load_dotenv()
+
+# Most entries (experiences + educations + projects) one import may carry
+IMPORT_MAX_ITEMS = int(os.getenv("IMPORT_MAX_ITEMS", "1000"))
+# Most bytes an NDJSON import may stream, and the longest single line
+IMPORT_MAX_BYTES = int(os.getenv("IMPORT_MAX_BYTES", str(5 * 1024 * 1024)))
+IMPORT_MAX_LINE_BYTES = 64 * 1024
+# Validation errors reported before giving up on the rest of the stream
+IMPORT_MAX_ERRORS = 50
+
+_line_adapter = TypeAdapter(ImportLine)
+
+
+class ImportRejected(Exception):
+    """
+    Raised when an import fails validation; nothing has been written
+    """
+
+    def __init__(self, errors: List[Dict], status_code: int = 422):
+        super().__init__(f"{len(errors)} invalid entries")
+        self.errors = errors
+        self.status_code = status_code
+
+
+def validation_errors(exc: ValidationError) -> List[Dict]:
+    # Only the JSON-safe parts; ctx can hold the raised exception
+    return [{"loc": list(error["loc"]), "msg": error["msg"], "type": error["type"]} for error in exc.errors()]
+
+
+def check_item_count(data: ResumeImport) -> None:
+    count = len(data.experiences) + len(data.educations) + len(data.projects)
+    if count > IMPORT_MAX_ITEMS:
+        raise ImportRejected([{"msg": f"At most {IMPORT_MAX_ITEMS} entries per import, got {count}"}], 413)
+
+
+async def parse_ndjson(chunks: AsyncIterator[bytes]) -> ResumeImport:
+    """
+    Validate an NDJSON stream of {"type": "experience" | "education" |
+    "project", ...} objects, one per line, as it arrives.
+
+    Blank lines are skipped. Every line is validated before anything is
+    written; ImportRejected carries the errors with their line numbers
+    (up to IMPORT_MAX_ERRORS of them).
+    """
+    data = ResumeImport()
+    errors: List[Dict] = []
+    received = 0
+    line_number = 0
+    buffer = b""
+
+    def take(line: bytes) -> None:
+        nonlocal line_number
+        line_number += 1
+        if not line.strip():
+            return
+        try:
+            entry = _line_adapter.validate_python(json.loads(line))
+        except ValueError as exc:
+            detail = validation_errors(exc) if isinstance(exc, ValidationError) else [{"msg": "Invalid JSON"}]
+            errors.append({"line": line_number, "errors": detail})
+            return
+        if len(data.experiences) + len(data.educations) + len(data.projects) >= IMPORT_MAX_ITEMS:
+            raise ImportRejected([{"line": line_number, "msg": f"At most {IMPORT_MAX_ITEMS} entries per import"}], 413)
+        if isinstance(entry, ExperienceLine):
+            data.experiences.append(entry)
+        elif isinstance(entry, ProjectLine):
+            data.projects.append(entry)
+        else:
+            data.educations.append(entry)
+
+    async for chunk in chunks:
+        received += len(chunk)
+        if received > IMPORT_MAX_BYTES:
+            raise ImportRejected([{"msg": f"Import is larger than the {IMPORT_MAX_BYTES // 1024} KB limit"}], 413)
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            take(line)
+            if len(errors) >= IMPORT_MAX_ERRORS:
+                raise ImportRejected(errors)
+        if len(buffer) > IMPORT_MAX_LINE_BYTES:
+            raise ImportRejected([{"line": line_number + 1, "msg": f"Line is longer than {IMPORT_MAX_LINE_BYTES} bytes"}], 413)
+    take(buffer)
+
+    if errors:
+        raise ImportRejected(errors)
+    return data
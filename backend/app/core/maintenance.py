@@ -0,0 +1,86 @@
+import logging
+import os
+import random
+import threading
+from typing import Callable, Optional
+
+from dotenv import load_dotenv
+
+from app.core.email_queue import purge_finished_emails
+from app.crud.user import purge_expired_reset_tokens
+from app.database.database import SessionLocal
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+RESET_TOKEN_PURGE_ENABLED = os.getenv("RESET_TOKEN_PURGE_ENABLED", "true").lower() == "true"
+RESET_TOKEN_PURGE_INTERVAL = float(os.getenv("RESET_TOKEN_PURGE_INTERVAL", "3600"))
+OUTBOX_PURGE_ENABLED = os.getenv("OUTBOX_PURGE_ENABLED", "true").lower() == "true"
+OUTBOX_PURGE_INTERVAL = float(os.getenv("OUTBOX_PURGE_INTERVAL", "3600"))
+
+
+class PeriodicTask:
+    """
+    Runs job on a daemon thread every interval seconds until stopped.
+
+    The first run is delayed by a random fraction of the interval so that
+    several workers started together do not all run the job at once.
+    """
+
+    def __init__(self, name: str, interval: float, job: Callable[[], None]):
+        self.name = name
+        self.interval = interval
+        self.job = job
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        delay = random.uniform(0, self.interval)
+        while not self._stopping.wait(delay):
+            try:
+                self.job()
+            except Exception:
+                logger.exception(f"Periodic task {self.name} failed")
+            delay = self.interval
+
+
+def purge_reset_tokens() -> None:
+    db = SessionLocal()
+    try:
+        purged = purge_expired_reset_tokens(db)
+    finally:
+        db.close()
+    if purged:
+        logger.info(f"Purged {purged} expired password reset tokens")
+
+
+def purge_outbox() -> None:
+    db = SessionLocal()
+    try:
+        purged = purge_finished_emails(db)
+    finally:
+        db.close()
+    if purged:
+        logger.info(f"Purged {purged} finished outbox emails")
+
+
+reset_token_purger = PeriodicTask("reset-token-purge", RESET_TOKEN_PURGE_INTERVAL, purge_reset_tokens)
+outbox_purger = PeriodicTask("outbox-purge", OUTBOX_PURGE_INTERVAL, purge_outbox)
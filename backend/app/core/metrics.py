@@ -0,0 +1,247 @@
+import os
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+load_dotenv()
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+# Set by gunicorn.conf.py: every worker writes its samples to files in this
+# directory and /metrics aggregates them, whichever worker serves the scrape.
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route and status code", ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being served", ["method"], multiprocess_mode="livesum"
+)
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries issued per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+HTTP_REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent in database queries per HTTP request",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+DB_QUERIES = Counter("db_queries_total", "Database queries executed", ["engine"])
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Database query latency",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Time spent in bcrypt, excluding time queued for the hashing pool",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 2, 5),
+)
+UPLOAD_BYTES = Counter("upload_bytes_total", "Bytes of accepted uploads", ["prefix", "transport"])
+UPLOAD_SIZE = Histogram(
+    "upload_size_bytes",
+    "Size of accepted uploads",
+    ["prefix", "transport"],
+    buckets=(16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024),
+)
+
+
+class RequestQueries:
+    """
+    Database work done on behalf of the current request
+    """
+
+    __slots__ = ("count", "seconds")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+
+
+# Set per request by MetricsMiddleware. Sync endpoints and dependencies run
+# in the threadpool with a copy of the context, which still points at the
+# same RequestQueries object.
+current_request_queries: ContextVar[Optional[RequestQueries]] = ContextVar(
+    "current_request_queries", default=None
+)
+
+
+def instrument_engine(engine, name: str) -> None:
+    """
+    Count and time every statement run through a (sync or async) engine
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    queries = DB_QUERIES.labels(name)
+    duration = DB_QUERY_DURATION.labels(name)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+        queries.inc()
+        duration.observe(elapsed)
+        request = current_request_queries.get()
+        if request is not None:
+            request.count += 1
+            request.seconds += elapsed
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(context):
+        started = context.connection.info.get("query_started_at") if context.connection is not None else None
+        if started:
+            started.pop()
+
+
+def observe_password_hash(operation: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap a passlib call so its run time is recorded under operation
+    """
+    histogram = PASSWORD_HASH_DURATION.labels(operation)
+
+    def timed(*args: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            histogram.observe(time.perf_counter() - started)
+
+    return timed
+
+
+def observe_upload(prefix: str, transport: str, size: int) -> None:
+    UPLOAD_BYTES.labels(prefix, transport).inc(size)
+    UPLOAD_SIZE.labels(prefix, transport).observe(size)
+
+
+class StatsCollector:
+    """
+    Expose a stats() dict (pool, hashing queue, outbox, ...) as gauges named
+    <prefix>_<key>. These are read from the process serving the scrape, so
+    in multiprocess mode they carry a pid label.
+    """
+
+    def __init__(self, prefix: str, stats: Callable[[], Dict[str, Any]]):
+        self.prefix = prefix
+        self.stats = stats
+
+    def collect(self):
+        labels = {"pid": str(os.getpid())} if MULTIPROCESS else {}
+        for key, value in self.stats().items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            gauge = GaugeMetricFamily(f"{self.prefix}_{key}", f"{self.prefix} {key}", labels=list(labels))
+            gauge.add_metric(list(labels.values()), value)
+            yield gauge
+
+
+_stats_collectors: List[StatsCollector] = []
+
+
+def register_stats(prefix: str, stats: Callable[[], Dict[str, Any]]) -> None:
+    collector = StatsCollector(prefix, stats)
+    _stats_collectors.append(collector)
+    if not MULTIPROCESS:
+        REGISTRY.register(collector)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Prometheus text exposition of every metric, aggregated over all
+    workers in multiprocess mode
+    """
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        for collector in _stats_collectors:
+            registry.register(collector)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+# Methods kept as label values; clients can send any token as a method
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "CONNECT", "TRACE"})
+
+
+def _method_label(scope: Scope) -> str:
+    method = scope["method"]
+    return method if method in HTTP_METHODS else "other"
+
+
+def _route_label(scope: Scope) -> str:
+    # Templates, not raw paths, to keep label cardinality bounded
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if scope.get("root_path"):
+        return scope["root_path"] + "/{path}"
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Record latency, status and database work for every HTTP request,
+    labelled by the route template that served it.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = _method_label(scope)
+        status_code = 500
+        queries = RequestQueries()
+        token = current_request_queries.set(queries)
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_progress.dec()
+            current_request_queries.reset(token)
+            route = _route_label(scope)
+            HTTP_REQUEST_DURATION.labels(method, route).observe(elapsed)
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+            HTTP_REQUEST_DB_QUERIES.labels(route).observe(queries.count)
+            HTTP_REQUEST_DB_SECONDS.labels(route).observe(queries.seconds)
@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Generic, List, Optional, Sequence, TypeVar
+import base64
+import json
+import uuid
+
+from sqlalchemy import REAL, and_, cast, literal, or_, tuple_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+T = TypeVar("T")
+
+
+class InvalidCursor(ValueError):
+    """
+    Raised when a pagination cursor cannot be decoded
+    """
+
+
+@dataclass
+class Page(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
+def encode_cursor(created_at: datetime, id: uuid.UUID) -> str:
+    """
+    Opaque cursor pointing just past the row with this (created_at, id)
+    """
+    return _encode([created_at.isoformat(), str(id)])
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        created_at, id = _decode(cursor)
+        return datetime.fromisoformat(created_at), uuid.UUID(id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Invalid pagination cursor") from exc
+
+
+def encode_rank_cursor(rank: float, id: uuid.UUID) -> str:
+    """
+    Opaque cursor pointing just past the row with this (rank, id)
+    """
+    return _encode([rank, str(id)])
+
+
+def decode_rank_cursor(cursor: str) -> tuple:
+    try:
+        rank, id = _decode(cursor)
+        if not isinstance(rank, (int, float)) or isinstance(rank, bool):
+            raise TypeError("rank must be a number")
+        return float(rank), uuid.UUID(id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Invalid pagination cursor") from exc
+
+
+def _encode(value: Any) -> str:
+    raw = json.dumps(value, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> Any:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def keyset_query(query: Any, created_col: Any, id_col: Any, cursor: Optional[str], limit: int) -> Any:
+    """
+    Restrict a Query or Select to one page in (created_at, id) order.
+
+    Fetches one extra row so make_page can tell whether another page
+    exists. The row comparison walks an index on (created_at, id), or on
+    (professional_info_id, created_at, id) for lists within one portfolio,
+    so every page costs the same no matter how deep it is. created_at is
+    NOT NULL on every table paged this way, so the cursor always has one.
+    """
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        query = query.filter(
+            tuple_(created_col, id_col)
+            > tuple_(literal(created_at, created_col.type), literal(id, id_col.type))
+        )
+    return query.order_by(created_col, id_col).limit(limit + 1)
+
+
+def ranked_keyset_query(query: Any, rank_col: Any, id_col: Any, cursor: Optional[str], limit: int) -> Any:
+    """
+    Like keyset_query, for results in descending rank order with the id as
+    tie-breaker. Ranks are single precision (ts_rank and friends), so the
+    cursor value is compared as REAL to match the row it came from exactly.
+    """
+    if cursor:
+        rank, id = decode_rank_cursor(cursor)
+        last_rank = cast(literal(rank), REAL)
+        query = query.filter(
+            or_(rank_col < last_rank, and_(rank_col == last_rank, id_col > literal(id, id_col.type)))
+        )
+    return query.order_by(rank_col.desc(), id_col).limit(limit + 1)
+
+
+def make_page(
+    rows: Sequence[T], limit: int, total: Optional[int] = None, cursor_for: Optional[Callable[[T], str]] = None
+) -> "Page[T]":
+    """
+    Trim the extra row fetched by keyset_query into a Page. cursor_for
+    builds the cursor from the last item; by default from its created_at
+    and id.
+    """
+    items = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit and items:
+        last = items[-1]
+        next_cursor = cursor_for(last) if cursor_for else encode_cursor(last.created_at, last.id)
+    return Page(items=items, next_cursor=next_cursor, total=total)
+
+
+def set_page_headers(response: Any, page: Page) -> None:
+    """
+    Expose the cursor and optional total as headers so list endpoints can
+    keep returning a plain JSON array
+    """
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    if page.total is not None:
+        response.headers["X-Total-Count"] = str(page.total)
@@ -0,0 +1,155 @@
+import logging
+import os
+import re
+import traceback
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Per-request SQL inspection. Off by default: when enabled every statement
+# records a short stack, which is cheap but not free.
+QUERY_INSPECTOR_ENABLED = os.getenv("QUERY_INSPECTOR_ENABLED", "false").lower() == "true"
+# Warn when a request runs more statements than this
+QUERY_COUNT_THRESHOLD = int(os.getenv("QUERY_COUNT_THRESHOLD", "20"))
+# Warn when one statement shape runs this many times in a request (N+1)
+QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "5"))
+# Debug only: report the count in an X-Query-Count response header
+QUERY_COUNT_HEADER = os.getenv("QUERY_COUNT_HEADER", "false").lower() == "true"
+
+_APP_DIR = str(Path(__file__).resolve().parent.parent)
+_THIS_FILE = str(Path(__file__).resolve())
+
+# Bound parameter lists as rendered by psycopg2, sqlite and asyncpg, e.g.
+# IN (%(id_1_1)s, %(id_1_2)s) or VALUES (?, ?, ?)
+_PARAM_LIST = re.compile(r"\(\s*(?:%\(\w+\)s|\?|\$\d+)(?:\s*,\s*(?:%\(\w+\)s|\?|\$\d+))*\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalise a statement so that runs differing only in parameters, the
+    length of IN lists or literal numbers compare equal
+    """
+    shape = _PARAM_LIST.sub("(?)", statement)
+    shape = _NUMBER.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+def _caller() -> str:
+    """
+    The innermost frames of application code that led to the statement
+    """
+    frames = [
+        frame for frame in traceback.extract_stack()
+        if frame.filename.startswith(_APP_DIR) and frame.filename != _THIS_FILE
+    ]
+    return " <- ".join(
+        f"{os.path.relpath(frame.filename, _APP_DIR)}:{frame.lineno} in {frame.name}"
+        for frame in reversed(frames[-3:])
+    ) or "<outside app code>"
+
+
+@dataclass
+class ShapeStats:
+    count: int = 0
+    callers: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class RequestStatements:
+    count: int = 0
+    shapes: Dict[str, ShapeStats] = field(default_factory=dict)
+
+    def record(self, statement: str) -> None:
+        self.count += 1
+        stats = self.shapes.setdefault(statement_shape(statement), ShapeStats())
+        stats.count += 1
+        caller = _caller()
+        stats.callers[caller] = stats.callers.get(caller, 0) + 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, ShapeStats]]:
+        return sorted(
+            ((shape, stats) for shape, stats in self.shapes.items() if stats.count >= threshold),
+            key=lambda item: item[1].count,
+            reverse=True,
+        )
+
+
+_current_statements: ContextVar[Optional[RequestStatements]] = ContextVar("current_statements", default=None)
+
+
+def install_query_inspector(engine) -> None:
+    """
+    Record every statement run through a (sync or async) engine into the
+    current request's RequestStatements, if any
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements = _current_statements.get()
+        if statements is not None:
+            statements.record(statement)
+
+
+def _report(method: str, path: str, statements: RequestStatements) -> None:
+    if statements.count > QUERY_COUNT_THRESHOLD:
+        logger.warning(
+            f"{method} {path} ran {statements.count} SQL statements "
+            f"(threshold {QUERY_COUNT_THRESHOLD}, {len(statements.shapes)} distinct)"
+        )
+    for shape, stats in statements.repeated(QUERY_REPEAT_THRESHOLD):
+        callers = "; ".join(
+            f"{count}x from {caller}"
+            for caller, count in sorted(stats.callers.items(), key=lambda item: item[1], reverse=True)
+        )
+        logger.warning(
+            f"Possible N+1 in {method} {path}: statement ran {stats.count} times: "
+            f"{shape[:300]} [{callers}]"
+        )
+
+
+class QueryInspectorMiddleware:
+    """
+    Count the SQL statements each request runs and warn about requests
+    over QUERY_COUNT_THRESHOLD or repeating one statement shape at least
+    QUERY_REPEAT_THRESHOLD times, with the app code that issued them.
+
+    X-Query-Count, when enabled, counts the statements run before the
+    response started, which is all of them except for streamed bodies.
+    """
+
+    def __init__(self, app: ASGIApp, count_header: bool = False):
+        self.app = app
+        self.count_header = count_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        statements = RequestStatements()
+        token = _current_statements.set(statements)
+
+        async def send_with_count(message: Message) -> None:
+            if self.count_header and message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-Query-Count"] = str(statements.count)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            _current_statements.reset(token)
+            _report(scope["method"], scope["path"], statements)
@@ -0,0 +1,295 @@
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+from dotenv import load_dotenv
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
+
+from app.schemas.user import PasswordReset
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Token buckets throttling login and password reset attempts, per client IP
+# and per account. Limits are "<attempts>/<seconds>": a bucket holds up to
+# <attempts> and refills completely over <seconds>.
+#
+# The memory store is per process, so with several workers each one allows
+# the full limit; use RATE_LIMIT_BACKEND=redis (RATE_LIMIT_REDIS_URL) to
+# share buckets between workers and hosts.
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+# Buckets the memory store keeps before dropping the least recently used
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+LOGIN_RATE_LIMIT_IP = os.getenv("LOGIN_RATE_LIMIT_IP", "20/60")
+LOGIN_RATE_LIMIT_ACCOUNT = os.getenv("LOGIN_RATE_LIMIT_ACCOUNT", "10/300")
+PASSWORD_RESET_RATE_LIMIT_IP = os.getenv("PASSWORD_RESET_RATE_LIMIT_IP", "5/300")
+PASSWORD_RESET_RATE_LIMIT_ACCOUNT = os.getenv("PASSWORD_RESET_RATE_LIMIT_ACCOUNT", "3/3600")
+
+KEY_PREFIX = "ratelimit"
+
+_limiter: Optional["RateLimiter"] = None
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    capacity: int
+    period_seconds: float
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        attempts, _, seconds = value.partition("/")
+        limit = cls(int(attempts), float(seconds))
+        if limit.capacity < 1 or limit.period_seconds <= 0:
+            raise ValueError(f"Invalid rate limit {value!r}")
+        return limit
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.period_seconds
+
+
+class RateLimitStore(ABC):
+    """
+    Token buckets by key. take() removes one token from key's bucket and
+    returns 0 when there was one, otherwise the seconds until there is.
+    refund() puts a taken token back, for attempts that turned out not to
+    count.
+    """
+
+    @abstractmethod
+    def take(self, key: str, limit: RateLimit) -> float:
+        ...
+
+    @abstractmethod
+    def refund(self, key: str, limit: RateLimit) -> None:
+        ...
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """
+    Buckets in this process, at most max_keys of them (least recently used
+    dropped first, which only ever forgives attempts)
+    """
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, limit: RateLimit) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (limit.capacity, now))
+            tokens = min(limit.capacity, tokens + (now - updated_at) * limit.refill_per_second)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+            else:
+                retry_after = (1 - tokens) / limit.refill_per_second
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+    def refund(self, key: str, limit: RateLimit) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if key not in self._buckets:
+                return
+            tokens, updated_at = self._buckets[key]
+            tokens = min(limit.capacity, tokens + (now - updated_at) * limit.refill_per_second + 1)
+            self._buckets[key] = (tokens, now)
+
+
+# KEYS[1] bucket; ARGV capacity, tokens per second, now (s). Returns the
+# milliseconds to wait, 0 when a token was taken. Buckets expire once they
+# would be full again.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+local wait_ms = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait_ms = math.ceil((1 - tokens) / rate * 1000)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return wait_ms
+"""
+
+# Same arguments; puts one token back. A missing bucket has expired, so it
+# is already full.
+TOKEN_REFUND_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+if not bucket[1] then
+    return 0
+end
+local tokens = tonumber(bucket[1])
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate + 1)
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return 0
+"""
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """
+    Buckets in Redis (or anything speaking its protocol and Lua), updated
+    atomically by TOKEN_BUCKET_SCRIPT and TOKEN_REFUND_SCRIPT so every
+    worker shares them.
+
+    client is a redis-py client, or a compatible one such as
+    fakeredis.FakeRedis for local runs. When the server can't be reached
+    attempts are let through rather than locking everyone out.
+    """
+
+    def __init__(self, client: Any):
+        self.client = client
+        self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+        self._refund_script = client.register_script(TOKEN_REFUND_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisRateLimitStore":
+        import redis
+
+        return cls(redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5))
+
+    def take(self, key: str, limit: RateLimit) -> float:
+        try:
+            wait_ms = self._script(keys=[key], args=[limit.capacity, limit.refill_per_second, time.time()])
+        except Exception as exc:
+            logger.warning(f"Rate limit store unavailable, allowing the attempt: {exc!r}")
+            return 0.0
+        return int(wait_ms) / 1000
+
+    def refund(self, key: str, limit: RateLimit) -> None:
+        try:
+            self._refund_script(keys=[key], args=[limit.capacity, limit.refill_per_second, time.time()])
+        except Exception as exc:
+            logger.warning(f"Rate limit store unavailable, attempt not refunded: {exc!r}")
+
+
+def _bucket_key(name: str, kind: str, identity: str) -> str:
+    return f"{KEY_PREFIX}:{name}:{kind}:{identity}"
+
+
+class RateLimiter:
+    def __init__(self, store: RateLimitStore):
+        self.store = store
+
+    def check(self, name: str, limits: Tuple[Tuple[str, str, RateLimit], ...]) -> None:
+        """
+        Take a token from each (kind, identity, limit) bucket of name, in
+        order, raising 429 with Retry-After at the first empty one
+        """
+        for kind, identity, limit in limits:
+            retry_after = self.store.take(_bucket_key(name, kind, identity), limit)
+            if retry_after > 0:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many attempts, please try again later",
+                    headers={"Retry-After": str(math.ceil(retry_after))},
+                )
+
+    def refund(self, name: str, kind: str, identity: str, limit: RateLimit) -> None:
+        """
+        Give back the token check() took from one bucket
+        """
+        self.store.refund(_bucket_key(name, kind, identity), limit)
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    The configured rate limiter, created on first use
+    """
+    global _limiter
+    if _limiter is None:
+        if RATE_LIMIT_BACKEND == "redis":
+            store = RedisRateLimitStore.from_url(RATE_LIMIT_REDIS_URL)
+        else:
+            store = MemoryRateLimitStore()
+        _limiter = RateLimiter(store)
+    return _limiter
+
+
+def client_ip(request: Request) -> str:
+    # Behind a proxy this is the forwarded address when uvicorn/gunicorn
+    # trust the proxy (forwarded_allow_ips)
+    return request.client.host if request.client else "unknown"
+
+
+def account_key(email: str) -> str:
+    # Hashed so the store never holds addresses
+    return hashlib.sha256(email.strip().lower().encode()).hexdigest()[:32]
+
+
+def throttle(request: Request, name: str, email: str, ip_limit: RateLimit, account_limit: RateLimit) -> None:
+    """
+    Count an attempt by the request's client IP and by the account email,
+    raising 429 when either is over its limit
+    """
+    if not RATE_LIMIT_ENABLED:
+        return
+    get_rate_limiter().check(name, (
+        ("ip", client_ip(request), ip_limit),
+        ("account", account_key(email), account_limit),
+    ))
+
+
+_login_ip_limit = RateLimit.parse(LOGIN_RATE_LIMIT_IP)
+_login_account_limit = RateLimit.parse(LOGIN_RATE_LIMIT_ACCOUNT)
+_password_reset_ip_limit = RateLimit.parse(PASSWORD_RESET_RATE_LIMIT_IP)
+_password_reset_account_limit = RateLimit.parse(PASSWORD_RESET_RATE_LIMIT_ACCOUNT)
+
+
+def limit_login_attempts(request: Request, form_data: OAuth2PasswordRequestForm = Depends()) -> None:
+    """
+    Throttle logins by IP and by username. Declared in the route's
+    dependencies so it runs before the user lookup and bcrypt check.
+
+    Every attempt takes an account token up front, so concurrent guesses
+    cannot all get past the check. Routes give it back with
+    refund_login_attempt when the login succeeds, so only failed attempts
+    count against the account.
+    """
+    throttle(request, "login", form_data.username, _login_ip_limit, _login_account_limit)
+
+
+def refund_login_attempt(username: str) -> None:
+    """
+    Give back the account token of a login that succeeded
+    """
+    if not RATE_LIMIT_ENABLED:
+        return
+    get_rate_limiter().refund("login", "account", account_key(username), _login_account_limit)
+
+
+def limit_password_reset_requests(http_request: Request, request: PasswordReset) -> None:
+    """
+    Throttle password reset requests by IP and by email, before the user
+    lookup. The body parameter shares the route's name, so FastAPI parses
+    it once.
+    """
+    throttle(http_request, "password_reset", request.email, _password_reset_ip_limit, _password_reset_account_limit)
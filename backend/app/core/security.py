@@ -1,9 +1,16 @@
 from datetime import datetime, timedelta
-from typing import Any, Optional, Union
+from typing import Any, Callable, Dict, Optional, TypeVar, Union
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
+import hashlib
+import threading
+import time
 
 from jose import jwt
 from passlib.context import CryptContext
 
+from app.core.metrics import observe_password_hash
+
 # These should be in environment variables in a production environment
 
 
@@ -16,7 +23,132 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-if-not-set")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 
+# Password hashing pool: bcrypt releases the GIL while hashing, so a thread
+# pool sized to the number of cores gives real parallelism without pickling.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+_hash = observe_password_hash("hash", pwd_context.hash)
+_verify = observe_password_hash("verify", pwd_context.verify)
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(Exception):
+    """
+    Raised when the password hashing queue is full and the job was rejected
+    """
+
+
+class PasswordHasher:
+    """
+    Bounded worker pool for CPU-heavy password hashing.
+
+    At most ``max_workers`` hashes run at once and at most ``max_pending``
+    more may wait for a worker; anything beyond that is rejected with
+    PasswordHasherBusy instead of queueing without limit.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(0, max_pending)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="password-hash"
+        )
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_pending)
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._in_flight = 0
+        self._running = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    def submit(self, fn: Callable[..., T], *args: Any) -> "Future[T]":
+        """
+        Schedule fn on the pool, raising PasswordHasherBusy if the queue is full
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PasswordHasherBusy("Password hashing queue is full")
+
+        enqueued_at = time.perf_counter()
+        with self._lock:
+            self._submitted += 1
+            self._in_flight += 1
+
+        def run() -> T:
+            started_at = time.perf_counter()
+            with self._lock:
+                self._running += 1
+                self._wait_seconds += started_at - enqueued_at
+            failed = True
+            try:
+                result = fn(*args)
+                failed = False
+                return result
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._in_flight -= 1
+                    self._run_seconds += time.perf_counter() - started_at
+                    if failed:
+                        self._failed += 1
+                    else:
+                        self._completed += 1
+
+        try:
+            future = self._executor.submit(run)
+        except BaseException:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run fn on the pool and block the calling thread until it finishes
+        """
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run fn on the pool without blocking the event loop
+        """
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Snapshot of the pool counters
+        """
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "in_flight": self._in_flight,
+                "running": self._running,
+                "queued": self._in_flight - self._running,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "wait_seconds_total": self._wait_seconds,
+                "run_seconds_total": self._run_seconds,
+                "avg_run_seconds": self._run_seconds / finished if finished else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
 
 def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -31,14 +163,35 @@ def create_access_token(subject: Union[str, Any], expires_delta: Optional[timede
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def hash_reset_token(token: str) -> str:
+    """
+    Digest under which a password reset token is stored and looked up.
+    Tokens are 256 random bits, so a fast unsalted hash is enough. This
+    only protects tokens at rest in password_reset_tokens; the outbox
+    holds the emailed link until it is delivered.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify that a plain password matches a hashed password
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.run(_verify, plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """
     Hash a password for storage
     """
-    return pwd_context.hash(password) 
\ No newline at end of file
+    return password_hasher.run(_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password on the hashing pool without blocking the event loop
+    """
+    return await password_hasher.run_async(_verify, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password on the hashing pool without blocking the event loop
+    """
+    return await password_hasher.run_async(_hash, password)
\ No newline at end of file
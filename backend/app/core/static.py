@@ -0,0 +1,191 @@
+import mimetypes
+import os
+import re
+from typing import Optional, Tuple
+
+import anyio
+from dotenv import load_dotenv
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.cache import etag_matches
+from app.core.compression import accepted_encodings
+from app.core.storage import ACTIVE_CONTENT_TYPES
+from app.core.uploads import CONTENT_HASH_LENGTH
+
+load_dotenv()
+
+UPLOADS_MAX_AGE = int(os.getenv("UPLOADS_MAX_AGE", str(365 * 24 * 60 * 60)))
+
+# <sha256 prefix>.<ext> originals and <sha256 prefix>_<size>.webp variants
+CONTENT_ADDRESSED = re.compile(rf"^([0-9a-f]{{{CONTENT_HASH_LENGTH}}}(?:_\d+)?)\.[a-z0-9]+$")
+# Precompressed siblings written by app.core.storage.precompress, best first
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+PRECOMPRESSED_TYPES = {"image/svg+xml"}
+
+# Uploaded SVGs are served from the API origin: when opened directly they
+# download, and if rendered anyway they get no scripts, forms or origin
+ACTIVE_CONTENT_HEADERS = {
+    "content-security-policy": "sandbox",
+    "content-disposition": "attachment",
+}
+
+mimetypes.add_type("image/webp", ".webp")
+mimetypes.add_type("image/avif", ".avif")
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `bytes=` range into inclusive (start, end) offsets.
+
+    Returns None when the header should be ignored (malformed, another
+    unit, or several ranges, which are served as the full file), and
+    raises ValueError when the range cannot be satisfied.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = (value.strip() for value in spec.strip().partition("-"))
+    if not sep or not (first or last) or not (first or "0").isdigit() or not (last or "0").isdigit():
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise ValueError("Unsatisfiable suffix range")
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and start > end:
+        return None
+    if start >= size:
+        raise ValueError("Range starts past the end of the file")
+    return start, min(end, size - 1)
+
+
+class PartialFileResponse(Response):
+    """
+    206 response streaming the inclusive byte range [start, end] of a file.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(self, path: str, start: int, end: int, headers: dict, media_type: str, method: str) -> None:
+        super().__init__(status_code=206, headers=headers, media_type=media_type)
+        self.path = path
+        self.start = start
+        self.end = end
+        self.send_body = method != "HEAD"
+        self.headers["content-length"] = str(end - start + 1)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if not self.send_body:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        remaining = self.end - self.start + 1
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+class UploadStaticFiles(StaticFiles):
+    """
+    StaticFiles for user uploads.
+
+    Content-addressed files never change, so they are served with a
+    far-future `immutable` Cache-Control and a strong ETag taken from the
+    hash in their name. Anything else (legacy per-user names) must be
+    revalidated. Single byte ranges are honoured, and SVGs are served from
+    their precompressed .br/.gz siblings when the client accepts them.
+    Nothing is content-sniffed, and SVGs are sandboxed downloads.
+    """
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        method = scope["method"]
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+        name = os.path.basename(full_path)
+        media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        match = CONTENT_ADDRESSED.match(name)
+
+        headers = {"accept-ranges": "bytes", "x-content-type-options": "nosniff"}
+        if media_type in ACTIVE_CONTENT_TYPES:
+            headers.update(ACTIVE_CONTENT_HEADERS)
+        encoding = None
+        if media_type in PRECOMPRESSED_TYPES:
+            headers["vary"] = "Accept-Encoding"
+            accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+            for coding, suffix in PRECOMPRESSED:
+                if coding in accepted:
+                    try:
+                        encoded_stat = os.stat(full_path + suffix)
+                    except FileNotFoundError:
+                        continue
+                    full_path, stat_result, encoding = full_path + suffix, encoded_stat, coding
+                    headers["content-encoding"] = coding
+                    break
+
+        if match:
+            headers["cache-control"] = f"public, max-age={UPLOADS_MAX_AGE}, immutable"
+        else:
+            headers["cache-control"] = "no-cache"
+
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            method=method,
+            stat_result=stat_result,
+        )
+        if match:
+            tag = match.group(1) if encoding is None else f"{match.group(1)}-{encoding}"
+            response.headers["etag"] = f'"{tag}"'
+        etag = response.headers["etag"]
+
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            if etag_matches(if_none_match, etag):
+                return _not_modified(response.headers)
+        elif self.is_not_modified(response.headers, request_headers):
+            return _not_modified(response.headers)
+
+        range_header = request_headers.get("range")
+        if range_header is None or status_code != 200:
+            return response
+        if_range = request_headers.get("if-range")
+        if if_range is not None and if_range.strip() != etag:
+            return response
+
+        size = stat_result.st_size
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            return Response(
+                status_code=416,
+                headers={**headers, "content-range": f"bytes */{size}"},
+            )
+        if byte_range is None:
+            return response
+        start, end = byte_range
+        partial_headers = {
+            **headers,
+            "etag": etag,
+            "last-modified": response.headers["last-modified"],
+            "content-range": f"bytes {start}-{end}/{size}",
+        }
+        return PartialFileResponse(full_path, start, end, partial_headers, media_type, method)
+
+
+def _not_modified(headers) -> Response:
+    keep = ("cache-control", "etag", "expires", "vary", "content-location", "date")
+    return Response(status_code=304, headers={key: value for key, value in headers.items() if key in keep})
@@ -0,0 +1,290 @@
+import gzip
+import logging
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip is precompressed without it
+    brotli = None
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Where uploaded files live: "local" keeps them under STORAGE_LOCAL_ROOT
+# (served by the /uploads mount), "s3" puts them in S3_BUCKET on any
+# S3-compatible service. For a local stand-in, run MinIO
+# (`docker compose --profile s3 up minio`) and set S3_ENDPOINT_URL to it.
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+STORAGE_LOCAL_ROOT = os.getenv("STORAGE_LOCAL_ROOT", "./uploads")
+STORAGE_LOCAL_URL = os.getenv("STORAGE_LOCAL_URL", "/uploads")
+S3_BUCKET = os.getenv("S3_BUCKET", "showcasify-uploads")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")
+S3_REGION = os.getenv("S3_REGION", "us-east-1")
+# Base URL objects are served from (bucket website, CDN, ...)
+S3_PUBLIC_URL = os.getenv("S3_PUBLIC_URL")
+S3_PRESIGN_EXPIRES = int(os.getenv("S3_PRESIGN_EXPIRES", "900"))
+S3_MULTIPART_THRESHOLD = int(os.getenv("S3_MULTIPART_THRESHOLD", str(8 * 1024 * 1024)))
+S3_MULTIPART_CHUNK_SIZE = int(os.getenv("S3_MULTIPART_CHUNK_SIZE", str(8 * 1024 * 1024)))
+
+# Stored keys never change content, so they can be cached forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Content types stored with precompressed .br/.gz siblings
+PRECOMPRESSED_TYPES = {"image/svg+xml"}
+# Content types that can carry script. They still render in <img>, but
+# opening one directly must not run it on the origin serving it, so they
+# are served as downloads (and sandboxed, see app.core.static)
+ACTIVE_CONTENT_TYPES = {"image/svg+xml"}
+
+_storage: Optional["Storage"] = None
+
+
+class DirectUploadsUnsupported(Exception):
+    pass
+
+
+class Storage(ABC):
+    """
+    Object storage for uploaded files, addressed by "/"-separated keys.
+
+    All methods block, so async callers go through the threadpool.
+    """
+
+    @abstractmethod
+    def put_file(self, key: str, source: Path, content_type: str) -> None:
+        """
+        Store source under key. source is consumed (moved or deleted).
+        """
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def size(self, key: str) -> Optional[int]:
+        """
+        Size of the stored object in bytes, None when it does not exist.
+        """
+
+    @abstractmethod
+    def read_head(self, key: str, length: int) -> bytes:
+        ...
+
+    @abstractmethod
+    def download(self, key: str, destination: Path) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        ...
+
+    def presigned_upload(self, key: str, content_type: str, max_bytes: int) -> Dict:
+        """
+        Let a client upload straight to storage. Returns the URL and form
+        fields of a POST that may only create key, with that content type
+        and at most max_bytes.
+        """
+        raise DirectUploadsUnsupported(f"The {STORAGE_BACKEND} storage backend does not support direct uploads")
+
+
+class FileSystemStorage(Storage):
+    """
+    Files under a local directory. Every node must share it, so this is
+    meant for development and single-node deployments.
+    """
+
+    def __init__(self, root: str, base_url: str):
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def put_file(self, key: str, source: Path, content_type: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+        os.close(fd)
+        try:
+            shutil.move(str(source), temp_path)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        if content_type in PRECOMPRESSED_TYPES:
+            precompress(path)
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def size(self, key: str) -> Optional[int]:
+        try:
+            return self._path(key).stat().st_size
+        except FileNotFoundError:
+            return None
+
+    def read_head(self, key: str, length: int) -> bytes:
+        with self._path(key).open("rb") as file:
+            return file.read(length)
+
+    def download(self, key: str, destination: Path) -> None:
+        shutil.copyfile(self._path(key), destination)
+
+    def delete(self, key: str) -> None:
+        path = self._path(key)
+        for candidate in (path, Path(f"{path}.gz"), Path(f"{path}.br")):
+            try:
+                candidate.unlink()
+            except FileNotFoundError:
+                pass
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+
+class S3Storage(Storage):
+    """
+    Objects in an S3 bucket (AWS, MinIO, or any S3-compatible service).
+
+    Large files are sent as multipart uploads straight from disk, in
+    S3_MULTIPART_CHUNK_SIZE parts. Credentials come from the usual boto3
+    chain (AWS_ACCESS_KEY_ID/AWS_SECRET_ACCESS_KEY, profile, IAM role).
+    """
+
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None, region: Optional[str] = None,
+                 public_url: Optional[str] = None, presign_expires: int = 900):
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+        from botocore.config import Config
+
+        self.bucket = bucket
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            config=Config(signature_version="s3v4", retries={"max_attempts": 3, "mode": "standard"}),
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=S3_MULTIPART_CHUNK_SIZE,
+        )
+        if public_url is None:
+            public_url = f"{endpoint_url}/{bucket}" if endpoint_url else f"https://{bucket}.s3.{region}.amazonaws.com"
+        self.public_url = public_url.rstrip("/")
+        self.presign_expires = presign_expires
+
+    def _missing(self, exc) -> bool:
+        return exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+    def put_file(self, key: str, source: Path, content_type: str) -> None:
+        extra_args = {"ContentType": content_type, "CacheControl": IMMUTABLE_CACHE_CONTROL}
+        if content_type in ACTIVE_CONTENT_TYPES:
+            extra_args["ContentDisposition"] = "attachment"
+        try:
+            self.client.upload_file(
+                str(source),
+                self.bucket,
+                key,
+                ExtraArgs=extra_args,
+                Config=self.transfer_config,
+            )
+        finally:
+            source.unlink(missing_ok=True)
+
+    def exists(self, key: str) -> bool:
+        return self.size(key) is not None
+
+    def size(self, key: str) -> Optional[int]:
+        from botocore.exceptions import ClientError
+
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+        except ClientError as exc:
+            if self._missing(exc):
+                return None
+            raise
+
+    def read_head(self, key: str, length: int) -> bytes:
+        response = self.client.get_object(Bucket=self.bucket, Key=key, Range=f"bytes=0-{length - 1}")
+        return response["Body"].read()
+
+    def download(self, key: str, destination: Path) -> None:
+        self.client.download_file(self.bucket, key, str(destination), Config=self.transfer_config)
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def url(self, key: str) -> str:
+        return f"{self.public_url}/{key}"
+
+    def presigned_upload(self, key: str, content_type: str, max_bytes: int) -> Dict:
+        fields = {"Content-Type": content_type, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+        if content_type in ACTIVE_CONTENT_TYPES:
+            fields["Content-Disposition"] = "attachment"
+        return self.client.generate_presigned_post(
+            Bucket=self.bucket,
+            Key=key,
+            Fields=fields,
+            Conditions=[
+                *({name: value} for name, value in fields.items()),
+                ["content-length-range", 1, max_bytes],
+            ],
+            ExpiresIn=self.presign_expires,
+        )
+
+
+def precompress(path: Path) -> None:
+    """
+    Write <path>.gz and, when brotli is installed, <path>.br next to path
+    for the static file server to pick by Accept-Encoding.
+    """
+    data = path.read_bytes()
+    encoded = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoded[".br"] = brotli.compress(data, quality=11)
+    for suffix, body in encoded.items():
+        if len(body) >= len(data):
+            continue
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as temp:
+                temp.write(body)
+            os.replace(temp_path, f"{path}{suffix}")
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+
+def get_storage() -> Storage:
+    """
+    The configured storage backend, created on first use
+    """
+    global _storage
+    if _storage is None:
+        if STORAGE_BACKEND == "s3":
+            _storage = S3Storage(
+                S3_BUCKET,
+                endpoint_url=S3_ENDPOINT_URL,
+                region=S3_REGION,
+                public_url=S3_PUBLIC_URL,
+                presign_expires=S3_PRESIGN_EXPIRES,
+            )
+        else:
+            _storage = FileSystemStorage(STORAGE_LOCAL_ROOT, STORAGE_LOCAL_URL)
+    return _storage
@@ -0,0 +1,280 @@
+import hashlib
+import os
+import re
+import tempfile
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, UploadFile, status
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.images import create_variants
+from app.core.metrics import observe_upload
+from app.core.storage import Storage, get_storage
+
+load_dotenv()
+
+AVATAR_MAX_BYTES = int(os.getenv("AVATAR_MAX_BYTES", str(5 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Room for multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+SNIFF_BYTES = 1024
+# Hex characters of the SHA-256 kept in content-addressed filenames
+CONTENT_HASH_LENGTH = 32
+# Scratch space for uploads on their way to storage
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or tempfile.gettempdir()
+
+
+@dataclass(frozen=True)
+class ImageType:
+    extension: str
+    content_type: str
+
+
+PNG = ImageType(".png", "image/png")
+JPEG = ImageType(".jpg", "image/jpeg")
+GIF = ImageType(".gif", "image/gif")
+WEBP = ImageType(".webp", "image/webp")
+AVIF = ImageType(".avif", "image/avif")
+SVG = ImageType(".svg", "image/svg+xml")
+IMAGE_TYPES = {image_type.content_type: image_type for image_type in (PNG, JPEG, GIF, WEBP, AVIF, SVG)}
+
+
+@dataclass(frozen=True)
+class SpooledUpload:
+    path: Path
+    image_type: ImageType
+    size: int
+    digest: str
+
+
+@dataclass(frozen=True)
+class StoredImage:
+    key: str
+    url: str
+    image_type: ImageType
+    size: int
+    variants: Optional[Dict[str, str]]
+
+
+def sniff_image_type(head: bytes) -> Optional[ImageType]:
+    """
+    Identify an image from its leading bytes, ignoring the client's claim
+    """
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return PNG
+    if head.startswith(b"\xff\xd8\xff"):
+        return JPEG
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return GIF
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return WEBP
+    if head[4:12] in (b"ftypavif", b"ftypavis"):
+        return AVIF
+    text = head.lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+    if (text.startswith(b"<?xml") or text.startswith(b"<svg")) and b"<svg" in text:
+        return SVG
+    return None
+
+
+UNSUPPORTED_IMAGE = "File must be a PNG, JPEG, GIF, WebP, AVIF or SVG image"
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File is larger than the {max_bytes // 1024} KB limit",
+    )
+
+
+async def spool_upload(upload: UploadFile, max_bytes: int) -> SpooledUpload:
+    """
+    Stream an uploaded image to a scratch file in UPLOAD_SPOOL_DIR.
+
+    Chunks are hashed and written from the threadpool so disk I/O never
+    blocks the event loop. The upload is aborted with 413 as soon as it
+    passes max_bytes, and with 400 as soon as its magic bytes are not a
+    supported image. The caller owns the returned file.
+    """
+    temp = await run_in_threadpool(
+        tempfile.NamedTemporaryFile, dir=UPLOAD_SPOOL_DIR, prefix=".upload-", delete=False
+    )
+    size = 0
+    head = b""
+    hasher = hashlib.sha256()
+    image_type: Optional[ImageType] = None
+    try:
+        while True:
+            chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise _too_large(max_bytes)
+            if image_type is None:
+                head += chunk[:SNIFF_BYTES - len(head)]
+                if len(head) >= SNIFF_BYTES:
+                    image_type = sniff_image_type(head)
+                    if image_type is None:
+                        break
+            await run_in_threadpool(_write_chunk, temp, hasher, chunk)
+
+        if image_type is None:
+            image_type = sniff_image_type(head)
+        if image_type is None:
+            raise HTTPException(status_code=400, detail=UNSUPPORTED_IMAGE)
+        await run_in_threadpool(temp.close)
+    except BaseException:
+        await run_in_threadpool(_discard, temp)
+        raise
+    digest = hasher.hexdigest()[:CONTENT_HASH_LENGTH]
+    return SpooledUpload(path=Path(temp.name), image_type=image_type, size=size, digest=digest)
+
+
+async def store_image(upload: UploadFile, prefix: str, max_bytes: int) -> StoredImage:
+    """
+    Validate an uploaded image and put it in storage as <prefix>/<sha256><ext>.
+
+    The key is derived from the content, so a URL always refers to the
+    same bytes and can be cached forever, and an image that is already
+    stored is not stored again. Raster images also get resized WebP
+    variants (see IMAGE_VARIANT_SIZES), stored alongside the original.
+    """
+    storage = get_storage()
+    spooled = await spool_upload(upload, max_bytes)
+    key = f"{prefix}/{spooled.digest}{spooled.image_type.extension}"
+    try:
+        variants = None
+        if spooled.image_type != SVG:
+            variants = await _store_variants(storage, spooled.path, prefix, spooled.digest)
+        if not await run_in_threadpool(storage.exists, key):
+            await run_in_threadpool(storage.put_file, key, spooled.path, spooled.image_type.content_type)
+    finally:
+        await run_in_threadpool(spooled.path.unlink, missing_ok=True)
+    observe_upload(prefix, "proxied", spooled.size)
+    return StoredImage(
+        key=key,
+        url=storage.url(key),
+        image_type=spooled.image_type,
+        size=spooled.size,
+        variants=variants,
+    )
+
+
+def direct_upload_key(prefix: str, image_type: ImageType) -> str:
+    """
+    A fresh key for a client to upload to directly. It is random rather
+    than a content hash (the server never sees the bytes first), but it
+    is never reused, so the object is just as immutable.
+    """
+    return f"{prefix}/{uuid.uuid4().hex}{image_type.extension}"
+
+
+async def ingest_stored_image(key: str, prefix: str, max_bytes: int) -> StoredImage:
+    """
+    Validate an image a client uploaded straight to storage, as the upload
+    endpoint would have: size, magic bytes matching the key's extension,
+    and WebP variants for raster images. Invalid objects are deleted.
+    """
+    storage = get_storage()
+    if not re.fullmatch(rf"{re.escape(prefix)}/[0-9a-f]{{{CONTENT_HASH_LENGTH}}}\.[a-z]+", key):
+        raise HTTPException(status_code=400, detail="Invalid upload key")
+    size = await run_in_threadpool(storage.size, key)
+    if size is None:
+        raise HTTPException(status_code=400, detail="Upload not found")
+    if size > max_bytes:
+        await run_in_threadpool(storage.delete, key)
+        raise _too_large(max_bytes)
+    image_type = sniff_image_type(await run_in_threadpool(storage.read_head, key, SNIFF_BYTES))
+    if image_type is None or not key.endswith(image_type.extension):
+        await run_in_threadpool(storage.delete, key)
+        raise HTTPException(status_code=400, detail=UNSUPPORTED_IMAGE)
+
+    variants = None
+    if image_type != SVG:
+        with tempfile.TemporaryDirectory(dir=UPLOAD_SPOOL_DIR, prefix=".upload-") as scratch:
+            source = Path(scratch) / f"source{image_type.extension}"
+            await run_in_threadpool(storage.download, key, source)
+            variants = await _store_variants(storage, source, prefix, Path(key).stem)
+    observe_upload(prefix, "direct", size)
+    return StoredImage(key=key, url=storage.url(key), image_type=image_type, size=size, variants=variants)
+
+
+async def _store_variants(storage: Storage, source: Path, prefix: str, stem: str) -> Optional[Dict[str, str]]:
+    """
+    Generate and store the WebP variants of source, returning {size: url}.
+    Variants that are already stored are reused. Returns None when the
+    image could not be decoded.
+    """
+    with tempfile.TemporaryDirectory(dir=UPLOAD_SPOOL_DIR, prefix=".variants-") as scratch:
+        names = await create_variants(source, Path(scratch), stem)
+        if names is None:
+            return None
+        urls: Dict[str, str] = {}
+        for size, name in names.items():
+            key = f"{prefix}/{name}"
+            if not await run_in_threadpool(storage.exists, key):
+                await run_in_threadpool(storage.put_file, key, Path(scratch) / name, WEBP.content_type)
+            urls[size] = storage.url(key)
+    return urls
+
+
+def _write_chunk(temp, hasher, chunk: bytes) -> None:
+    hasher.update(chunk)
+    temp.write(chunk)
+
+
+def _discard(temp) -> None:
+    temp.close()
+    try:
+        os.unlink(temp.name)
+    except FileNotFoundError:
+        pass
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Cap request bodies for upload routes before FastAPI spools them.
+
+    A Content-Length over the limit is rejected immediately. Chunked bodies
+    are counted as they arrive and aborted with 413 the moment they cross
+    the limit, so an oversized upload is never fully read or written.
+    """
+
+    def __init__(self, app: ASGIApp, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limit = self.limits.get(scope.get("path", "")) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                content={"detail": _too_large(limit - MULTIPART_OVERHEAD_BYTES).detail},
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise _too_large(limit - MULTIPART_OVERHEAD_BYTES)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,66 @@
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+import uuid
+from app import models
+from app.schemas.education import EducationCreate, EducationUpdate
+from app.core.cache import invalidate_portfolio
+from app.core.pagination import DEFAULT_PAGE_SIZE, Page, keyset_query, make_page
+from app.crud.aio.imports import get_or_create_professional_info_id
+
+Education = models.education.Education
+ProfessionalInfo = models.profile.ProfessionalInfo
+
+async def create_education(db: AsyncSession, education: EducationCreate, user_id: uuid.UUID):
+    # A missing professional_info is created in the same transaction
+    professional_info_id = await get_or_create_professional_info_id(db, user_id)
+    db_education = Education(**education.dict(), id=uuid.uuid4(), professional_info_id=professional_info_id)
+    db.add(db_education)
+    await db.commit()
+    await db.refresh(db_education)
+    invalidate_portfolio(user_id)
+    return db_education
+
+async def get_educations(
+    db: AsyncSession, user_id: uuid.UUID, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, include_total: bool = False
+) -> Page:
+    query = (
+        select(Education)
+        .join(ProfessionalInfo, Education.professional_info_id == ProfessionalInfo.id)
+        .where(ProfessionalInfo.user_id == user_id)
+    )
+    total = await db.scalar(select(func.count()).select_from(query.subquery())) if include_total else None
+    result = await db.execute(keyset_query(query, Education.created_at, Education.id, cursor, limit))
+    return make_page(result.scalars().all(), limit, total)
+
+async def get_education(db: AsyncSession, education_id: uuid.UUID, user_id: uuid.UUID):
+    # One round trip: ownership is checked through the join
+    result = await db.execute(
+        select(Education)
+        .join(ProfessionalInfo, Education.professional_info_id == ProfessionalInfo.id)
+        .where(Education.id == education_id, ProfessionalInfo.user_id == user_id)
+    )
+    return result.scalars().first()
+
+async def update_education(db: AsyncSession, education_id: uuid.UUID, education: EducationUpdate, user_id: uuid.UUID):
+    db_education = await get_education(db, education_id, user_id)
+    if not db_education:
+        return None
+
+    for key, value in education.dict(exclude_unset=True).items():
+        setattr(db_education, key, value)
+
+    await db.commit()
+    await db.refresh(db_education)
+    invalidate_portfolio(user_id)
+    return db_education
+
+async def delete_education(db: AsyncSession, education_id: uuid.UUID, user_id: uuid.UUID):
+    db_education = await get_education(db, education_id, user_id)
+    if not db_education:
+        return None
+
+    await db.delete(db_education)
+    await db.commit()
+    invalidate_portfolio(user_id)
+    return db_education
@@ -0,0 +1,66 @@
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+import uuid
+from app import models
+from app.schemas.experiences import ExperienceCreate, ExperienceUpdate
+from app.core.cache import invalidate_portfolio
+from app.core.pagination import DEFAULT_PAGE_SIZE, Page, keyset_query, make_page
+from app.crud.aio.imports import get_or_create_professional_info_id
+
+Experience = models.experiences.Experience
+ProfessionalInfo = models.profile.ProfessionalInfo
+
+async def create_experience(db: AsyncSession, experience: ExperienceCreate, user_id: uuid.UUID):
+    # A missing professional_info is created in the same transaction
+    professional_info_id = await get_or_create_professional_info_id(db, user_id)
+    db_experience = Experience(**experience.dict(), id=uuid.uuid4(), professional_info_id=professional_info_id)
+    db.add(db_experience)
+    await db.commit()
+    await db.refresh(db_experience)
+    invalidate_portfolio(user_id)
+    return db_experience
+
+async def get_experiences(
+    db: AsyncSession, user_id: uuid.UUID, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, include_total: bool = False
+) -> Page:
+    query = (
+        select(Experience)
+        .join(ProfessionalInfo, Experience.professional_info_id == ProfessionalInfo.id)
+        .where(ProfessionalInfo.user_id == user_id)
+    )
+    total = await db.scalar(select(func.count()).select_from(query.subquery())) if include_total else None
+    result = await db.execute(keyset_query(query, Experience.created_at, Experience.id, cursor, limit))
+    return make_page(result.scalars().all(), limit, total)
+
+async def get_experience(db: AsyncSession, experience_id: uuid.UUID, user_id: uuid.UUID):
+    # One round trip: ownership is checked through the join
+    result = await db.execute(
+        select(Experience)
+        .join(ProfessionalInfo, Experience.professional_info_id == ProfessionalInfo.id)
+        .where(Experience.id == experience_id, ProfessionalInfo.user_id == user_id)
+    )
+    return result.scalars().first()
+
+async def update_experience(db: AsyncSession, experience_id: uuid.UUID, experience: ExperienceUpdate, user_id: uuid.UUID):
+    db_experience = await get_experience(db, experience_id, user_id)
+    if not db_experience:
+        return None
+
+    for key, value in experience.dict(exclude_unset=True).items():
+        setattr(db_experience, key, value)
+
+    await db.commit()
+    await db.refresh(db_experience)
+    invalidate_portfolio(user_id)
+    return db_experience
+
+async def delete_experience(db: AsyncSession, experience_id: uuid.UUID, user_id: uuid.UUID):
+    db_experience = await get_experience(db, experience_id, user_id)
+    if not db_experience:
+        return None
+
+    await db.delete(db_experience)
+    await db.commit()
+    invalidate_portfolio(user_id)
+    return db_experience
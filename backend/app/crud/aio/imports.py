@@ -0,0 +1,51 @@
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+import uuid
+
+from app import models
+from app.core.cache import invalidate_portfolio
+from app.schemas.imports import ResumeImport
+
+async def get_or_create_professional_info_id(db: AsyncSession, user_id: uuid.UUID) -> uuid.UUID:
+    """
+    Async counterpart of crud.imports.get_or_create_professional_info_id;
+    flushes instead of committing, so it joins the caller's transaction.
+    """
+    ProfessionalInfo = models.profile.ProfessionalInfo
+    professional_info_id = await db.scalar(
+        select(ProfessionalInfo.id).where(ProfessionalInfo.user_id == user_id).limit(1)
+    )
+    if professional_info_id is None:
+        professional_info = ProfessionalInfo(
+            user_id=user_id, contact_info={}, social_links={}, skills=[]
+        )
+        db.add(professional_info)
+        await db.flush()
+        professional_info_id = professional_info.id
+    return professional_info_id
+
+async def _insert_all(db: AsyncSession, model, entries: list, professional_info_id: uuid.UUID) -> List[uuid.UUID]:
+    if not entries:
+        return []
+    rows = [
+        {**entry.model_dump(exclude={"type"}), "id": uuid.uuid4(), "professional_info_id": professional_info_id}
+        for entry in entries
+    ]
+    result = await db.execute(insert(model).returning(model.id, sort_by_parameter_order=True), rows)
+    return list(result.scalars())
+
+async def import_resume(db: AsyncSession, user_id: uuid.UUID, data: ResumeImport) -> dict:
+    """
+    Async counterpart of crud.imports.import_resume (one transaction,
+    batched INSERT ... RETURNING per section)
+    """
+    professional_info_id = await get_or_create_professional_info_id(db, user_id)
+    result = {
+        "experiences": await _insert_all(db, models.experiences.Experience, data.experiences, professional_info_id),
+        "educations": await _insert_all(db, models.education.Education, data.educations, professional_info_id),
+        "projects": await _insert_all(db, models.projects.Project, data.projects, professional_info_id),
+    }
+    await db.commit()
+    invalidate_portfolio(user_id)
+    return result
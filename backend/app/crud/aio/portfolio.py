@@ -0,0 +1,23 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import Optional
+import uuid
+
+from app.models.user import User
+from app.models.profile import ProfessionalInfo
+
+async def get_portfolio_user(db: AsyncSession, user_id: uuid.UUID) -> Optional[User]:
+    """
+    Async counterpart of crud.portfolio.get_portfolio_user (four queries)
+    """
+    professional_info = joinedload(User.professional_info)
+    result = await db.execute(
+        select(User).options(
+            joinedload(User.preference),
+            professional_info.selectinload(ProfessionalInfo.educations),
+            professional_info.selectinload(ProfessionalInfo.experiences),
+            professional_info.selectinload(ProfessionalInfo.projects),
+        ).where(User.id == user_id)
+    )
+    return result.unique().scalars().first()
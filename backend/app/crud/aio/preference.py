@@ -0,0 +1,25 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+import uuid
+from app import models
+from app.schemas.preference import PreferenceCreate
+from app.core.cache import invalidate_portfolio
+
+async def create_or_update_preference(db: AsyncSession, preference: PreferenceCreate, user_id: uuid.UUID):
+    db_pref = await get_preference(db, user_id)
+    if db_pref:
+        for key, value in preference.dict().items():
+            setattr(db_pref, key, value)
+    else:
+        db_pref = models.preference.Preference(**preference.dict(), user_id=user_id)
+        db.add(db_pref)
+    await db.commit()
+    await db.refresh(db_pref)
+    invalidate_portfolio(user_id)
+    return db_pref
+
+async def get_preference(db: AsyncSession, user_id: uuid.UUID):
+    result = await db.execute(
+        select(models.preference.Preference).where(models.preference.Preference.user_id == user_id)
+    )
+    return result.scalars().first()
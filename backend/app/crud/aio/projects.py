@@ -0,0 +1,66 @@
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+import uuid
+from app import models
+from app.schemas.projects import ProjectCreate, ProjectUpdate
+from app.core.cache import invalidate_portfolio
+from app.core.pagination import DEFAULT_PAGE_SIZE, Page, keyset_query, make_page
+from app.crud.aio.imports import get_or_create_professional_info_id
+
+Project = models.projects.Project
+ProfessionalInfo = models.profile.ProfessionalInfo
+
+async def create_project(db: AsyncSession, project: ProjectCreate, user_id: uuid.UUID):
+    # A missing professional_info is created in the same transaction
+    professional_info_id = await get_or_create_professional_info_id(db, user_id)
+    db_project = Project(**project.dict(), id=uuid.uuid4(), professional_info_id=professional_info_id)
+    db.add(db_project)
+    await db.commit()
+    await db.refresh(db_project)
+    invalidate_portfolio(user_id)
+    return db_project
+
+async def get_projects(
+    db: AsyncSession, user_id: uuid.UUID, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, include_total: bool = False
+) -> Page:
+    query = (
+        select(Project)
+        .join(ProfessionalInfo, Project.professional_info_id == ProfessionalInfo.id)
+        .where(ProfessionalInfo.user_id == user_id)
+    )
+    total = await db.scalar(select(func.count()).select_from(query.subquery())) if include_total else None
+    result = await db.execute(keyset_query(query, Project.created_at, Project.id, cursor, limit))
+    return make_page(result.scalars().all(), limit, total)
+
+async def get_project(db: AsyncSession, project_id: uuid.UUID, user_id: uuid.UUID):
+    # One round trip: ownership is checked through the join
+    result = await db.execute(
+        select(Project)
+        .join(ProfessionalInfo, Project.professional_info_id == ProfessionalInfo.id)
+        .where(Project.id == project_id, ProfessionalInfo.user_id == user_id)
+    )
+    return result.scalars().first()
+
+async def update_project(db: AsyncSession, project_id: uuid.UUID, project: ProjectUpdate, user_id: uuid.UUID):
+    db_project = await get_project(db, project_id, user_id)
+    if not db_project:
+        return None
+
+    for key, value in project.dict(exclude_unset=True).items():
+        setattr(db_project, key, value)
+
+    await db.commit()
+    await db.refresh(db_project)
+    invalidate_portfolio(user_id)
+    return db_project
+
+async def delete_project(db: AsyncSession, project_id: uuid.UUID, user_id: uuid.UUID):
+    db_project = await get_project(db, project_id, user_id)
+    if not db_project:
+        return None
+
+    await db.delete(db_project)
+    await db.commit()
+    invalidate_portfolio(user_id)
+    return db_project
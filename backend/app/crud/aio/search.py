@@ -0,0 +1,53 @@
+from sqlalchemy import exists, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
+from typing import List, Optional
+
+from app import models
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    Page,
+    encode_rank_cursor,
+    keyset_query,
+    make_page,
+    ranked_keyset_query,
+)
+from app.database.search import SEARCH_CONFIG
+
+async def search_profiles(
+    db: AsyncSession,
+    query: Optional[str] = None,
+    skills: Optional[List[str]] = None,
+    technologies: Optional[List[str]] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page:
+    """
+    Async counterpart of crud.search.search_profiles: (ProfessionalInfo,
+    rank) rows, ranked when there is a text query and in (created_at, id)
+    order with rank None otherwise
+    """
+    ProfessionalInfo = models.profile.ProfessionalInfo
+    Project = models.projects.Project
+
+    q = select(ProfessionalInfo).join(ProfessionalInfo.user).options(contains_eager(ProfessionalInfo.user))
+    if skills:
+        q = q.where(ProfessionalInfo.skills.contains(skills))
+    for technology in technologies or []:
+        q = q.where(exists().where(
+            Project.professional_info_id == ProfessionalInfo.id,
+            Project.technologies.contains([technology]),
+        ))
+
+    if not query:
+        result = await db.execute(keyset_query(q, ProfessionalInfo.created_at, ProfessionalInfo.id, cursor, limit))
+        page = make_page(result.scalars().all(), limit)
+        page.items = [(info, None) for info in page.items]
+        return page
+
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    # Same normalization as the sync query (see crud.search)
+    rank = func.ts_rank_cd(ProfessionalInfo.search_vector, ts_query, 1)
+    q = q.add_columns(rank).where(ProfessionalInfo.search_vector.op("@@")(ts_query))
+    result = await db.execute(ranked_keyset_query(q, rank, ProfessionalInfo.id, cursor, limit))
+    return make_page(result.all(), limit, cursor_for=lambda row: encode_rank_cursor(row[1], row[0].id))
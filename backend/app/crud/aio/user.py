@@ -0,0 +1,144 @@
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user import User
+from app.models.password_reset import PasswordResetToken
+from app.models.profile import ProfessionalInfo
+from app.schemas.user import UserCreate, UserUpdate
+from app.core.security import get_password_hash_async, hash_reset_token, verify_password_async
+from app.core.cache import invalidate_portfolio, invalidate_principal
+from app.core.pagination import DEFAULT_PAGE_SIZE, Page, keyset_query, make_page
+from typing import Dict, List, Optional
+import uuid
+import secrets
+from datetime import datetime, timezone
+from app.crud.user import PASSWORD_RESET_TOKEN_TTL
+
+async def get_users(
+    db: AsyncSession, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, include_total: bool = False
+) -> Page[User]:
+    total = await db.scalar(select(func.count()).select_from(User)) if include_total else None
+    result = await db.execute(keyset_query(select(User), User.created_at, User.id, cursor, limit))
+    return make_page(result.scalars().all(), limit, total)
+
+async def get_user(db: AsyncSession, user_id: uuid.UUID) -> Optional[User]:
+    result = await db.execute(select(User).where(User.id == user_id))
+    return result.scalars().first()
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
+async def create_user(db: AsyncSession, user: UserCreate) -> User:
+    hashed_password = await get_password_hash_async(user.password)
+
+    db_user = User(
+        email=user.email,
+        name=user.name,
+        password=hashed_password,
+        role=user.role,
+    )
+    db.add(db_user)
+    await db.flush()
+
+    professional_info = ProfessionalInfo(
+        user_id=db_user.id,
+        contact_info=dict(),
+        social_links=dict(),
+        skills=list(),
+        profile_image_url=None,
+    )
+    db.add(professional_info)
+    await db.commit()
+    await db.refresh(db_user)
+
+    return db_user
+
+async def update_user(db: AsyncSession, user_id: uuid.UUID, user: UserUpdate) -> Optional[User]:
+    db_user = await get_user(db, user_id)
+    if db_user:
+        update_data = user.model_dump(exclude_unset=True)
+
+        # Hash password if it's being updated
+        if "password" in update_data:
+            update_data["password"] = await get_password_hash_async(update_data["password"])
+
+        for key, value in update_data.items():
+            setattr(db_user, key, value)
+
+        await db.commit()
+        await db.refresh(db_user)
+        invalidate_principal(user_id)
+        invalidate_portfolio(user_id)
+    return db_user
+
+async def set_avatar(
+    db: AsyncSession, user_id: uuid.UUID, avatar: str, avatar_variants: Optional[Dict[str, str]]
+) -> Optional[User]:
+    db_user = await get_user(db, user_id)
+    if db_user:
+        db_user.avatar = avatar
+        db_user.avatar_variants = avatar_variants
+        await db.commit()
+        await db.refresh(db_user)
+        invalidate_principal(user_id)
+        invalidate_portfolio(user_id)
+    return db_user
+
+async def delete_user(db: AsyncSession, user_id: uuid.UUID) -> bool:
+    db_user = await get_user(db, user_id)
+    if db_user:
+        await db.delete(db_user)
+        await db.commit()
+        invalidate_principal(user_id)
+        invalidate_portfolio(user_id)
+        return True
+    return False
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    user = await get_user_by_email(db, email)
+    if not user or not await verify_password_async(password, user.password):
+        return None
+    return user
+
+async def generate_password_reset_token(db: AsyncSession, email: str) -> Optional[str]:
+    """
+    Generate a password reset token for the user and store its digest
+    """
+    user = await get_user_by_email(db, email)
+    if not user:
+        return None
+
+    token = secrets.token_urlsafe(32)
+    await db.execute(delete(PasswordResetToken).where(PasswordResetToken.user_id == user.id))
+    db.add(PasswordResetToken(
+        token_hash=hash_reset_token(token),
+        user_id=user.id,
+        expires_at=datetime.now(timezone.utc) + PASSWORD_RESET_TOKEN_TTL,
+    ))
+    await db.commit()
+
+    return token
+
+async def reset_password_with_token(db: AsyncSession, token: str, new_password: str) -> bool:
+    """
+    Reset a user's password using a valid reset token
+    """
+    result = await db.execute(
+        select(PasswordResetToken).where(
+            PasswordResetToken.token_hash == hash_reset_token(token),
+            PasswordResetToken.expires_at > datetime.now(timezone.utc),
+        )
+    )
+    reset_token = result.scalars().first()
+    if not reset_token:
+        return False
+    user = await get_user(db, reset_token.user_id)
+    if not user:
+        return False
+
+    user.password = await get_password_hash_async(new_password)
+    await db.execute(delete(PasswordResetToken).where(PasswordResetToken.user_id == user.id))
+    await db.commit()
+    invalidate_principal(user.id)
+
+    return True
@@ -1,24 +1,43 @@
 from sqlalchemy.orm import Session
+from typing import Optional
 import uuid
-from app import models, schemas
+from app import models
+from app.schemas.education import EducationCreate, EducationUpdate
+from app.core.cache import invalidate_portfolio
+from app.core.pagination import DEFAULT_PAGE_SIZE, Page, keyset_query, make_page
+from app.crud.imports import get_or_create_professional_info_id
 
-def create_education(db: Session, education: schemas.education.EducationCreate, user_id: uuid.UUID):
-    db_education = models.education.Education(**education.dict(), user_id=user_id)
+def create_education(db: Session, education: EducationCreate, user_id: uuid.UUID):
+    # A missing professional_info is created in the same transaction
+    professional_info_id = get_or_create_professional_info_id(db, user_id)
+    db_education = models.education.Education(
+        **education.dict(), id=uuid.uuid4(), professional_info_id=professional_info_id
+    )
     db.add(db_education)
     db.commit()
     db.refresh(db_education)
+    invalidate_portfolio(user_id)
     return db_education
 
-def get_educations(db: Session, user_id: uuid.UUID):
-    return db.query(models.education.Education).filter(models.education.Education.user_id == user_id).all()
+def get_educations(
+    db: Session, user_id: uuid.UUID, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, include_total: bool = False
+) -> Page:
+    Education = models.education.Education
+    query = db.query(Education).join(models.profile.ProfessionalInfo).filter(
+        models.profile.ProfessionalInfo.user_id == user_id
+    )
+    total = query.count() if include_total else None
+    rows = keyset_query(query, Education.created_at, Education.id, cursor, limit).all()
+    return make_page(rows, limit, total)
 
-def get_education(db: Session, education_id: int, user_id: uuid.UUID):
-    return db.query(models.education.Education).filter(
+def get_education(db: Session, education_id: uuid.UUID, user_id: uuid.UUID):
+    # One round trip: ownership is checked through the join
+    return db.query(models.education.Education).join(models.profile.ProfessionalInfo).filter(
         models.education.Education.id == education_id,
-        models.education.Education.user_id == user_id
+        models.profile.ProfessionalInfo.user_id == user_id
     ).first()
 
-def update_education(db: Session, education_id: int, education: schemas.education.EducationUpdate, user_id: uuid.UUID):
+def update_education(db: Session, education_id: uuid.UUID, education: EducationUpdate, user_id: uuid.UUID):
     db_education = get_education(db, education_id, user_id)
     if not db_education:
         return None
@@ -28,13 +47,15 @@ def update_education(db: Session, education_id: int, education: schemas.educatio
     
     db.commit()
     db.refresh(db_education)
+    invalidate_portfolio(user_id)
     return db_education
 
-def delete_education(db: Session, education_id: int, user_id: uuid.UUID):
+def delete_education(db: Session, education_id: uuid.UUID, user_id: uuid.UUID):
     db_education = get_education(db, education_id, user_id)
     if not db_education:
         return None
     
     db.delete(db_education)
     db.commit()
+    invalidate_portfolio(user_id)
     return db_education
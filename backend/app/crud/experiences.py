@@ -1,54 +1,43 @@
 from sqlalchemy.orm import Session
+from typing import Optional
 import uuid
-from app import models, schemas
+from app import models
+from app.schemas.experiences import ExperienceCreate, ExperienceUpdate
+from app.core.cache import invalidate_portfolio
+from app.core.pagination import DEFAULT_PAGE_SIZE, Page, keyset_query, make_page
+from app.crud.imports import get_or_create_professional_info_id
 
-def create_experience(db: Session, experience: schemas.experiences.ExperienceCreate, user_id: uuid.UUID):
-    # Get or create professional_info for the user
-    professional_info = db.query(models.profile.ProfessionalInfo).filter(
-        models.profile.ProfessionalInfo.user_id == user_id
-    ).first()
-    
-    if not professional_info:
-        professional_info = models.profile.ProfessionalInfo(
-            user_id=user_id,
-            contact_info={},
-            social_links={},
-            skills=[]
-        )
-        db.add(professional_info)
-        db.commit()
-        db.refresh(professional_info)
-    
-    db_experience = models.experiences.Experience(**experience.dict(), professional_info_id=professional_info.id)
+def create_experience(db: Session, experience: ExperienceCreate, user_id: uuid.UUID):
+    # A missing professional_info is created in the same transaction
+    professional_info_id = get_or_create_professional_info_id(db, user_id)
+    db_experience = models.experiences.Experience(
+        **experience.dict(), id=uuid.uuid4(), professional_info_id=professional_info_id
+    )
     db.add(db_experience)
     db.commit()
     db.refresh(db_experience)
+    invalidate_portfolio(user_id)
     return db_experience
 
-def get_experiences(db: Session, user_id: uuid.UUID):
-    professional_info = db.query(models.profile.ProfessionalInfo).filter(
+def get_experiences(
+    db: Session, user_id: uuid.UUID, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, include_total: bool = False
+) -> Page:
+    Experience = models.experiences.Experience
+    query = db.query(Experience).join(models.profile.ProfessionalInfo).filter(
         models.profile.ProfessionalInfo.user_id == user_id
-    ).first()
-    if not professional_info:
-        return []
-    
-    return db.query(models.experiences.Experience).filter(
-        models.experiences.Experience.professional_info_id == professional_info.id
-    ).all()
+    )
+    total = query.count() if include_total else None
+    rows = keyset_query(query, Experience.created_at, Experience.id, cursor, limit).all()
+    return make_page(rows, limit, total)
 
-def get_experience(db: Session, experience_id: int, user_id: uuid.UUID):
-    professional_info = db.query(models.profile.ProfessionalInfo).filter(
-        models.profile.ProfessionalInfo.user_id == user_id
-    ).first()
-    if not professional_info:
-        return None
-    
-    return db.query(models.experiences.Experience).filter(
+def get_experience(db: Session, experience_id: uuid.UUID, user_id: uuid.UUID):
+    # One round trip: ownership is checked through the join
+    return db.query(models.experiences.Experience).join(models.profile.ProfessionalInfo).filter(
         models.experiences.Experience.id == experience_id,
-        models.experiences.Experience.professional_info_id == professional_info.id
+        models.profile.ProfessionalInfo.user_id == user_id
     ).first()
 
-def update_experience(db: Session, experience_id: int, experience: schemas.experiences.ExperienceUpdate, user_id: uuid.UUID):
+def update_experience(db: Session, experience_id: uuid.UUID, experience: ExperienceUpdate, user_id: uuid.UUID):
     db_experience = get_experience(db, experience_id, user_id)
     if not db_experience:
         return None
@@ -58,13 +47,15 @@ def update_experience(db: Session, experience_id: int, experience: schemas.exper
     
     db.commit()
     db.refresh(db_experience)
+    invalidate_portfolio(user_id)
     return db_experience
 
-def delete_experience(db: Session, experience_id: int, user_id: uuid.UUID):
+def delete_experience(db: Session, experience_id: uuid.UUID, user_id: uuid.UUID):
     db_experience = get_experience(db, experience_id, user_id)
     if not db_experience:
         return None
     
     db.delete(db_experience)
     db.commit()
+    invalidate_portfolio(user_id)
     return db_experience
@@ -0,0 +1,62 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from typing import Any, Dict, Iterator
+
+from app.models.profile import ProfessionalInfo
+from app.models.user import User
+
+EXPORT_FIELDS = {
+    "experience": ("id", "title", "company", "start_date", "end_date", "description"),
+    "education": ("id", "institution", "degree", "field_of_study", "start_date", "end_date", "is_current", "gpa"),
+    "project": (
+        "id", "name", "description", "technologies", "start_date", "end_date", "is_current",
+        "project_url", "github_url", "achievements",
+    ),
+}
+
+def _fields(obj: Any, names: tuple) -> Dict[str, Any]:
+    return {name: getattr(obj, name) for name in names}
+
+def _portfolio(user: User) -> Dict[str, Any]:
+    info = user.professional_info[0] if user.professional_info else None
+    return {
+        "id": user.id,
+        "email": user.email,
+        "name": user.name,
+        "role": user.role.value if user.role else None,
+        "bio": user.bio,
+        "avatar": user.avatar,
+        "created_at": user.created_at,
+        "contact_info": info.contact_info if info else None,
+        "social_links": info.social_links if info else None,
+        "skills": info.skills if info else None,
+        "experiences": [_fields(e, EXPORT_FIELDS["experience"]) for e in info.experiences] if info else [],
+        "educations": [_fields(e, EXPORT_FIELDS["education"]) for e in info.educations] if info else [],
+        "projects": [_fields(p, EXPORT_FIELDS["project"]) for p in info.projects] if info else [],
+    }
+
+def iter_portfolios(db: Session, batch_size: int) -> Iterator[Dict[str, Any]]:
+    """
+    Every user with their professional info, experiences, educations and
+    projects, as plain dicts in (created_at, id) order. Never the password.
+
+    Users are read through a server-side cursor batch_size rows at a time
+    (yield_per), each batch's children with one SELECT ... IN per
+    collection, and the batch is dropped from the session before the next,
+    so memory stays flat however many users there are.
+    """
+    professional_info = selectinload(User.professional_info)
+    statement = (
+        select(User)
+        .options(
+            professional_info.selectinload(ProfessionalInfo.experiences),
+            professional_info.selectinload(ProfessionalInfo.educations),
+            professional_info.selectinload(ProfessionalInfo.projects),
+        )
+        .order_by(User.created_at, User.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for partition in db.execute(statement).scalars().partitions():
+        for user in partition:
+            yield _portfolio(user)
+        db.expunge_all()
@@ -0,0 +1,53 @@
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from typing import List
+import uuid
+
+from app import models
+from app.core.cache import invalidate_portfolio
+from app.schemas.imports import ResumeImport
+
+def get_or_create_professional_info_id(db: Session, user_id: uuid.UUID) -> uuid.UUID:
+    """
+    The user's professional info id, creating an empty one if needed.
+    Flushes instead of committing, so it joins the caller's transaction.
+    """
+    ProfessionalInfo = models.profile.ProfessionalInfo
+    professional_info_id = db.query(ProfessionalInfo.id).filter(ProfessionalInfo.user_id == user_id).limit(1).scalar()
+    if professional_info_id is None:
+        professional_info = ProfessionalInfo(
+            user_id=user_id, contact_info={}, social_links={}, skills=[]
+        )
+        db.add(professional_info)
+        db.flush()
+        professional_info_id = professional_info.id
+    return professional_info_id
+
+def _insert_all(db: Session, model, entries: list, professional_info_id: uuid.UUID) -> List[uuid.UUID]:
+    if not entries:
+        return []
+    rows = [
+        {**entry.model_dump(exclude={"type"}), "id": uuid.uuid4(), "professional_info_id": professional_info_id}
+        for entry in entries
+    ]
+    # One executemany, which SQLAlchemy sends as multi-row
+    # INSERT ... VALUES (...), (...) RETURNING pages
+    result = db.execute(insert(model).returning(model.id, sort_by_parameter_order=True), rows)
+    return list(result.scalars())
+
+def import_resume(db: Session, user_id: uuid.UUID, data: ResumeImport) -> dict:
+    """
+    Add every entry in data to the user's profile in a single transaction:
+    a handful of batched INSERT ... RETURNING statements and one commit,
+    however many entries there are. The new ids come back in the order
+    the entries were given.
+    """
+    professional_info_id = get_or_create_professional_info_id(db, user_id)
+    result = {
+        "experiences": _insert_all(db, models.experiences.Experience, data.experiences, professional_info_id),
+        "educations": _insert_all(db, models.education.Education, data.educations, professional_info_id),
+        "projects": _insert_all(db, models.projects.Project, data.projects, professional_info_id),
+    }
+    db.commit()
+    invalidate_portfolio(user_id)
+    return result
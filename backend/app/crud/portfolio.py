@@ -0,0 +1,32 @@
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import Optional
+import uuid
+
+from app.models.user import User
+from app.models.profile import ProfessionalInfo
+
+def get_portfolio_user(db: Session, user_id: uuid.UUID) -> Optional[User]:
+    """
+    Load a user together with everything their portfolio renders.
+
+    The user, preference and professional info come back in one joined
+    query and each child collection in one SELECT ... IN, so the cost is
+    four queries no matter how many entries the portfolio has.
+    """
+    professional_info = joinedload(User.professional_info)
+    return db.query(User).options(
+        joinedload(User.preference),
+        professional_info.selectinload(ProfessionalInfo.educations),
+        professional_info.selectinload(ProfessionalInfo.experiences),
+        professional_info.selectinload(ProfessionalInfo.projects),
+    ).filter(User.id == user_id).first()
+
+def build_portfolio(user: User) -> dict:
+    """
+    Shape an eagerly loaded user into the Portfolio response
+    """
+    return {
+        "user": user,
+        "professional_info": user.professional_info[0] if user.professional_info else None,
+        "preference": user.preference,
+    }
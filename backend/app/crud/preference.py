@@ -1,7 +1,10 @@
 from sqlalchemy.orm import Session
-from app import models, schemas
+import uuid
+from app import models
+from app.schemas.preference import PreferenceCreate
+from app.core.cache import invalidate_portfolio
 
-def create_or_update_preference(db: Session, preference: schemas.preference.PreferenceCreate, user_id: int):
+def create_or_update_preference(db: Session, preference: PreferenceCreate, user_id: uuid.UUID):
     db_pref = db.query(models.preference.Preference).filter(models.preference.Preference.user_id == user_id).first()
     if db_pref:
         for key, value in preference.dict().items():
@@ -11,7 +14,8 @@ def create_or_update_preference(db: Session, preference: schemas.preference.Pref
         db.add(db_pref)
     db.commit()
     db.refresh(db_pref)
+    invalidate_portfolio(user_id)
     return db_pref
 
-def get_preference(db: Session, user_id: int):
+def get_preference(db: Session, user_id: uuid.UUID):
     return db.query(models.preference.Preference).filter(models.preference.Preference.user_id == user_id).first()
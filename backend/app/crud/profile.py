@@ -1,8 +1,14 @@
-from typing import List, Optional, Union
+import uuid
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Union
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
-from fastapi.encoders import jsonable_encoder
 
-from app.models.profile import ProfessionalInfo, Education, Project
+from app.core.cache import invalidate_portfolio
+
+from app.models.profile import ProfessionalInfo
+from app.models.education import Education
+from app.models.projects import Project
 from app.schemas.profile import (
     ProfessionalInfoCreate,
     ProfessionalInfoUpdate,
@@ -12,13 +18,40 @@ from app.schemas.profile import (
     ProjectUpdate,
 )
 
+def _invalidate_professional_info_owner(db: Session, professional_info_id) -> None:
+    user_id = db.query(ProfessionalInfo.user_id).filter(ProfessionalInfo.id == professional_info_id).scalar()
+    if user_id is not None:
+        invalidate_portfolio(user_id)
+
+def _column_values(obj_in, **kwargs) -> Dict[str, Any]:
+    # Dates and ids stay Python objects for the Date/UUID columns; URLs and
+    # nested models become plain strings and dicts for String/JSONB ones
+    values = obj_in.model_dump(**kwargs)
+    json_values = obj_in.model_dump(mode="json", **kwargs)
+    return {
+        field: value if isinstance(value, (date, datetime, uuid.UUID)) else json_values[field]
+        for field, value in values.items()
+    }
+
+def _apply_update(db_obj, obj_in) -> None:
+    # Only mapped columns are set, so unknown keys are ignored
+    if isinstance(obj_in, dict):
+        update_data = obj_in
+    else:
+        update_data = _column_values(obj_in, exclude_unset=True)
+    columns = inspect(db_obj).mapper.column_attrs.keys()
+    for field, value in update_data.items():
+        if field in columns:
+            setattr(db_obj, field, value)
+
 # Professional Info CRUD operations
 def create_professional_info(db: Session, *, user_id: str, obj_in: ProfessionalInfoCreate) -> ProfessionalInfo:
-    obj_in_data = jsonable_encoder(obj_in)
+    obj_in_data = _column_values(obj_in)
     db_obj = ProfessionalInfo(**obj_in_data, user_id=user_id)
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    invalidate_portfolio(user_id)
     return db_obj
 
 def get_professional_info(db: Session, user_id: str) -> Optional[ProfessionalInfo]:
@@ -30,28 +63,23 @@ def update_professional_info(
     db_obj: ProfessionalInfo,
     obj_in: Union[ProfessionalInfoUpdate, dict]
 ) -> ProfessionalInfo:
-    obj_data = jsonable_encoder(db_obj)
-    if isinstance(obj_in, dict):
-        update_data = obj_in
-    else:
-        update_data = obj_in.dict(exclude_unset=True)
-    for field in obj_data:
-        if field in update_data:
-            setattr(db_obj, field, update_data[field])
+    _apply_update(db_obj, obj_in)
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    invalidate_portfolio(db_obj.user_id)
     return db_obj
 
 # Education CRUD operations
 def create_education(
     db: Session, *, professional_info_id: int, obj_in: EducationCreate
 ) -> Education:
-    obj_in_data = jsonable_encoder(obj_in)
+    obj_in_data = _column_values(obj_in)
     db_obj = Education(**obj_in_data, professional_info_id=professional_info_id)
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    _invalidate_professional_info_owner(db, professional_info_id)
     return db_obj
 
 def get_education(db: Session, id: int) -> Optional[Education]:
@@ -68,34 +96,31 @@ def update_education(
     db_obj: Education,
     obj_in: Union[EducationUpdate, dict]
 ) -> Education:
-    obj_data = jsonable_encoder(db_obj)
-    if isinstance(obj_in, dict):
-        update_data = obj_in
-    else:
-        update_data = obj_in.dict(exclude_unset=True)
-    for field in obj_data:
-        if field in update_data:
-            setattr(db_obj, field, update_data[field])
+    _apply_update(db_obj, obj_in)
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    _invalidate_professional_info_owner(db, db_obj.professional_info_id)
     return db_obj
 
 def delete_education(db: Session, *, id: int) -> Education:
     obj = db.query(Education).get(id)
+    professional_info_id = obj.professional_info_id
     db.delete(obj)
     db.commit()
+    _invalidate_professional_info_owner(db, professional_info_id)
     return obj
 
 # Project CRUD operations
 def create_project(
     db: Session, *, professional_info_id: int, obj_in: ProjectCreate
 ) -> Project:
-    obj_in_data = jsonable_encoder(obj_in)
+    obj_in_data = _column_values(obj_in)
     db_obj = Project(**obj_in_data, professional_info_id=professional_info_id)
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    _invalidate_professional_info_owner(db, professional_info_id)
     return db_obj
 
 def get_project(db: Session, id: int) -> Optional[Project]:
@@ -112,21 +137,17 @@ def update_project(
     db_obj: Project,
     obj_in: Union[ProjectUpdate, dict]
 ) -> Project:
-    obj_data = jsonable_encoder(db_obj)
-    if isinstance(obj_in, dict):
-        update_data = obj_in
-    else:
-        update_data = obj_in.dict(exclude_unset=True)
-    for field in obj_data:
-        if field in update_data:
-            setattr(db_obj, field, update_data[field])
+    _apply_update(db_obj, obj_in)
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    _invalidate_professional_info_owner(db, db_obj.professional_info_id)
     return db_obj
 
 def delete_project(db: Session, *, id: int) -> Project:
     obj = db.query(Project).get(id)
+    professional_info_id = obj.professional_info_id
     db.delete(obj)
     db.commit()
+    _invalidate_professional_info_owner(db, professional_info_id)
     return obj 
\ No newline at end of file
@@ -1,24 +1,43 @@
 from sqlalchemy.orm import Session
+from typing import Optional
 import uuid
-from app import models, schemas
+from app import models
+from app.schemas.projects import ProjectCreate, ProjectUpdate
+from app.core.cache import invalidate_portfolio
+from app.core.pagination import DEFAULT_PAGE_SIZE, Page, keyset_query, make_page
+from app.crud.imports import get_or_create_professional_info_id
 
-def create_project(db: Session, project: schemas.projects.ProjectCreate, user_id: uuid.UUID):
-    db_project = models.projects.Project(**project.dict(), user_id=user_id)
+def create_project(db: Session, project: ProjectCreate, user_id: uuid.UUID):
+    # A missing professional_info is created in the same transaction
+    professional_info_id = get_or_create_professional_info_id(db, user_id)
+    db_project = models.projects.Project(
+        **project.dict(), id=uuid.uuid4(), professional_info_id=professional_info_id
+    )
     db.add(db_project)
     db.commit()
     db.refresh(db_project)
+    invalidate_portfolio(user_id)
     return db_project
 
-def get_projects(db: Session, user_id: uuid.UUID):
-    return db.query(models.projects.Project).filter(models.projects.Project.user_id == user_id).all()
+def get_projects(
+    db: Session, user_id: uuid.UUID, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, include_total: bool = False
+) -> Page:
+    Project = models.projects.Project
+    query = db.query(Project).join(models.profile.ProfessionalInfo).filter(
+        models.profile.ProfessionalInfo.user_id == user_id
+    )
+    total = query.count() if include_total else None
+    rows = keyset_query(query, Project.created_at, Project.id, cursor, limit).all()
+    return make_page(rows, limit, total)
 
-def get_project(db: Session, project_id: int, user_id: uuid.UUID):
-    return db.query(models.projects.Project).filter(
+def get_project(db: Session, project_id: uuid.UUID, user_id: uuid.UUID):
+    # One round trip: ownership is checked through the join
+    return db.query(models.projects.Project).join(models.profile.ProfessionalInfo).filter(
         models.projects.Project.id == project_id,
-        models.projects.Project.user_id == user_id
+        models.profile.ProfessionalInfo.user_id == user_id
     ).first()
 
-def update_project(db: Session, project_id: int, project: schemas.projects.ProjectUpdate, user_id: uuid.UUID):
+def update_project(db: Session, project_id: uuid.UUID, project: ProjectUpdate, user_id: uuid.UUID):
     db_project = get_project(db, project_id, user_id)
     if not db_project:
         return None
@@ -28,13 +47,15 @@ def update_project(db: Session, project_id: int, project: schemas.projects.Proje
     
     db.commit()
     db.refresh(db_project)
+    invalidate_portfolio(user_id)
     return db_project
 
-def delete_project(db: Session, project_id: int, user_id: uuid.UUID):
+def delete_project(db: Session, project_id: uuid.UUID, user_id: uuid.UUID):
     db_project = get_project(db, project_id, user_id)
     if not db_project:
         return None
     
     db.delete(db_project)
     db.commit()
+    invalidate_portfolio(user_id)
     return db_project
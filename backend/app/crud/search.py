@@ -0,0 +1,58 @@
+from sqlalchemy import exists, func
+from sqlalchemy.orm import Session, contains_eager
+from typing import List, Optional
+
+from app import models
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    Page,
+    encode_rank_cursor,
+    keyset_query,
+    make_page,
+    ranked_keyset_query,
+)
+from app.database.search import SEARCH_CONFIG
+
+def search_profiles(
+    db: Session,
+    query: Optional[str] = None,
+    skills: Optional[List[str]] = None,
+    technologies: Optional[List[str]] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page:
+    """
+    Find profiles having every skill in skills and, for each technology in
+    technologies, at least one project using it; both match exactly as
+    stored and are served by the GIN indexes on skills and technologies.
+
+    With a text query, only profiles whose search document matches are
+    returned, best match first, as (ProfessionalInfo, rank) rows; the
+    query uses web search syntax ("quoted phrases", or, -excluded). Without
+    one, profiles come back in (created_at, id) order with rank None.
+    """
+    ProfessionalInfo = models.profile.ProfessionalInfo
+    Project = models.projects.Project
+
+    q = db.query(ProfessionalInfo).join(ProfessionalInfo.user).options(contains_eager(ProfessionalInfo.user))
+    if skills:
+        q = q.filter(ProfessionalInfo.skills.contains(skills))
+    for technology in technologies or []:
+        q = q.filter(exists().where(
+            Project.professional_info_id == ProfessionalInfo.id,
+            Project.technologies.contains([technology]),
+        ))
+
+    if not query:
+        rows = keyset_query(q, ProfessionalInfo.created_at, ProfessionalInfo.id, cursor, limit).all()
+        page = make_page(rows, limit)
+        page.items = [(info, None) for info in page.items]
+        return page
+
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    # Normalization 1 divides by 1 + log(document length), so long
+    # portfolios do not win on volume alone
+    rank = func.ts_rank_cd(ProfessionalInfo.search_vector, ts_query, 1)
+    q = q.add_columns(rank).filter(ProfessionalInfo.search_vector.op("@@")(ts_query))
+    rows = ranked_keyset_query(q, rank, ProfessionalInfo.id, cursor, limit).all()
+    return make_page(rows, limit, cursor_for=lambda row: encode_rank_cursor(row[1], row[0].id))
@@ -1,15 +1,27 @@
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 from app.models.user import User
+from app.models.password_reset import PasswordResetToken
 from app.models.profile import ProfessionalInfo
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
-from typing import List, Optional
+from app.core.security import get_password_hash, hash_reset_token, verify_password
+from app.core.cache import invalidate_portfolio, invalidate_principal
+from typing import Dict, List, Optional
+from app.core.pagination import DEFAULT_PAGE_SIZE, Page, keyset_query, make_page
 import uuid
 import secrets
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
-def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
-    return db.query(User).offset(skip).limit(limit).all()
+PASSWORD_RESET_TOKEN_TTL = timedelta(hours=24)
+PURGE_BATCH_SIZE = 1000
+
+def get_users(
+    db: Session, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, include_total: bool = False
+) -> Page[User]:
+    query = db.query(User)
+    total = query.count() if include_total else None
+    rows = keyset_query(query, User.created_at, User.id, cursor, limit).all()
+    return make_page(rows, limit, total)
 
 def get_user(db: Session, user_id: uuid.UUID) -> Optional[User]:
     return db.query(User).filter(User.id == user_id).first()
@@ -56,6 +68,19 @@ def update_user(db: Session, user_id: uuid.UUID, user: UserUpdate) -> Optional[U
             
         db.commit()
         db.refresh(db_user)
+        invalidate_principal(user_id)
+        invalidate_portfolio(user_id)
+    return db_user
+
+def set_avatar(db: Session, user_id: uuid.UUID, avatar: str, avatar_variants: Optional[Dict[str, str]]) -> Optional[User]:
+    db_user = get_user(db, user_id)
+    if db_user:
+        db_user.avatar = avatar
+        db_user.avatar_variants = avatar_variants
+        db.commit()
+        db.refresh(db_user)
+        invalidate_principal(user_id)
+        invalidate_portfolio(user_id)
     return db_user
 
 def delete_user(db: Session, user_id: uuid.UUID) -> bool:
@@ -63,6 +88,8 @@ def delete_user(db: Session, user_id: uuid.UUID) -> bool:
     if db_user:
         db.delete(db_user)
         db.commit()
+        invalidate_principal(user_id)
+        invalidate_portfolio(user_id)
         return True
     return False
 
@@ -74,7 +101,11 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
 
 def generate_password_reset_token(db: Session, email: str) -> Optional[str]:
     """
-    Generate a password reset token for the user and store it in the database
+    Generate a password reset token for the user and store its digest.
+
+    This table keeps only the SHA-256 of the token. The plaintext is in the
+    emailed link, which also sits in the email outbox until the email is
+    sent or given up on. Issuing a new token revokes the previous ones.
     """
     user = get_user_by_email(db, email)
     if not user:
@@ -82,11 +113,13 @@ def generate_password_reset_token(db: Session, email: str) -> Optional[str]:
         
     # Generate a random token
     token = secrets.token_urlsafe(32)
-    expires = datetime.utcnow() + timedelta(hours=24)
     
-    # Store the token and expiry in the database
-    user.reset_token = token
-    user.reset_token_expires = expires
+    db.execute(delete(PasswordResetToken).where(PasswordResetToken.user_id == user.id))
+    db.add(PasswordResetToken(
+        token_hash=hash_reset_token(token),
+        user_id=user.id,
+        expires_at=datetime.now(timezone.utc) + PASSWORD_RESET_TOKEN_TTL,
+    ))
     db.commit()
     
     return token
@@ -95,19 +128,42 @@ def reset_password_with_token(db: Session, token: str, new_password: str) -> boo
     """
     Reset a user's password using a valid reset token
     """
-    # Find the user with this token
-    user = db.query(User).filter(
-        User.reset_token == token,
-        User.reset_token_expires > datetime.utcnow()
+    # Unique index lookup on the token digest
+    reset_token = db.query(PasswordResetToken).filter(
+        PasswordResetToken.token_hash == hash_reset_token(token),
+        PasswordResetToken.expires_at > datetime.now(timezone.utc)
     ).first()
-    
+    if not reset_token:
+        return False
+    user = get_user(db, reset_token.user_id)
     if not user:
         return False
         
-    # Update the password and clear the reset token
+    # Update the password and revoke the user's reset tokens
     user.password = get_password_hash(new_password)
-    user.reset_token = None
-    user.reset_token_expires = None
+    db.execute(delete(PasswordResetToken).where(PasswordResetToken.user_id == user.id))
     db.commit()
+    invalidate_principal(user.id)
     
-    return True 
\ No newline at end of file
+    return True
+
+def purge_expired_reset_tokens(db: Session, batch_size: int = PURGE_BATCH_SIZE) -> int:
+    """
+    Delete expired reset tokens in batches, returning how many were removed.
+    Each batch is its own short transaction, so the purge never holds
+    locks on a large part of the table.
+    """
+    purged = 0
+    while True:
+        expired = (
+            select(PasswordResetToken.id)
+            .where(PasswordResetToken.expires_at <= datetime.now(timezone.utc))
+            .limit(batch_size)
+        )
+        deleted = db.execute(
+            delete(PasswordResetToken).where(PasswordResetToken.id.in_(expired.scalar_subquery()))
+        ).rowcount
+        db.commit()
+        purged += deleted
+        if deleted < batch_size:
+            return purged
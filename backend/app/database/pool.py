@@ -0,0 +1,97 @@
+from typing import Any, Dict, Optional, Type
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class PoolMetrics:
+    """
+    Counters for one engine's connection pool.
+
+    Checkout latency is the time spent waiting for a connection from the
+    pool, including time spent opening a new one when the pool grows.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.checkout_seconds_total = 0.0
+        self.checkout_seconds_max = 0.0
+
+    def record_checkout(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_seconds_total += seconds
+            if seconds > self.checkout_seconds_max:
+                self.checkout_seconds_max = seconds
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def stats(self, pool: Optional[Pool] = None) -> Dict[str, Any]:
+        with self._lock:
+            data: Dict[str, Any] = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "checkout_seconds_total": self.checkout_seconds_total,
+                "checkout_seconds_max": self.checkout_seconds_max,
+                "checkout_seconds_avg": (
+                    self.checkout_seconds_total / self.checkouts if self.checkouts else 0.0
+                ),
+            }
+        if isinstance(pool, QueuePool):
+            data.update(
+                {
+                    "pool_size": pool.size(),
+                    "checked_out": pool.checkedout(),
+                    "checked_in": pool.checkedin(),
+                    "overflow": max(pool.overflow(), 0),
+                    "max_overflow": pool._max_overflow,
+                }
+            )
+        return data
+
+
+class _InstrumentedPoolMixin:
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+
+def instrumented_pool_class(name: str, async_: bool = False) -> Type[QueuePool]:
+    """
+    Build a QueuePool subclass that records checkout latency into its own
+    PoolMetrics. The metrics live on the class so they survive
+    Pool.recreate() after engine.dispose().
+    """
+    base = AsyncAdaptedQueuePool if async_ else QueuePool
+    return type(
+        f"Instrumented{base.__name__}",
+        (_InstrumentedPoolMixin, base),
+        {"metrics": PoolMetrics(name)},
+    )
+
+
+def pool_stats(engine) -> Dict[str, Any]:
+    """
+    Pool counters and current occupancy for a (sync or async) engine
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    pool = sync_engine.pool
+    metrics = getattr(pool, "metrics", None)
+    if metrics is None:
+        return {"status": pool.status()}
+    return metrics.stats(pool)
@@ -0,0 +1,160 @@
+"""
+PostgreSQL objects behind profile search.
+
+professional_info.search_vector holds one weighted document per profile,
+built from the owner's name and bio, the profile's skills, and the
+titles, names, technologies and descriptions of its experiences and
+projects. Triggers keep it current, so reads never rebuild it:
+
+- a BEFORE trigger on professional_info when skills or the owner change
+- statement-level triggers on experiences and projects, which refresh
+  each affected profile once per statement however many rows it touched
+- a trigger on users when the name or bio changes
+
+The migration that introduced search creates the same objects. They are
+also attached to Base.metadata here so DB_AUTO_CREATE databases get them.
+"""
+from sqlalchemy import DDL, event
+
+from app.database.database import Base
+
+# Text search configuration for both the stored documents and the queries
+SEARCH_CONFIG = "english"
+# Session setting that suspends the experience and project triggers
+SKIP_SEARCH_REFRESH = "showcasify.skip_search_refresh"
+
+SEARCH_DOCUMENT_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION professional_info_search_document(info_id uuid, owner_id uuid, info_skills jsonb)
+RETURNS tsvector LANGUAGE sql STABLE AS $$
+    SELECT
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce((SELECT name FROM users WHERE id = owner_id), '')), 'A')
+        || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce((
+            SELECT string_agg(concat_ws(' ', title, company), ' ')
+            FROM experiences WHERE professional_info_id = info_id
+        ), '')), 'A')
+        || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce((
+            SELECT string_agg(skill, ' ')
+            FROM jsonb_array_elements_text(
+                CASE WHEN jsonb_typeof(info_skills) = 'array' THEN info_skills ELSE '[]'::jsonb END
+            ) AS skill
+        ), '')), 'B')
+        || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce((
+            SELECT string_agg(concat_ws(' ', p.name, t.names), ' ')
+            FROM projects p
+            CROSS JOIN LATERAL (
+                SELECT string_agg(technology, ' ') AS names
+                FROM jsonb_array_elements_text(
+                    CASE WHEN jsonb_typeof(p.technologies) = 'array' THEN p.technologies ELSE '[]'::jsonb END
+                ) AS technology
+            ) t
+            WHERE p.professional_info_id = info_id
+        ), '')), 'B')
+        || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce((SELECT bio FROM users WHERE id = owner_id), '')), 'C')
+        || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce((
+            SELECT string_agg(description, ' ') FROM experiences WHERE professional_info_id = info_id
+        ), '')), 'D')
+        || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce((
+            SELECT string_agg(description, ' ') FROM projects WHERE professional_info_id = info_id
+        ), '')), 'D')
+$$
+"""
+
+REFRESH_SEARCH_VECTOR = (
+    "UPDATE professional_info "
+    "SET search_vector = professional_info_search_document(id, user_id, skills) "
+)
+
+SEARCH_TRIGGER_FUNCTIONS = [
+    """
+    CREATE OR REPLACE FUNCTION professional_info_search_vector_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.search_vector := professional_info_search_document(NEW.id, NEW.user_id, NEW.skills);
+        RETURN NEW;
+    END
+    $$
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION refresh_professional_info_search() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        -- Set by backfills that rewrite rows without changing their content
+        IF current_setting('{SKIP_SEARCH_REFRESH}', true) = 'on' THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP = 'INSERT' THEN
+            {REFRESH_SEARCH_VECTOR} WHERE id IN (SELECT professional_info_id FROM new_rows);
+        ELSIF TG_OP = 'DELETE' THEN
+            {REFRESH_SEARCH_VECTOR} WHERE id IN (SELECT professional_info_id FROM old_rows);
+        ELSE
+            {REFRESH_SEARCH_VECTOR} WHERE id IN (
+                SELECT professional_info_id FROM new_rows UNION SELECT professional_info_id FROM old_rows
+            );
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION refresh_user_search() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        {REFRESH_SEARCH_VECTOR} WHERE user_id = NEW.id;
+        RETURN NULL;
+    END
+    $$
+    """,
+]
+
+# (name, table, definition) of every trigger
+SEARCH_TRIGGERS = [
+    (
+        "professional_info_search_vector",
+        "professional_info",
+        "BEFORE INSERT OR UPDATE OF user_id, skills ON professional_info "
+        "FOR EACH ROW EXECUTE FUNCTION professional_info_search_vector_trigger()",
+    ),
+    (
+        "users_search_update",
+        "users",
+        "AFTER UPDATE OF name, bio ON users "
+        "FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name OR OLD.bio IS DISTINCT FROM NEW.bio) "
+        "EXECUTE FUNCTION refresh_user_search()",
+    ),
+]
+# Transition tables allow only one event per trigger
+for _table in ("experiences", "projects"):
+    SEARCH_TRIGGERS += [
+        (
+            f"{_table}_search_insert",
+            _table,
+            f"AFTER INSERT ON {_table} REFERENCING NEW TABLE AS new_rows "
+            "FOR EACH STATEMENT EXECUTE FUNCTION refresh_professional_info_search()",
+        ),
+        (
+            f"{_table}_search_update",
+            _table,
+            f"AFTER UPDATE ON {_table} REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+            "FOR EACH STATEMENT EXECUTE FUNCTION refresh_professional_info_search()",
+        ),
+        (
+            f"{_table}_search_delete",
+            _table,
+            f"AFTER DELETE ON {_table} REFERENCING OLD TABLE AS old_rows "
+            "FOR EACH STATEMENT EXECUTE FUNCTION refresh_professional_info_search()",
+        ),
+    ]
+
+
+def search_ddl() -> list:
+    """
+    Statements that (re)create every search function and trigger. Safe to
+    run again on a database that already has them. The indexes are
+    declared on the models.
+    """
+    statements = [SEARCH_DOCUMENT_FUNCTION, *SEARCH_TRIGGER_FUNCTIONS]
+    for name, table, definition in SEARCH_TRIGGERS:
+        statements.append(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+        statements.append(f"CREATE TRIGGER {name} {definition}")
+    return statements
+
+
+for _statement in search_ddl():
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
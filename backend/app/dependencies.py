@@ -1,29 +1,30 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import uuid
 
+from app.core.cache import principal_cache
 from app.core.security import ALGORITHM, SECRET_KEY
 from app.crud import user as user_crud
-from app.database.database import get_db
+from app.crud.aio import user as user_crud_async
+from app.database.database import ASYNC_DB_ENABLED, get_async_db, get_db
 from app.models.user import User
 from app.schemas.token import TokenPayload
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
-async def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+def _token_subject(token: str) -> uuid.UUID:
     """
-    Get the current user from the token
+    Decode the JWT and return its subject as a user id
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
@@ -34,12 +35,61 @@ async def get_current_user(
         raise credentials_exception
     
     try:
-        user_uuid = uuid.UUID(user_id)
+        return uuid.UUID(user_id)
     except ValueError:
         raise credentials_exception
-        
+
+def get_current_user_sync(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> User:
+    """
+    Get the current user from the token.
+
+    Users are served from the principal cache when possible. On a miss the
+    row is loaded, detached from the request session and cached, so later
+    commits in this request cannot expire it. Declared sync so the miss
+    queries from the threadpool.
+    """
+    user_uuid = _token_subject(token)
+    cache_key = str(user_uuid)
+    user = principal_cache.get(cache_key)
+    if user is not None:
+        return user
+
+    # Taken before the load, so a write committed meanwhile stops the fill
+    generation = principal_cache.generation()
     user = user_crud.get_user(db, user_id=user_uuid)
     if user is None:
         raise credentials_exception
-    
-    return user 
\ No newline at end of file
+
+    db.expunge(user)
+    # End the read so the connection goes back to the pool rather than
+    # idling in a transaction while the handler waits on the client
+    db.rollback()
+    principal_cache.set(cache_key, user, generation)
+    return user
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> User:
+    """
+    Same as get_current_user_sync, but the cache miss goes through AsyncSession
+    """
+    user_uuid = _token_subject(token)
+    cache_key = str(user_uuid)
+    user = principal_cache.get(cache_key)
+    if user is not None:
+        return user
+
+    # Taken before the load, so a write committed meanwhile stops the fill
+    generation = principal_cache.generation()
+    user = await user_crud_async.get_user(db, user_id=user_uuid)
+    if user is None:
+        raise credentials_exception
+
+    db.expunge(user)
+    await db.rollback()
+    principal_cache.set(cache_key, user, generation)
+    return user
+
+get_current_user = get_current_user_async if ASYNC_DB_ENABLED else get_current_user_sync
\ No newline at end of file
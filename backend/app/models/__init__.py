@@ -4,5 +4,7 @@ from app.models.education import Education
 from app.models.experiences import Experience
 from app.models.projects import Project
 from app.models.profile import ProfessionalInfo
+from app.models.outbox import EmailOutbox
+from app.models.password_reset import PasswordResetToken
 
-__all__ = ["User", "UserRole", "Preference", "Education", "Experience", "Project", "ProfessionalInfo"]
+__all__ = ["User", "UserRole", "Preference", "Education", "Experience", "Project", "ProfessionalInfo", "EmailOutbox", "PasswordResetToken"]
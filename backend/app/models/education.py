@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, Boolean, Text, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Boolean, Text, DateTime, Index
+from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -7,6 +8,10 @@ from app.database.database import Base
 
 class Education(Base):
     __tablename__ = "educations"
+    __table_args__ = (
+        # Keyset pagination order within a portfolio
+        Index("ix_educations_professional_info_id_created_at_id", "professional_info_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, index=True)
     professional_info_id = Column(UUID(as_uuid=True), ForeignKey("professional_info.id"), nullable=False)
@@ -18,7 +23,7 @@ class Education(Base):
     is_current = Column(Boolean, default=False)
     description = Column(Text)
     gpa = Column(String(10))
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     professional_info = relationship("ProfessionalInfo", back_populates="educations")
@@ -1,18 +1,25 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Date, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
 import uuid
 from app.database.database import Base
 
 class Experience(Base):
     __tablename__ = "experiences"
+    __table_args__ = (
+        # Keyset pagination order within a portfolio
+        Index("ix_experiences_professional_info_id_created_at_id", "professional_info_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, index=True)
-    professional_info_id = Column(UUID(as_uuid=True), ForeignKey("professional_info.id"), nullable=False)
+    professional_info_id = Column(UUID(as_uuid=True), ForeignKey("professional_info.id"), nullable=False, index=True)
     title = Column(String, nullable=False)
     company = Column(String, nullable=False)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=True)
     description = Column(Text)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     professional_info = relationship("ProfessionalInfo", back_populates="experiences")
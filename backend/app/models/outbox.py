@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from datetime import datetime, timezone
+from app.database.database import Base
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    email_to = Column(String(320), nullable=False)
+    subject = Column(String(255), nullable=False)
+    template_name = Column(String(100), nullable=False)
+    # Emptied once the row is sent or failed: may hold secrets (reset links)
+    template_data = Column(JSON, nullable=False, default=dict)
+    status = Column(String(16), nullable=False, default=PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, default=_utcnow)
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=_utcnow)
+    sent_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
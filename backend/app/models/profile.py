@@ -1,22 +1,34 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Date, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Date, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 import uuid
 
 from app.database.database import Base
+from app.database import search  # noqa: F401  (triggers that maintain search_vector)
 
 class ProfessionalInfo(Base):
     __tablename__ = "professional_info"
+    __table_args__ = (
+        # Containment (skills @> '["Rust"]') for search filters
+        Index("ix_professional_info_skills", "skills", postgresql_using="gin", postgresql_ops={"skills": "jsonb_path_ops"}),
+        Index("ix_professional_info_search_vector", "search_vector", postgresql_using="gin"),
+        # Keyset pagination order for unfiltered search
+        Index("ix_professional_info_created_at_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    contact_info = Column(JSON)  # Email, phone, location, etc.
-    social_links = Column(JSON)  # LinkedIn, GitHub, Portfolio, etc.
-    skills = Column(JSON)  # Array of skills
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    contact_info = Column(JSONB)  # Email, phone, location, etc.
+    social_links = Column(JSONB)  # LinkedIn, GitHub, Portfolio, etc.
+    skills = Column(JSONB)  # Array of skills
     profile_image_url = Column(String(255))
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Weighted full-text document, maintained by database triggers (see
+    # app.database.search); never written by the application
+    search_vector = deferred(Column(TSVECTOR))
 
     # Relationships
     user = relationship("User", back_populates="professional_info")
@@ -1,26 +1,33 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Date, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Date, Boolean, DateTime, Index
+from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID, JSON
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
 from datetime import datetime
 from app.database.database import Base
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Containment (technologies @> '["Go"]') for search filters
+        Index("ix_projects_technologies", "technologies", postgresql_using="gin", postgresql_ops={"technologies": "jsonb_path_ops"}),
+        # Keyset pagination order within a portfolio
+        Index("ix_projects_professional_info_id_created_at_id", "professional_info_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, index=True)
-    professional_info_id = Column(UUID(as_uuid=True), ForeignKey("professional_info.id"), nullable=False)
+    professional_info_id = Column(UUID(as_uuid=True), ForeignKey("professional_info.id"), nullable=False, index=True)
     name = Column(String(200), nullable=False)
     description = Column(Text)
-    technologies = Column(JSON)  # Array of technologies used
+    technologies = Column(JSONB)  # Array of technologies used
     start_date = Column(Date)
     end_date = Column(Date)
     is_current = Column(Boolean, default=False)
     project_url = Column(String(255))
     github_url = Column(String(255))
-    achievements = Column(JSON)  # Array of key achievements
-    images = Column(JSON)  # Array of project image URLs
-    created_at = Column(DateTime, default=datetime.utcnow)
+    achievements = Column(JSONB)  # Array of key achievements
+    images = Column(JSONB)  # Array of project image URLs
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     professional_info = relationship("ProfessionalInfo", back_populates="projects")
@@ -0,0 +1,56 @@
+from enum import Enum
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, Iterator
+
+from app.core.export import EXPORT_BATCH_SIZE, chunked, csv_lines, gzipped, ndjson_lines
+from app.core.permissions import is_admin
+from app.crud.export import iter_portfolios
+from app.database.database import SessionLocal
+from app.models.user import User
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+def _portfolio_rows() -> Iterator[Dict[str, Any]]:
+    # Its own session: the stream outlives the request's dependencies
+    db = SessionLocal()
+    try:
+        yield from iter_portfolios(db, EXPORT_BATCH_SIZE)
+    finally:
+        db.close()
+
+@router.get("/export/portfolios")
+def export_portfolios(
+    format: ExportFormat = ExportFormat.NDJSON,
+    gzip: bool = False,
+    current_user: User = Depends(is_admin)
+):
+    """
+    Stream every user's portfolio (profile, professional info, experiences,
+    educations and projects, never password hashes). Admins only.
+
+    NDJSON has one user per line. CSV has one row per user with nested
+    values as JSON. With gzip=true the body is compressed on the fly and
+    sent with Content-Encoding: gzip. Memory use is flat however many
+    users there are, so this is the way to take a full copy instead of
+    paging through /users/.
+    """
+    encode = ndjson_lines if format is ExportFormat.NDJSON else csv_lines
+    body = chunked(encode(_portfolio_rows()))
+    headers = {
+        "Content-Disposition": f'attachment; filename="portfolios.{format.value}"',
+        "Cache-Control": "no-store",
+    }
+    if gzip:
+        body = gzipped(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=EXPORT_MEDIA_TYPES[format], headers=headers)
@@ -1,32 +1,27 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import jwt
 
+from app.core.rate_limit import limit_login_attempts, refund_login_attempt
 from app.core.security import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
 from app.crud import user as user_crud
-from app.database.database import get_db
+from app.crud.aio import user as user_crud_async
+from app.database.database import ASYNC_DB_ENABLED, get_async_db, get_db
 from app.schemas.token import Token
 from app.schemas.user import User
 
 router = APIRouter(
     prefix="/auth",
     tags=["authentication"],
-    responses={401: {"description": "Unauthorized"}},
+    responses={401: {"description": "Unauthorized"}, 429: {"description": "Too many attempts"}},
 )
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
-@router.post("/token", response_model=Token)
-async def login_for_access_token(
-    form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
-):
-    """
-    OAuth2 compatible token login, get an access token for future requests
-    """
-    user = user_crud.authenticate_user(db, email=form_data.username, password=form_data.password)
+def _token_response(user) -> dict:
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -39,4 +34,34 @@ async def login_for_access_token(
         subject=str(user.id), expires_delta=access_token_expires
     )
     
-    return {"access_token": access_token, "token_type": "bearer"} 
\ No newline at end of file
+    return {"access_token": access_token, "token_type": "bearer"}
+
+if ASYNC_DB_ENABLED:
+    @router.post("/token", response_model=Token, dependencies=[Depends(limit_login_attempts)])
+    async def login_for_access_token(
+        form_data: OAuth2PasswordRequestForm = Depends(),
+        db: AsyncSession = Depends(get_async_db)
+    ):
+        """
+        OAuth2 compatible token login, get an access token for future requests
+        """
+        user = await user_crud_async.authenticate_user(db, email=form_data.username, password=form_data.password)
+        if user:
+            refund_login_attempt(form_data.username)
+        return _token_response(user)
+else:
+    @router.post("/token", response_model=Token, dependencies=[Depends(limit_login_attempts)])
+    def login_for_access_token(
+        form_data: OAuth2PasswordRequestForm = Depends(),
+        db: Session = Depends(get_db)
+    ):
+        """
+        OAuth2 compatible token login, get an access token for future requests.
+
+        Declared sync so the DB lookup runs in the threadpool; the bcrypt check
+        itself is handed to the bounded password hashing pool.
+        """
+        user = user_crud.authenticate_user(db, email=form_data.username, password=form_data.password)
+        if user:
+            refund_login_attempt(form_data.username)
+        return _token_response(user)
\ No newline at end of file
@@ -1,40 +1,90 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+import uuid
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database.database import get_db
+from app.database.database import ASYNC_DB_ENABLED, get_async_db, get_db
 from app.schemas.education import EducationCreate, EducationUpdate, EducationOut
 from app.crud import education as education_crud
+from app.crud.aio import education as education_crud_async
 from app.dependencies import get_current_user
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, set_page_headers
+from app.core.serialization import trusted_response
 from app.models.user import User
 
 router = APIRouter(prefix="/education", tags=["Education"])
 
-@router.post("/", response_model=EducationOut)
-def create_education(education: EducationCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return education_crud.create_education(db, education, user_id=current_user.id)
-
-@router.get("/", response_model=list[EducationOut])
-def get_educations(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return education_crud.get_educations(db, user_id=current_user.id)
-
-@router.put("/{education_id}", response_model=EducationOut)
-def update_education(
-    education_id: int,
-    education: EducationUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    db_education = education_crud.update_education(db, education_id, education, user_id=current_user.id)
-    if not db_education:
-        raise HTTPException(status_code=404, detail="Education not found")
-    return db_education
+def _educations_response(page):
+    response = trusted_response(EducationOut, page.items)
+    set_page_headers(response, page)
+    return response
 
-@router.delete("/{education_id}", response_model=EducationOut)
-def delete_education(
-    education_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    db_education = education_crud.delete_education(db, education_id, user_id=current_user.id)
+def _or_404(db_education):
     if not db_education:
         raise HTTPException(status_code=404, detail="Education not found")
     return db_education
+
+if ASYNC_DB_ENABLED:
+    @router.post("/", response_model=EducationOut)
+    async def create_education(education: EducationCreate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+        return await education_crud_async.create_education(db, education, user_id=current_user.id)
+
+    @router.get("/", response_model=list[EducationOut])
+    async def get_educations(
+        cursor: Optional[str] = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        include_total: bool = False,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        page = await education_crud_async.get_educations(db, user_id=current_user.id, cursor=cursor, limit=limit, include_total=include_total)
+        return _educations_response(page)
+
+    @router.put("/{education_id}", response_model=EducationOut)
+    async def update_education(
+        education_id: uuid.UUID,
+        education: EducationUpdate,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        return _or_404(await education_crud_async.update_education(db, education_id, education, user_id=current_user.id))
+
+    @router.delete("/{education_id}", response_model=EducationOut)
+    async def delete_education(
+        education_id: uuid.UUID,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        return _or_404(await education_crud_async.delete_education(db, education_id, user_id=current_user.id))
+else:
+    @router.post("/", response_model=EducationOut)
+    def create_education(education: EducationCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+        return education_crud.create_education(db, education, user_id=current_user.id)
+
+    @router.get("/", response_model=list[EducationOut])
+    def get_educations(
+        cursor: Optional[str] = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        include_total: bool = False,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        page = education_crud.get_educations(db, user_id=current_user.id, cursor=cursor, limit=limit, include_total=include_total)
+        return _educations_response(page)
+
+    @router.put("/{education_id}", response_model=EducationOut)
+    def update_education(
+        education_id: uuid.UUID,
+        education: EducationUpdate,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        return _or_404(education_crud.update_education(db, education_id, education, user_id=current_user.id))
+
+    @router.delete("/{education_id}", response_model=EducationOut)
+    def delete_education(
+        education_id: uuid.UUID,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        return _or_404(education_crud.delete_education(db, education_id, user_id=current_user.id))
@@ -1,40 +1,90 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+import uuid
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database.database import get_db
+from app.database.database import ASYNC_DB_ENABLED, get_async_db, get_db
 from app.schemas.experiences import ExperienceCreate, ExperienceUpdate, ExperienceOut
 from app.crud import experiences as experience_crud
+from app.crud.aio import experiences as experience_crud_async
 from app.dependencies import get_current_user
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, set_page_headers
+from app.core.serialization import trusted_response
 from app.models.user import User
 
 router = APIRouter(prefix="/experiences", tags=["Experiences"])
 
-@router.post("/", response_model=ExperienceOut)
-def create_experience(experience: ExperienceCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return experience_crud.create_experience(db, experience, user_id=current_user.id)
-
-@router.get("/", response_model=list[ExperienceOut])
-def get_experiences(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return experience_crud.get_experiences(db, user_id=current_user.id)
-
-@router.put("/{experience_id}", response_model=ExperienceOut)
-def update_experience(
-    experience_id: int,
-    experience: ExperienceUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    db_experience = experience_crud.update_experience(db, experience_id, experience, user_id=current_user.id)
-    if not db_experience:
-        raise HTTPException(status_code=404, detail="Experience not found")
-    return db_experience
+def _experiences_response(page):
+    response = trusted_response(ExperienceOut, page.items)
+    set_page_headers(response, page)
+    return response
 
-@router.delete("/{experience_id}", response_model=ExperienceOut)
-def delete_experience(
-    experience_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    db_experience = experience_crud.delete_experience(db, experience_id, user_id=current_user.id)
+def _or_404(db_experience):
     if not db_experience:
         raise HTTPException(status_code=404, detail="Experience not found")
     return db_experience
+
+if ASYNC_DB_ENABLED:
+    @router.post("/", response_model=ExperienceOut)
+    async def create_experience(experience: ExperienceCreate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+        return await experience_crud_async.create_experience(db, experience, user_id=current_user.id)
+
+    @router.get("/", response_model=list[ExperienceOut])
+    async def get_experiences(
+        cursor: Optional[str] = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        include_total: bool = False,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        page = await experience_crud_async.get_experiences(db, user_id=current_user.id, cursor=cursor, limit=limit, include_total=include_total)
+        return _experiences_response(page)
+
+    @router.put("/{experience_id}", response_model=ExperienceOut)
+    async def update_experience(
+        experience_id: uuid.UUID,
+        experience: ExperienceUpdate,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        return _or_404(await experience_crud_async.update_experience(db, experience_id, experience, user_id=current_user.id))
+
+    @router.delete("/{experience_id}", response_model=ExperienceOut)
+    async def delete_experience(
+        experience_id: uuid.UUID,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        return _or_404(await experience_crud_async.delete_experience(db, experience_id, user_id=current_user.id))
+else:
+    @router.post("/", response_model=ExperienceOut)
+    def create_experience(experience: ExperienceCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+        return experience_crud.create_experience(db, experience, user_id=current_user.id)
+
+    @router.get("/", response_model=list[ExperienceOut])
+    def get_experiences(
+        cursor: Optional[str] = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        include_total: bool = False,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        page = experience_crud.get_experiences(db, user_id=current_user.id, cursor=cursor, limit=limit, include_total=include_total)
+        return _experiences_response(page)
+
+    @router.put("/{experience_id}", response_model=ExperienceOut)
+    def update_experience(
+        experience_id: uuid.UUID,
+        experience: ExperienceUpdate,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        return _or_404(experience_crud.update_experience(db, experience_id, experience, user_id=current_user.id))
+
+    @router.delete("/{experience_id}", response_model=ExperienceOut)
+    def delete_experience(
+        experience_id: uuid.UUID,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        return _or_404(experience_crud.delete_experience(db, experience_id, user_id=current_user.id))
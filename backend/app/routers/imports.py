@@ -0,0 +1,95 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.imports import ImportRejected, check_item_count, parse_ndjson
+from app.crud import imports as import_crud
+from app.crud.aio import imports as import_crud_async
+from app.database.database import ASYNC_DB_ENABLED, AsyncSessionLocal, SessionLocal, get_async_db, get_db
+from app.dependencies import get_current_user
+from app.models.user import User
+from app.schemas.imports import ImportResult, ResumeImport
+
+router = APIRouter(prefix="/import", tags=["Import"])
+
+NDJSON_TYPES = ("application/x-ndjson", "application/jsonl")
+
+def _rejected(exc: ImportRejected) -> HTTPException:
+    return HTTPException(status_code=exc.status_code, detail=exc.errors)
+
+def _import_in_new_session(user_id, data) -> dict:
+    db = SessionLocal()
+    try:
+        return import_crud.import_resume(db, user_id, data)
+    finally:
+        db.close()
+
+async def _import_in_new_async_session(user_id, data) -> dict:
+    async with AsyncSessionLocal() as db:
+        return await import_crud_async.import_resume(db, user_id, data)
+
+if ASYNC_DB_ENABLED:
+    @router.post("/", response_model=ImportResult, status_code=status.HTTP_201_CREATED)
+    async def import_resume(
+        data: ResumeImport,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        """
+        Add experiences, educations and projects to the current user's profile
+        in one request. Either every entry is added or, on any validation
+        error, none is. Returns the new ids per section, in request order.
+        """
+        try:
+            check_item_count(data)
+        except ImportRejected as exc:
+            raise _rejected(exc)
+        return await import_crud_async.import_resume(db, current_user.id, data)
+else:
+    @router.post("/", response_model=ImportResult, status_code=status.HTTP_201_CREATED)
+    def import_resume(
+        data: ResumeImport,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        """
+        Add experiences, educations and projects to the current user's profile
+        in one request. Either every entry is added or, on any validation
+        error, none is. Returns the new ids per section, in request order.
+        """
+        try:
+            check_item_count(data)
+        except ImportRejected as exc:
+            raise _rejected(exc)
+        return import_crud.import_resume(db, current_user.id, data)
+
+@router.post(
+    "/ndjson",
+    response_model=ImportResult,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={"requestBody": {"content": {"application/x-ndjson": {"schema": {"type": "string"}}}}},
+)
+async def import_resume_ndjson(
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Same as POST /import/, from a newline-delimited JSON stream with one
+    entry per line, each tagged with "type": "experience", "education"
+    or "project". Lines are validated as they arrive; errors are reported
+    with their line numbers and nothing is written.
+
+    The session is only opened once the whole stream has been parsed, so
+    a slow client never holds a database connection.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type not in NDJSON_TYPES:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Expected application/x-ndjson")
+    try:
+        data = await parse_ndjson(request.stream())
+    except ImportRejected as exc:
+        raise _rejected(exc)
+    if ASYNC_DB_ENABLED:
+        return await _import_in_new_async_session(current_user.id, data)
+    return await run_in_threadpool(_import_in_new_session, current_user.id, data)
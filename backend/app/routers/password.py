@@ -1,62 +1,124 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database.database import get_db
+from app.database.database import ASYNC_DB_ENABLED, get_async_db, get_db
 from app.schemas.user import PasswordReset, PasswordResetConfirm
 from app.crud import user as user_crud
-from app.core.email import send_reset_password_email
+from app.crud.aio import user as user_crud_async
+from app.core.email import reset_password_email
+from app.core.rate_limit import limit_password_reset_requests
+from app.core.email_queue import enqueue_email, enqueue_email_async
 
 router = APIRouter(
     prefix="/password",
     tags=["password"],
 )
 
-@router.post("/reset", status_code=status.HTTP_204_NO_CONTENT)
-def request_password_reset(
-    request: PasswordReset,
-    db: Session = Depends(get_db)
-):
-    """
-    Request a password reset token.
-    
-    A reset token will be emailed to the user if they exist in the system.
-    """
-    user = user_crud.get_user_by_email(db, email=request.email)
-    if not user:
-        # We don't want to reveal if an email exists or not
-        # So we still return 204 No Content
-        return
-        
-    token = user_crud.generate_password_reset_token(db, email=request.email)
-    if token:
-        send_reset_password_email(
-            email_to=user.email,
-            token=token,
-            username=user.name
-        )
-    
-    return
-
-@router.post("/reset/confirm", status_code=status.HTTP_204_NO_CONTENT)
-def reset_password(
-    request: PasswordResetConfirm,
-    db: Session = Depends(get_db)
-):
-    """
-    Reset password using a valid token.
-    
-    If the token is valid and not expired, the password will be updated.
-    """
-    success = user_crud.reset_password_with_token(
-        db, 
-        token=request.token, 
-        new_password=request.new_password
-    )
-    
+def _check_reset(success: bool) -> None:
     if not success:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or expired token",
         )
-    
-    return 
\ No newline at end of file
+
+if ASYNC_DB_ENABLED:
+    @router.post(
+        "/reset",
+        status_code=status.HTTP_204_NO_CONTENT,
+        dependencies=[Depends(limit_password_reset_requests)],
+        responses={429: {"description": "Too many requests"}},
+    )
+    async def request_password_reset(
+        request: PasswordReset,
+        db: AsyncSession = Depends(get_async_db)
+    ):
+        """
+        Request a password reset token.
+
+        A reset token will be emailed to the user if they exist in the system.
+        The email is queued in the outbox and delivered in the background.
+        """
+        user = await user_crud_async.get_user_by_email(db, email=request.email)
+        if not user:
+            # We don't want to reveal if an email exists or not
+            # So we still return 204 No Content
+            return
+
+        token = await user_crud_async.generate_password_reset_token(db, email=request.email)
+        if token:
+            await enqueue_email_async(db, reset_password_email(
+                email_to=user.email,
+                token=token,
+                username=user.name
+            ))
+
+        return
+
+    @router.post("/reset/confirm", status_code=status.HTTP_204_NO_CONTENT)
+    async def reset_password(
+        request: PasswordResetConfirm,
+        db: AsyncSession = Depends(get_async_db)
+    ):
+        """
+        Reset password using a valid token.
+
+        If the token is valid and not expired, the password will be updated.
+        """
+        _check_reset(await user_crud_async.reset_password_with_token(
+            db,
+            token=request.token,
+            new_password=request.new_password
+        ))
+
+        return
+else:
+    @router.post(
+        "/reset",
+        status_code=status.HTTP_204_NO_CONTENT,
+        dependencies=[Depends(limit_password_reset_requests)],
+        responses={429: {"description": "Too many requests"}},
+    )
+    def request_password_reset(
+        request: PasswordReset,
+        db: Session = Depends(get_db)
+    ):
+        """
+        Request a password reset token.
+
+        A reset token will be emailed to the user if they exist in the system.
+        The email is queued in the outbox and delivered in the background.
+        """
+        user = user_crud.get_user_by_email(db, email=request.email)
+        if not user:
+            # We don't want to reveal if an email exists or not
+            # So we still return 204 No Content
+            return
+
+        token = user_crud.generate_password_reset_token(db, email=request.email)
+        if token:
+            enqueue_email(db, reset_password_email(
+                email_to=user.email,
+                token=token,
+                username=user.name
+            ))
+
+        return
+
+    @router.post("/reset/confirm", status_code=status.HTTP_204_NO_CONTENT)
+    def reset_password(
+        request: PasswordResetConfirm,
+        db: Session = Depends(get_db)
+    ):
+        """
+        Reset password using a valid token.
+
+        If the token is valid and not expired, the password will be updated.
+        """
+        _check_reset(user_crud.reset_password_with_token(
+            db,
+            token=request.token,
+            new_password=request.new_password
+        ))
+
+        return
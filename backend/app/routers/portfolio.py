@@ -0,0 +1,95 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+import os
+import uuid
+
+from app.core.cache import RenderedResponse, etag_matches, portfolio_cache
+from app.core.compression import choose_encoding
+from app.database.database import ASYNC_DB_ENABLED, get_async_db, get_db
+from app.schemas.portfolio import Portfolio, PublicPortfolio
+from app.crud import portfolio as portfolio_crud
+from app.crud.aio import portfolio as portfolio_crud_async
+from app.dependencies import get_current_user
+from app.models.user import User
+
+router = APIRouter(prefix="/portfolio", tags=["Portfolio"])
+
+PUBLIC_PORTFOLIO_MAX_AGE = int(os.getenv("PUBLIC_PORTFOLIO_MAX_AGE", "60"))
+
+def _render_public_portfolio(user: User) -> RenderedResponse:
+    portfolio = PublicPortfolio.model_validate(portfolio_crud.build_portfolio(user), from_attributes=True)
+    return RenderedResponse.from_body(portfolio.model_dump_json().encode())
+
+def _public_response(request: Request, rendered: RenderedResponse) -> Response:
+    coding = choose_encoding(request.headers.get("accept-encoding", ""), rendered.encoded)
+    etag = rendered.etag_for(coding)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={PUBLIC_PORTFOLIO_MAX_AGE}",
+        "Vary": "Accept-Encoding",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    if coding is None:
+        return Response(content=rendered.body, media_type="application/json", headers=headers)
+    headers["Content-Encoding"] = coding
+    return Response(content=rendered.encoded[coding], media_type="application/json", headers=headers)
+
+if ASYNC_DB_ENABLED:
+    @router.get("/me", response_model=Portfolio)
+    async def read_my_portfolio(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+        """
+        Get the current user's full portfolio (profile, professional info,
+        education, experiences, projects and preferences) in one response.
+        """
+        user = await portfolio_crud_async.get_portfolio_user(db, user_id=current_user.id)
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return portfolio_crud.build_portfolio(user)
+
+    @router.get("/{user_id}", response_model=PublicPortfolio)
+    async def read_public_portfolio(user_id: uuid.UUID, request: Request, db: AsyncSession = Depends(get_async_db)):
+        """
+        Public, unauthenticated portfolio. Served from a pre-serialized cache
+        with a strong ETag; a matching If-None-Match gets 304 Not Modified.
+        """
+        rendered = portfolio_cache.get(str(user_id))
+        if rendered is None:
+            # Taken before the load, so an edit committed meanwhile stops the fill
+            generation = portfolio_cache.generation()
+            user = await portfolio_crud_async.get_portfolio_user(db, user_id=user_id)
+            if user is None:
+                raise HTTPException(status_code=404, detail="Portfolio not found")
+            rendered = _render_public_portfolio(user)
+            portfolio_cache.set(str(user_id), rendered, generation)
+        return _public_response(request, rendered)
+else:
+    @router.get("/me", response_model=Portfolio)
+    def read_my_portfolio(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+        """
+        Get the current user's full portfolio (profile, professional info,
+        education, experiences, projects and preferences) in one response.
+        """
+        user = portfolio_crud.get_portfolio_user(db, user_id=current_user.id)
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return portfolio_crud.build_portfolio(user)
+
+    @router.get("/{user_id}", response_model=PublicPortfolio)
+    def read_public_portfolio(user_id: uuid.UUID, request: Request, db: Session = Depends(get_db)):
+        """
+        Public, unauthenticated portfolio. Served from a pre-serialized cache
+        with a strong ETag; a matching If-None-Match gets 304 Not Modified.
+        """
+        rendered = portfolio_cache.get(str(user_id))
+        if rendered is None:
+            # Taken before the load, so an edit committed meanwhile stops the fill
+            generation = portfolio_cache.generation()
+            user = portfolio_crud.get_portfolio_user(db, user_id=user_id)
+            if user is None:
+                raise HTTPException(status_code=404, detail="Portfolio not found")
+            rendered = _render_public_portfolio(user)
+            portfolio_cache.set(str(user_id), rendered, generation)
+        return _public_response(request, rendered)
@@ -1,16 +1,33 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database.database import get_db
+from app.database.database import ASYNC_DB_ENABLED, get_async_db, get_db
 from app.schemas.preference import PreferenceCreate, PreferenceOut
 from app.crud import preference as preference_crud
+from app.crud.aio import preference as preference_crud_async
 from app.dependencies import get_current_user
+from app.models.user import User
 
 router = APIRouter(prefix="/preferences", tags=["Preferences"])
 
-@router.post("/", response_model=PreferenceOut)
-def create_or_update_preference(preference: PreferenceCreate, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    return preference_crud.create_or_update_preference(db, preference, user_id=current_user["id"])
+def _or_404(db_pref):
+    if not db_pref:
+        raise HTTPException(status_code=404, detail="Preference not found")
+    return db_pref
 
-@router.get("/", response_model=PreferenceOut)
-def get_preference(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    return preference_crud.get_preference(db, user_id=current_user["id"])
+if ASYNC_DB_ENABLED:
+    @router.post("/", response_model=PreferenceOut)
+    async def create_or_update_preference(preference: PreferenceCreate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+        return await preference_crud_async.create_or_update_preference(db, preference, user_id=current_user.id)
+
+    @router.get("/", response_model=PreferenceOut)
+    async def get_preference(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+        return _or_404(await preference_crud_async.get_preference(db, user_id=current_user.id))
+else:
+    @router.post("/", response_model=PreferenceOut)
+    def create_or_update_preference(preference: PreferenceCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+        return preference_crud.create_or_update_preference(db, preference, user_id=current_user.id)
+
+    @router.get("/", response_model=PreferenceOut)
+    def get_preference(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+        return _or_404(preference_crud.get_preference(db, user_id=current_user.id))
@@ -1,40 +1,90 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+import uuid
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database.database import get_db
+from app.database.database import ASYNC_DB_ENABLED, get_async_db, get_db
 from app.schemas.projects import ProjectCreate, ProjectUpdate, ProjectOut
 from app.crud import projects as project_crud
+from app.crud.aio import projects as project_crud_async
 from app.dependencies import get_current_user
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, set_page_headers
+from app.core.serialization import trusted_response
 from app.models.user import User
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
-@router.post("/", response_model=ProjectOut)
-def create_project(project: ProjectCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return project_crud.create_project(db, project, user_id=current_user.id)
-
-@router.get("/", response_model=list[ProjectOut])
-def get_projects(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return project_crud.get_projects(db, user_id=current_user.id)
-
-@router.put("/{project_id}", response_model=ProjectOut)
-def update_project(
-    project_id: int,
-    project: ProjectUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    db_project = project_crud.update_project(db, project_id, project, user_id=current_user.id)
-    if not db_project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    return db_project
+def _projects_response(page):
+    response = trusted_response(ProjectOut, page.items)
+    set_page_headers(response, page)
+    return response
 
-@router.delete("/{project_id}", response_model=ProjectOut)
-def delete_project(
-    project_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    db_project = project_crud.delete_project(db, project_id, user_id=current_user.id)
+def _or_404(db_project):
     if not db_project:
         raise HTTPException(status_code=404, detail="Project not found")
     return db_project
+
+if ASYNC_DB_ENABLED:
+    @router.post("/", response_model=ProjectOut)
+    async def create_project(project: ProjectCreate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+        return await project_crud_async.create_project(db, project, user_id=current_user.id)
+
+    @router.get("/", response_model=list[ProjectOut])
+    async def get_projects(
+        cursor: Optional[str] = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        include_total: bool = False,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        page = await project_crud_async.get_projects(db, user_id=current_user.id, cursor=cursor, limit=limit, include_total=include_total)
+        return _projects_response(page)
+
+    @router.put("/{project_id}", response_model=ProjectOut)
+    async def update_project(
+        project_id: uuid.UUID,
+        project: ProjectUpdate,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        return _or_404(await project_crud_async.update_project(db, project_id, project, user_id=current_user.id))
+
+    @router.delete("/{project_id}", response_model=ProjectOut)
+    async def delete_project(
+        project_id: uuid.UUID,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        return _or_404(await project_crud_async.delete_project(db, project_id, user_id=current_user.id))
+else:
+    @router.post("/", response_model=ProjectOut)
+    def create_project(project: ProjectCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+        return project_crud.create_project(db, project, user_id=current_user.id)
+
+    @router.get("/", response_model=list[ProjectOut])
+    def get_projects(
+        cursor: Optional[str] = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        include_total: bool = False,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        page = project_crud.get_projects(db, user_id=current_user.id, cursor=cursor, limit=limit, include_total=include_total)
+        return _projects_response(page)
+
+    @router.put("/{project_id}", response_model=ProjectOut)
+    def update_project(
+        project_id: uuid.UUID,
+        project: ProjectUpdate,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        return _or_404(project_crud.update_project(db, project_id, project, user_id=current_user.id))
+
+    @router.delete("/{project_id}", response_model=ProjectOut)
+    def delete_project(
+        project_id: uuid.UUID,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        return _or_404(project_crud.delete_project(db, project_id, user_id=current_user.id))
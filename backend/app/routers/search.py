@@ -0,0 +1,111 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.core.pagination import set_page_headers
+from app.crud import search as search_crud
+from app.crud.aio import search as search_crud_async
+from app.database.database import ASYNC_DB_ENABLED, get_async_db, get_db
+from app.dependencies import get_current_user
+from app.models.user import User
+from app.schemas.search import ProfileSearchResult
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+# Upper bound on skills + technologies filters per request
+SEARCH_MAX_FILTERS = 20
+
+def _check_filters(skills: List[str], technologies: List[str]) -> None:
+    if len(skills) + len(technologies) > SEARCH_MAX_FILTERS:
+        raise HTTPException(status_code=400, detail=f"At most {SEARCH_MAX_FILTERS} skill and technology filters")
+
+def _results(response: Response, page) -> List[ProfileSearchResult]:
+    set_page_headers(response, page)
+    return [
+        ProfileSearchResult(
+            user_id=info.user_id,
+            professional_info_id=info.id,
+            name=info.user.name,
+            bio=info.user.bio,
+            avatar=info.user.avatar,
+            skills=info.skills,
+            rank=rank,
+        )
+        for info, rank in page.items
+    ]
+
+if ASYNC_DB_ENABLED:
+    @router.get("/profiles", response_model=List[ProfileSearchResult])
+    async def search_profiles(
+        response: Response,
+        q: Optional[str] = Query(None, max_length=200),
+        skills: List[str] = Query([]),
+        technologies: List[str] = Query([]),
+        cursor: Optional[str] = None,
+        limit: int = Query(SEARCH_PAGE_SIZE, ge=1, le=SEARCH_MAX_PAGE_SIZE),
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        """
+        Search profiles by text and by skills and project technologies.
+
+        `q` is matched against names, bios, skills, experience titles and
+        companies, project names, technologies and descriptions, using web
+        search syntax ("exact phrase", or, -excluded), and results are ranked
+        by relevance. Every `skills` value must be among the profile's skills
+        and every `technologies` value used by at least one of its projects;
+        both are repeatable and match exactly. Without `q`, matches are listed
+        oldest first.
+
+        Pass the X-Next-Cursor response header back as `cursor`, with the
+        same filters, for the next page.
+        """
+        _check_filters(skills, technologies)
+        page = await search_crud_async.search_profiles(
+            db,
+            query=q.strip() if q else None,
+            skills=skills,
+            technologies=technologies,
+            cursor=cursor,
+            limit=limit,
+        )
+        return _results(response, page)
+else:
+    @router.get("/profiles", response_model=List[ProfileSearchResult])
+    def search_profiles(
+        response: Response,
+        q: Optional[str] = Query(None, max_length=200),
+        skills: List[str] = Query([]),
+        technologies: List[str] = Query([]),
+        cursor: Optional[str] = None,
+        limit: int = Query(SEARCH_PAGE_SIZE, ge=1, le=SEARCH_MAX_PAGE_SIZE),
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        """
+        Search profiles by text and by skills and project technologies.
+
+        `q` is matched against names, bios, skills, experience titles and
+        companies, project names, technologies and descriptions, using web
+        search syntax ("exact phrase", or, -excluded), and results are ranked
+        by relevance. Every `skills` value must be among the profile's skills
+        and every `technologies` value used by at least one of its projects;
+        both are repeatable and match exactly. Without `q`, matches are listed
+        oldest first.
+
+        Pass the X-Next-Cursor response header back as `cursor`, with the
+        same filters, for the next page.
+        """
+        _check_filters(skills, technologies)
+        page = search_crud.search_profiles(
+            db,
+            query=q.strip() if q else None,
+            skills=skills,
+            technologies=technologies,
+            cursor=cursor,
+            limit=limit,
+        )
+        return _results(response, page)
@@ -1,14 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import uuid
-import shutil
-import os
-from pathlib import Path
+from starlette.concurrency import run_in_threadpool
 
 from app.schemas.user import User, UserCreate, UserUpdate
+from app.schemas.upload import DirectUpload, DirectUploadComplete, DirectUploadRequest
 from app.crud import user as user_crud
-from app.database.database import get_db
+from app.crud.aio import user as user_crud_async
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, set_page_headers
+from app.core.serialization import trusted_response
+from app.core.storage import S3_PRESIGN_EXPIRES, DirectUploadsUnsupported, get_storage
+from app.core.uploads import (
+    AVATAR_MAX_BYTES,
+    IMAGE_TYPES,
+    direct_upload_key,
+    ingest_stored_image,
+    store_image,
+)
+from app.database.database import ASYNC_DB_ENABLED, get_async_db, get_db
 from app.dependencies import get_current_user
 
 router = APIRouter(
@@ -17,143 +28,320 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-# Create uploads directory if it doesn't exist
-UPLOAD_DIR = Path("./uploads/avatars")
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-
-@router.get("/", response_model=List[User])
-def read_users(
-    skip: int = 0, 
-    limit: int = 100, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """
-    Get all users. Only available to authenticated users.
-    """
-    users = user_crud.get_users(db, skip=skip, limit=limit)
-    return users
-
-@router.post("/", response_model=User, status_code=status.HTTP_201_CREATED)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
-    """
-    Create a new user. This endpoint is public to allow registration.
-    """
-    # Check if user with this email already exists
-    db_user = user_crud.get_user_by_email(db, email=user.email)
-    if db_user:
-        raise HTTPException(
-            status_code=400,
-            detail="Email already registered"
-        )
-    return user_crud.create_user(db=db, user=user)
+AVATAR_PREFIX = "avatars"
 
 @router.get("/me", response_model=User)
 def read_user_me(current_user: User = Depends(get_current_user)):
     """
     Get current authenticated user.
     """
-    return current_user
+    return trusted_response(User, current_user)
 
-@router.put("/me", response_model=User)
-def update_user_me(
-    user: UserUpdate,
-    db: Session = Depends(get_db),
+@router.post("/me/avatar/upload-url", response_model=DirectUpload)
+def create_avatar_upload_url(
+    request: DirectUploadRequest,
     current_user: User = Depends(get_current_user)
 ):
     """
-    Update current authenticated user.
+    Get a presigned POST for uploading an avatar straight to storage.
+
+    Submit `fields` plus the file as multipart form data to `url`, then
+    call /users/me/avatar/complete with `key`. Only available with the
+    s3 storage backend.
     """
-    # If email is being updated, check that it's not already in use by another user
-    if user.email:
-        existing_user = user_crud.get_user_by_email(db, email=user.email)
-        if existing_user and existing_user.id != current_user.id:
+    image_type = IMAGE_TYPES.get(request.content_type)
+    if image_type is None:
+        raise HTTPException(status_code=400, detail="Unsupported image content type")
+    key = direct_upload_key(AVATAR_PREFIX, image_type)
+    try:
+        presigned = get_storage().presigned_upload(key, image_type.content_type, AVATAR_MAX_BYTES)
+    except DirectUploadsUnsupported as exc:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(exc))
+    return DirectUpload(url=presigned["url"], fields=presigned["fields"], key=key, expires_in=S3_PRESIGN_EXPIRES)
+
+if ASYNC_DB_ENABLED:
+    @router.get("/", response_model=List[User])
+    async def read_users(
+        cursor: Optional[str] = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        include_total: bool = False,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        """
+        Get all users. Only available to authenticated users.
+
+        Results are ordered by creation time. Pass the X-Next-Cursor response
+        header back as `cursor` to fetch the next page; X-Total-Count is only
+        computed when include_total is set.
+        """
+        page = await user_crud_async.get_users(db, cursor=cursor, limit=limit, include_total=include_total)
+        response = trusted_response(User, page.items)
+        set_page_headers(response, page)
+        return response
+
+    @router.post("/", response_model=User, status_code=status.HTTP_201_CREATED)
+    async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+        """
+        Create a new user. This endpoint is public to allow registration.
+        """
+        # Check if user with this email already exists
+        db_user = await user_crud_async.get_user_by_email(db, email=user.email)
+        if db_user:
             raise HTTPException(
                 status_code=400,
                 detail="Email already registered"
             )
-    
-    return user_crud.update_user(db, user_id=current_user.id, user=user)
+        return await user_crud_async.create_user(db=db, user=user)
 
-@router.post("/me/avatar", response_model=User)
-async def upload_avatar(
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """
-    Upload a profile avatar image for the current user.
-    """
-    # Check file type
-    if not file.content_type.startswith("image/"):
-        raise HTTPException(
-            status_code=400,
-            detail="File must be an image"
+    @router.put("/me", response_model=User)
+    async def update_user_me(
+        user: UserUpdate,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        """
+        Update current authenticated user.
+        """
+        # If email is being updated, check that it's not already in use by another user
+        if user.email:
+            existing_user = await user_crud_async.get_user_by_email(db, email=user.email)
+            if existing_user and existing_user.id != current_user.id:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Email already registered"
+                )
+
+        return await user_crud_async.update_user(db, user_id=current_user.id, user=user)
+
+    @router.post("/me/avatar", response_model=User)
+    async def upload_avatar(
+        file: UploadFile = File(...),
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        """
+        Upload a profile avatar image for the current user.
+
+        The image type is taken from the file's magic bytes, not the client's
+        content type, and uploads over AVATAR_MAX_BYTES are rejected with 413.
+        Raster images also get resized WebP variants (see IMAGE_VARIANT_SIZES),
+        whose URLs are returned in avatar_variants. File names are content
+        hashes, so every new image gets a new, immutable URL.
+        """
+        stored = await store_image(file, AVATAR_PREFIX, max_bytes=AVATAR_MAX_BYTES)
+        return await user_crud_async.set_avatar(
+            db, user_id=current_user.id, avatar=stored.url, avatar_variants=stored.variants
         )
-    
-    # Create a unique filename
-    file_extension = os.path.splitext(file.filename)[1]
-    filename = f"{current_user.id}{file_extension}"
-    file_path = UPLOAD_DIR / filename
-    
-    # Save the file
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    
-    # Update the user's avatar field
-    avatar_url = f"/uploads/avatars/{filename}"
-    user_update = UserUpdate(avatar=avatar_url)
-    
-    return user_crud.update_user(db, user_id=current_user.id, user=user_update)
-
-@router.get("/{user_id}", response_model=User)
-def read_user(
-    user_id: uuid.UUID, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """
-    Get user by ID. Only available to authenticated users.
-    """
-    db_user = user_crud.get_user(db, user_id=user_id)
-    if db_user is None:
-        raise HTTPException(status_code=404, detail="User not found")
-    return db_user
-
-@router.put("/{user_id}", response_model=User)
-def update_user(
-    user_id: uuid.UUID, 
-    user: UserUpdate, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """
-    Update user by ID. Only available to authenticated users.
-    """
-    # If email is being updated, check that it's not already in use
-    if user.email:
-        existing_user = user_crud.get_user_by_email(db, email=user.email)
-        if existing_user and existing_user.id != user_id:
+
+    @router.post("/me/avatar/complete", response_model=User)
+    async def complete_avatar_upload(
+        upload: DirectUploadComplete,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        """
+        Use an avatar uploaded through /users/me/avatar/upload-url.
+
+        The stored object gets the same checks as a regular upload, and is
+        deleted if it fails them.
+        """
+        stored = await ingest_stored_image(upload.key, AVATAR_PREFIX, max_bytes=AVATAR_MAX_BYTES)
+        return await user_crud_async.set_avatar(
+            db, user_id=current_user.id, avatar=stored.url, avatar_variants=stored.variants
+        )
+
+    @router.get("/{user_id}", response_model=User)
+    async def read_user(
+        user_id: uuid.UUID, 
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        """
+        Get user by ID. Only available to authenticated users.
+        """
+        db_user = await user_crud_async.get_user(db, user_id=user_id)
+        if db_user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return db_user
+
+    @router.put("/{user_id}", response_model=User)
+    async def update_user(
+        user_id: uuid.UUID, 
+        user: UserUpdate, 
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        """
+        Update user by ID. Only available to authenticated users.
+        """
+        # If email is being updated, check that it's not already in use
+        if user.email:
+            existing_user = await user_crud_async.get_user_by_email(db, email=user.email)
+            if existing_user and existing_user.id != user_id:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Email already registered"
+                )
+
+        db_user = await user_crud_async.update_user(db, user_id=user_id, user=user)
+        if db_user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return db_user
+
+    @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+    async def delete_user(
+        user_id: uuid.UUID, 
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        """
+        Delete user by ID. Only available to authenticated users.
+        """
+        success = await user_crud_async.delete_user(db, user_id=user_id)
+        if not success:
+            raise HTTPException(status_code=404, detail="User not found")
+        return None
+else:
+    @router.get("/", response_model=List[User])
+    def read_users(
+        cursor: Optional[str] = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        include_total: bool = False,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        """
+        Get all users. Only available to authenticated users.
+
+        Results are ordered by creation time. Pass the X-Next-Cursor response
+        header back as `cursor` to fetch the next page; X-Total-Count is only
+        computed when include_total is set.
+        """
+        page = user_crud.get_users(db, cursor=cursor, limit=limit, include_total=include_total)
+        response = trusted_response(User, page.items)
+        set_page_headers(response, page)
+        return response
+
+    @router.post("/", response_model=User, status_code=status.HTTP_201_CREATED)
+    def create_user(user: UserCreate, db: Session = Depends(get_db)):
+        """
+        Create a new user. This endpoint is public to allow registration.
+        """
+        # Check if user with this email already exists
+        db_user = user_crud.get_user_by_email(db, email=user.email)
+        if db_user:
             raise HTTPException(
                 status_code=400,
                 detail="Email already registered"
             )
-    
-    db_user = user_crud.update_user(db, user_id=user_id, user=user)
-    if db_user is None:
-        raise HTTPException(status_code=404, detail="User not found")
-    return db_user
-
-@router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(
-    user_id: uuid.UUID, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """
-    Delete user by ID. Only available to authenticated users.
-    """
-    success = user_crud.delete_user(db, user_id=user_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="User not found")
-    return None 
\ No newline at end of file
+        return user_crud.create_user(db=db, user=user)
+
+    @router.put("/me", response_model=User)
+    def update_user_me(
+        user: UserUpdate,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        """
+        Update current authenticated user.
+        """
+        # If email is being updated, check that it's not already in use by another user
+        if user.email:
+            existing_user = user_crud.get_user_by_email(db, email=user.email)
+            if existing_user and existing_user.id != current_user.id:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Email already registered"
+                )
+
+        return user_crud.update_user(db, user_id=current_user.id, user=user)
+
+    @router.post("/me/avatar", response_model=User)
+    async def upload_avatar(
+        file: UploadFile = File(...),
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        """
+        Upload a profile avatar image for the current user.
+
+        The image type is taken from the file's magic bytes, not the client's
+        content type, and uploads over AVATAR_MAX_BYTES are rejected with 413.
+        Raster images also get resized WebP variants (see IMAGE_VARIANT_SIZES),
+        whose URLs are returned in avatar_variants. File names are content
+        hashes, so every new image gets a new, immutable URL.
+        """
+        stored = await store_image(file, AVATAR_PREFIX, max_bytes=AVATAR_MAX_BYTES)
+        return await run_in_threadpool(
+            user_crud.set_avatar, db, user_id=current_user.id, avatar=stored.url, avatar_variants=stored.variants
+        )
+
+    @router.post("/me/avatar/complete", response_model=User)
+    async def complete_avatar_upload(
+        upload: DirectUploadComplete,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        """
+        Use an avatar uploaded through /users/me/avatar/upload-url.
+
+        The stored object gets the same checks as a regular upload, and is
+        deleted if it fails them.
+        """
+        stored = await ingest_stored_image(upload.key, AVATAR_PREFIX, max_bytes=AVATAR_MAX_BYTES)
+        return await run_in_threadpool(
+            user_crud.set_avatar, db, user_id=current_user.id, avatar=stored.url, avatar_variants=stored.variants
+        )
+
+    @router.get("/{user_id}", response_model=User)
+    def read_user(
+        user_id: uuid.UUID, 
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        """
+        Get user by ID. Only available to authenticated users.
+        """
+        db_user = user_crud.get_user(db, user_id=user_id)
+        if db_user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return db_user
+
+    @router.put("/{user_id}", response_model=User)
+    def update_user(
+        user_id: uuid.UUID, 
+        user: UserUpdate, 
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        """
+        Update user by ID. Only available to authenticated users.
+        """
+        # If email is being updated, check that it's not already in use
+        if user.email:
+            existing_user = user_crud.get_user_by_email(db, email=user.email)
+            if existing_user and existing_user.id != user_id:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Email already registered"
+                )
+
+        db_user = user_crud.update_user(db, user_id=user_id, user=user)
+        if db_user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return db_user
+
+    @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+    def delete_user(
+        user_id: uuid.UUID, 
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+    ):
+        """
+        Delete user by ID. Only available to authenticated users.
+        """
+        success = user_crud.delete_user(db, user_id=user_id)
+        if not success:
+            raise HTTPException(status_code=404, detail="User not found")
+        return None
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional
 from datetime import date
+import uuid
 
 class EducationBase(BaseModel):
     institution: str
@@ -22,8 +23,14 @@ class EducationUpdate(BaseModel):
     description: Optional[str] = None
 
 class EducationOut(EducationBase):
-    id: int
-    user_id: str
+    id: uuid.UUID
+    professional_info_id: uuid.UUID
+    # Optional in the table, e.g. for imported entries
+    degree: Optional[str] = None
+    field_of_study: Optional[str] = None
+    start_date: Optional[date] = None
+    is_current: Optional[bool] = False
+    gpa: Optional[str] = None
 
     class Config:
         from_attributes = True
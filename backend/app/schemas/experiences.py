@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from datetime import date
 from typing import Optional
+import uuid
 
 class ExperienceBase(BaseModel):
     title: str
@@ -20,8 +21,8 @@ class ExperienceUpdate(BaseModel):
     description: Optional[str] = None
 
 class ExperienceOut(ExperienceBase):
-    id: int
-    user_id: str
+    id: uuid.UUID
+    professional_info_id: uuid.UUID
 
     class Config:
         from_attributes = True
@@ -0,0 +1,67 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal, Optional, Union
+from typing_extensions import Annotated
+from datetime import date
+import uuid
+
+# Shapes match the models column for column, so validated entries insert
+# as they are
+
+class _Dated(BaseModel):
+    @model_validator(mode="after")
+    def _end_after_start(self):
+        if self.start_date and self.end_date and self.end_date < self.start_date:
+            raise ValueError("end_date is before start_date")
+        return self
+
+class ImportExperience(_Dated):
+    title: str = Field(min_length=1, max_length=200)
+    company: str = Field(min_length=1, max_length=200)
+    start_date: date
+    end_date: Optional[date] = None
+    description: Optional[str] = Field(None, max_length=10000)
+
+class ImportEducation(_Dated):
+    institution: str = Field(min_length=1, max_length=200)
+    degree: Optional[str] = Field(None, max_length=100)
+    field_of_study: Optional[str] = Field(None, max_length=100)
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    is_current: bool = False
+    description: Optional[str] = Field(None, max_length=10000)
+    gpa: Optional[str] = Field(None, max_length=10)
+
+class ImportProject(_Dated):
+    name: str = Field(min_length=1, max_length=200)
+    description: Optional[str] = Field(None, max_length=10000)
+    technologies: List[str] = Field([], max_length=50)
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    is_current: bool = False
+    project_url: Optional[str] = Field(None, max_length=255)
+    github_url: Optional[str] = Field(None, max_length=255)
+    achievements: List[str] = Field([], max_length=50)
+    images: List[str] = Field([], max_length=20)
+
+class ResumeImport(BaseModel):
+    experiences: List[ImportExperience] = []
+    educations: List[ImportEducation] = []
+    projects: List[ImportProject] = []
+
+# NDJSON lines carry their kind in "type"
+
+class ExperienceLine(ImportExperience):
+    type: Literal["experience"]
+
+class EducationLine(ImportEducation):
+    type: Literal["education"]
+
+class ProjectLine(ImportProject):
+    type: Literal["project"]
+
+ImportLine = Annotated[Union[ExperienceLine, EducationLine, ProjectLine], Field(discriminator="type")]
+
+class ImportResult(BaseModel):
+    experiences: List[uuid.UUID]
+    educations: List[uuid.UUID]
+    projects: List[uuid.UUID]
@@ -0,0 +1,41 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+import uuid
+
+from app.schemas.education import EducationOut
+from app.schemas.experiences import ExperienceOut
+from app.schemas.preference import PreferenceOut
+from app.schemas.projects import ProjectOut
+from app.schemas.user import User
+
+class PortfolioProfessionalInfo(BaseModel):
+    id: uuid.UUID
+    contact_info: Optional[Dict[str, Any]] = None
+    social_links: Optional[Dict[str, Any]] = None
+    skills: Optional[List[str]] = None
+    profile_image_url: Optional[str] = None
+    educations: List[EducationOut] = []
+    experiences: List[ExperienceOut] = []
+    projects: List[ProjectOut] = []
+
+    class Config:
+        from_attributes = True
+
+class Portfolio(BaseModel):
+    user: User
+    professional_info: Optional[PortfolioProfessionalInfo] = None
+    preference: Optional[PreferenceOut] = None
+
+class PublicUser(BaseModel):
+    id: uuid.UUID
+    name: str
+    bio: Optional[str] = None
+    avatar: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class PublicPortfolio(BaseModel):
+    user: PublicUser
+    professional_info: Optional[PortfolioProfessionalInfo] = None
+    preference: Optional[PreferenceOut] = None
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional
+import uuid
 
 class PreferenceBase(BaseModel):
     primary_color: Optional[str]
@@ -11,7 +12,9 @@ class PreferenceCreate(PreferenceBase):
     pass
 
 class PreferenceOut(PreferenceBase):
-    id: int
+    id: uuid.UUID
+    theme: Optional[str] = None
+    language: Optional[str] = None
 
     class Config:
-        orm_mode = True
+        from_attributes = True
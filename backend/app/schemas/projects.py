@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+import uuid
 from datetime import date
 
 class ProjectBase(BaseModel):
@@ -21,9 +22,20 @@ class ProjectUpdate(BaseModel):
     url: Optional[str] = None
     technologies: Optional[str] = None
 
-class ProjectOut(ProjectBase):
-    id: int
-    user_id: str
+class ProjectOut(BaseModel):
+    # Mirrors the projects table, whose columns differ from ProjectBase
+    id: uuid.UUID
+    professional_info_id: uuid.UUID
+    name: str
+    description: Optional[str] = None
+    technologies: Optional[List[str]] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    is_current: Optional[bool] = False
+    project_url: Optional[str] = None
+    github_url: Optional[str] = None
+    achievements: Optional[List[str]] = None
+    images: Optional[List[str]] = None
 
     class Config:
         from_attributes = True
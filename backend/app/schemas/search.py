@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import List, Optional
+import uuid
+
+class ProfileSearchResult(BaseModel):
+    user_id: uuid.UUID
+    professional_info_id: uuid.UUID
+    name: Optional[str] = None
+    bio: Optional[str] = None
+    avatar: Optional[str] = None
+    skills: Optional[List[str]] = None
+    # Text relevance; only set when searching with a query
+    rank: Optional[float] = None
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Dict
+
+class DirectUploadRequest(BaseModel):
+    content_type: str
+
+class DirectUpload(BaseModel):
+    url: str
+    fields: Dict[str, str]
+    key: str
+    expires_in: int
+
+class DirectUploadComplete(BaseModel):
+    key: str
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 import uuid
 from enum import Enum
@@ -28,6 +28,7 @@ class User(UserBase):
     id: uuid.UUID
     bio: Optional[str] = None
     avatar: Optional[str] = None
+    avatar_variants: Optional[Dict[str, str]] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
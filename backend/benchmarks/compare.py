@@ -0,0 +1,77 @@
+"""
+Compare two benchmark result files.
+
+    python -m benchmarks.compare benchmarks/results/old.json benchmarks/results/new.json
+
+Prints p50/p99 latency and throughput per scenario with the relative
+change. A scenario regresses when p99 grows or RPS drops by more than
+--threshold percent, or when it has more errors than before. With
+--fail-on-regression the exit status is 1 if any scenario regressed.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+
+def _change(old: float, new: float) -> float:
+    return (new - old) / old * 100 if old else 0.0
+
+
+def compare(old: Dict, new: Dict, threshold: float) -> List[str]:
+    """
+    Print the comparison table and return the regressed scenarios
+    """
+    regressions = []
+    print(f"{'scenario':<18} {'p50 ms':>20} {'p99 ms':>20} {'rps':>20} {'errors':>9}")
+    for name, after in new["scenarios"].items():
+        before = old["scenarios"].get(name)
+        if before is None:
+            print(f"{name:<18} (new scenario)")
+            continue
+        p50 = (before["latency_ms"]["p50"], after["latency_ms"]["p50"])
+        p99 = (before["latency_ms"]["p99"], after["latency_ms"]["p99"])
+        rps = (before["rps"], after["rps"])
+        regressed = (
+            _change(*p99) > threshold
+            or -_change(*rps) > threshold
+            or after["errors"] > before["errors"]
+        )
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:<18} "
+            f"{p50[1]:>9.2f} ({_change(*p50):+6.1f}%) "
+            f"{p99[1]:>9.2f} ({_change(*p99):+6.1f}%) "
+            f"{rps[1]:>9.1f} ({_change(*rps):+6.1f}%) "
+            f"{before['errors']:>4}->{after['errors']:<4}"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("old", type=Path)
+    parser.add_argument("new", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed change in percent")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    old = json.loads(args.old.read_text())
+    new = json.loads(args.new.read_text())
+    for key in ("database", "server", "concurrency", "requests"):
+        if old["meta"].get(key) != new["meta"].get(key):
+            print(f"warning: runs differ in {key}: {old['meta'].get(key)} vs {new['meta'].get(key)}")
+    print(f"{old['meta'].get('commit')} -> {new['meta'].get('commit')}\n")
+
+    regressions = compare(old, new, args.threshold)
+    if regressions:
+        print(f"\nRegressed: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Seed a database with benchmark users and realistic portfolios.
+
+    python -m benchmarks.seed --database-url postgresql://... --users 200
+
+Seeding is deterministic for a given --seed. Users are named
+bench-<n>@example.com and share BENCH_PASSWORD. Users that already exist
+are kept, so re-running only adds what is missing.
+"""
+import argparse
+import os
+import random
+import uuid
+from datetime import date, timedelta
+from typing import List
+
+BENCH_PASSWORD = "bench-password"
+BATCH_SIZE = 200
+
+SKILLS = [
+    "Python", "TypeScript", "Go", "Rust", "SQL", "PostgreSQL", "React", "Next.js", "FastAPI", "Django",
+    "Docker", "Kubernetes", "AWS", "GCP", "Terraform", "GraphQL", "Redis", "Kafka", "Figma", "CI/CD",
+]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises", "Pied Piper"]
+TITLES = ["Software Engineer", "Senior Engineer", "Staff Engineer", "Product Designer", "Data Scientist", "SRE"]
+SCHOOLS = ["State University", "Institute of Technology", "City College", "Polytechnic"]
+
+
+def bench_email(index: int) -> str:
+    return f"bench-{index}@example.com"
+
+
+def _random_date(rng: random.Random, start_year: int = 2010) -> date:
+    return date(start_year, 1, 1) + timedelta(days=rng.randint(0, 365 * 13))
+
+
+def seed(users: int, projects: int, experiences: int, educations: int, rng_seed: int = 42) -> List[str]:
+    """
+    Create the benchmark users and return their emails. Uses the app's
+    configured database (DATABASE_URL), creating missing tables first.
+    """
+    from app.core.security import get_password_hash
+    from app.database.database import SessionLocal, create_schema
+    from app.models import Education, Experience, Preference, ProfessionalInfo, Project, User
+
+    create_schema()
+    rng = random.Random(rng_seed)
+    emails = [bench_email(index) for index in range(users)]
+    # bcrypt is deliberately slow; every user shares one hash
+    password_hash = get_password_hash(BENCH_PASSWORD)
+
+    db = SessionLocal()
+    try:
+        existing = {email for (email,) in db.query(User.email).filter(User.email.in_(emails))}
+        missing = [email for email in emails if email not in existing]
+        for start in range(0, len(missing), BATCH_SIZE):
+            for email in missing[start:start + BATCH_SIZE]:
+                user = User(id=uuid.uuid4(), email=email, name=email.split("@")[0].replace("-", " ").title(),
+                            password=password_hash, bio="Benchmark user " * rng.randint(1, 8))
+                info = ProfessionalInfo(
+                    id=uuid.uuid4(),
+                    user=user,
+                    contact_info={"email": email, "location": rng.choice(["Berlin", "Lagos", "Lima", "Pune"])},
+                    social_links={"github": f"https://github.com/{email.split('@')[0]}"},
+                    skills=rng.sample(SKILLS, rng.randint(4, 10)),
+                )
+                db.add_all([user, info, Preference(id=uuid.uuid4(), user=user, theme=rng.choice(["light", "dark"]))])
+                for index in range(projects):
+                    started = _random_date(rng)
+                    db.add(Project(
+                        id=uuid.uuid4(),
+                        professional_info=info,
+                        name=f"Project {index}",
+                        description="A project description. " * rng.randint(2, 20),
+                        technologies=rng.sample(SKILLS, rng.randint(2, 6)),
+                        start_date=started,
+                        end_date=started + timedelta(days=rng.randint(30, 700)),
+                        achievements=[f"Achievement {n}" for n in range(rng.randint(0, 4))],
+                        images=[],
+                    ))
+                for index in range(experiences):
+                    started = _random_date(rng)
+                    db.add(Experience(
+                        id=uuid.uuid4(),
+                        professional_info=info,
+                        title=rng.choice(TITLES),
+                        company=rng.choice(COMPANIES),
+                        start_date=started,
+                        end_date=started + timedelta(days=rng.randint(90, 1500)),
+                        description="Responsibilities and impact. " * rng.randint(2, 12),
+                    ))
+                for index in range(educations):
+                    started = _random_date(rng, 2000)
+                    db.add(Education(
+                        id=uuid.uuid4(),
+                        professional_info=info,
+                        institution=rng.choice(SCHOOLS),
+                        degree=rng.choice(["BSc", "MSc", "PhD"]),
+                        field_of_study="Computer Science",
+                        start_date=started,
+                        end_date=started + timedelta(days=365 * rng.randint(1, 5)),
+                    ))
+            db.commit()
+    finally:
+        db.close()
+    return emails
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--projects", type=int, default=5)
+    parser.add_argument("--experiences", type=int, default=4)
+    parser.add_argument("--educations", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    if os.getenv("DATABASE_URL", "").startswith("sqlite"):
+        import benchmarks.sqlite_compat  # noqa: F401
+
+    emails = seed(args.users, args.projects, args.experiences, args.educations, args.seed)
+    print(f"{len(emails)} benchmark users ready")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+CPU cost of turning a page of ORM rows into a response body, per request.
+
+    python -m benchmarks.serialization --rows 20 --iterations 2000
+
+For each list endpoint's schema this times, on the same in-memory rows (no
+database or HTTP involved):
+
+- stdlib:  response_model validation + serialization, encoded by JSONResponse (FastAPI's default)
+- orjson:  the same, encoded by ORJSONResponse (the app's default response class)
+- trusted: app.core.serialization.trusted_response, used by the list endpoints
+
+and reports CPU microseconds per request and the saving against stdlib.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from benchmarks.seed import COMPANIES, SCHOOLS, SKILLS, TITLES
+
+
+def _rows(rows: int, rng: random.Random) -> Dict[str, tuple]:
+    from app.models import Education, Experience, Project, User
+    from app.schemas.education import EducationOut
+    from app.schemas.experiences import ExperienceOut
+    from app.schemas.projects import ProjectOut
+    from app.schemas.user import User as UserSchema
+
+    now = datetime.utcnow()
+    info_id = uuid.uuid4()
+    started = date(2018, 1, 1)
+    return {
+        "list_users": (UserSchema, [
+            User(id=uuid.uuid4(), email=f"bench-{n}@example.com", name=f"Bench {n}",
+                 bio="Benchmark user " * rng.randint(1, 8), avatar=f"/uploads/avatars/{n}.webp",
+                 avatar_variants={"64": f"/uploads/avatars/{n}-64.webp", "256": f"/uploads/avatars/{n}-256.webp"},
+                 created_at=now, updated_at=now)
+            for n in range(rows)
+        ]),
+        "list_experiences": (ExperienceOut, [
+            Experience(id=uuid.uuid4(), professional_info_id=info_id, title=rng.choice(TITLES),
+                       company=rng.choice(COMPANIES), start_date=started, end_date=started + timedelta(days=400),
+                       description="Built and ran things. " * rng.randint(2, 20))
+            for _ in range(rows)
+        ]),
+        "list_educations": (EducationOut, [
+            Education(id=uuid.uuid4(), professional_info_id=info_id, institution=rng.choice(SCHOOLS),
+                      degree="BSc", field_of_study="Computer Science", start_date=started,
+                      end_date=started + timedelta(days=1400), is_current=False, gpa="3.7")
+            for _ in range(rows)
+        ]),
+        "list_projects": (ProjectOut, [
+            Project(id=uuid.uuid4(), professional_info_id=info_id, name=f"Project {n}",
+                    description="A project description. " * rng.randint(2, 20),
+                    technologies=rng.sample(SKILLS, rng.randint(2, 6)), start_date=started,
+                    end_date=started + timedelta(days=300), is_current=False,
+                    project_url="https://example.com", github_url=None,
+                    achievements=[f"Achievement {a}" for a in range(rng.randint(0, 4))], images=[])
+            for n in range(rows)
+        ]),
+    }
+
+
+def _cpu_us(fn: Callable[[], Any], iterations: int) -> float:
+    fn()
+    started = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - started) / iterations * 1e6
+
+
+def measure(rows: int, iterations: int, rng_seed: int = 42) -> Dict[str, Dict[str, float]]:
+    from fastapi.responses import JSONResponse, ORJSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+
+    from app.core.serialization import trusted_response
+
+    loop = asyncio.new_event_loop()
+    results = {}
+    try:
+        for name, (schema, items) in _rows(rows, random.Random(rng_seed)).items():
+            field = create_response_field(name="Response", type_=List[schema])
+
+            def validated(response_class, field=field, items=items):
+                return response_class(loop.run_until_complete(serialize_response(field=field, response_content=items)))
+
+            bodies = {
+                "stdlib": validated(JSONResponse).body,
+                "trusted": trusted_response(schema, items).body,
+            }
+            if json.loads(bodies["stdlib"]) != json.loads(bodies["trusted"]):
+                raise SystemExit(f"{name}: trusted_response does not match response_model output")
+            results[name] = {
+                "stdlib": _cpu_us(lambda: validated(JSONResponse), iterations),
+                "orjson": _cpu_us(lambda: validated(ORJSONResponse), iterations),
+                "trusted": _cpu_us(lambda schema=schema, items=items: trusted_response(schema, items), iterations),
+            }
+    finally:
+        loop.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20, help="rows per page (the API's default page size is 20)")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    results = measure(args.rows, args.iterations, args.seed)
+    print(f"CPU us per request, {args.rows} rows per page")
+    print(f"{'endpoint':<18} {'stdlib':>9} {'orjson':>9} {'trusted':>9} {'saved':>9}")
+    for name, timings in results.items():
+        saved = timings["stdlib"] - timings["trusted"]
+        print(
+            f"{name:<18} {timings['stdlib']:>9.1f} {timings['orjson']:>9.1f} {timings['trusted']:>9.1f} "
+            f"{saved:>8.1f} ({saved / timings['stdlib'] * 100:.0f}%)"
+        )
+
+
+if __name__ == "__main__":
+    main()
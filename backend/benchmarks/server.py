@@ -0,0 +1,24 @@
+"""
+The API as the benchmark serves it. SQLite databases get the
+compatibility shims first, so this module works as an app target for
+both uvicorn and gunicorn:
+
+    python -m benchmarks.server --port 8001
+    gunicorn -c gunicorn.conf.py benchmarks.server:app
+"""
+import argparse
+import os
+
+if os.getenv("DATABASE_URL", "").startswith("sqlite"):
+    import benchmarks.sqlite_compat  # noqa: F401
+
+from app.main import app  # noqa: E402
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
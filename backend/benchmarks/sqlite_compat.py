@@ -0,0 +1,32 @@
+"""
+Let the PostgreSQL-typed models run on SQLite, the containerless stand-in
+used when no PostgreSQL is available. Import before app.main. Search
+needs PostgreSQL and is not available on SQLite.
+"""
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import functions
+
+
+@compiles(UUID, "sqlite")
+def _compile_uuid(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb(type_, compiler, **kw):
+    return "JSON"
+
+
+@compiles(TSVECTOR, "sqlite")
+def _compile_tsvector(type_, compiler, **kw):
+    return "TEXT"
+
+
+@compiles(functions.now, "sqlite")
+def _compile_now(element, compiler, **kw):
+    # SQLite's CURRENT_TIMESTAMP has whole seconds, but SQLAlchemy writes and
+    # binds DateTime as "YYYY-MM-DD HH:MM:SS.ffffff". Stored values are
+    # compared as text, so server defaults (created_at) must use the same
+    # format or keyset pagination skips rows that share a second.
+    return "STRFTIME('%Y-%m-%d %H:%M:%f000', 'now')"
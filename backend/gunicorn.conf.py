@@ -0,0 +1,69 @@
+"""
+Production server settings: gunicorn managing uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Every setting can be overridden through the environment. UvicornWorker
+uses uvloop and httptools automatically when they are installed (they
+come with uvicorn[standard]).
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Prometheus multiprocess mode: workers write metric samples to files here
+# and /metrics aggregates them. Must be set before the app is imported, and
+# emptied on every start so samples from dead processes are not reported.
+if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = os.path.join(tempfile.gettempdir(), "showcasify-metrics")
+shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"])
+
+bind = os.getenv("BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count())))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app once in the master so workers share its memory
+# copy-on-write and a broken import fails before any worker is forked.
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# On SIGTERM workers stop accepting connections and get graceful_timeout
+# seconds to finish in-flight requests and run the lifespan shutdown.
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+keepalive = int(os.getenv("KEEPALIVE", "5"))
+
+# Recycle each worker after a number of requests to bound memory growth;
+# the jitter keeps workers from restarting all at once. 0 disables it.
+max_requests = int(os.getenv("MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "100"))
+
+accesslog = os.getenv("ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    """
+    Drop database connections inherited from the master. close=False
+    leaves the master's sockets alone and only gives the worker a fresh
+    pool of its own.
+    """
+    if not preload_app:
+        return
+    from app.database.database import async_engine, engine
+
+    engine.dispose(close=False)
+    if async_engine is not None:
+        async_engine.sync_engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,58 @@
+"""Move password reset tokens to their own table
+
+Revision ID: b4f0d2a7c913
+Revises: 8c3e6b1d2f47
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4f0d2a7c913'
+down_revision: Union[str, None] = '8c3e6b1d2f47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'password_reset_tokens',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('token_hash', sa.String(length=64), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+    )
+    op.create_index('ix_password_reset_tokens_token_hash', 'password_reset_tokens', ['token_hash'], unique=True)
+    op.create_index('ix_password_reset_tokens_user_id', 'password_reset_tokens', ['user_id'], unique=False)
+    op.create_index('ix_password_reset_tokens_expires_at', 'password_reset_tokens', ['expires_at'], unique=False)
+
+    # Carry over outstanding tokens, stored from now on as their SHA-256
+    op.execute(
+        """
+        INSERT INTO password_reset_tokens (id, token_hash, user_id, expires_at)
+        SELECT gen_random_uuid(), encode(sha256(convert_to(reset_token, 'UTF8')), 'hex'), id, reset_token_expires
+        FROM users
+        WHERE reset_token IS NOT NULL AND reset_token_expires > now()
+        """
+    )
+
+    op.drop_column('users', 'reset_token_expires')
+    op.drop_column('users', 'reset_token')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Only digests were kept, so outstanding tokens cannot be restored
+    op.add_column('users', sa.Column('reset_token', sa.String(), nullable=True))
+    op.add_column('users', sa.Column('reset_token_expires', sa.DateTime(timezone=True), nullable=True))
+    op.drop_index('ix_password_reset_tokens_expires_at', table_name='password_reset_tokens')
+    op.drop_index('ix_password_reset_tokens_user_id', table_name='password_reset_tokens')
+    op.drop_index('ix_password_reset_tokens_token_hash', table_name='password_reset_tokens')
+    op.drop_table('password_reset_tokens')
@@ -0,0 +1,186 @@
+"""Add full-text and skill search over profiles
+
+Revision ID: c7e2a5d91f08
+Revises: b4f0d2a7c913
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2a5d91f08'
+down_revision: Union[str, None] = 'b4f0d2a7c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+SEARCH_DOCUMENT_FUNCTION = """
+CREATE OR REPLACE FUNCTION professional_info_search_document(info_id uuid, owner_id uuid, info_skills jsonb)
+RETURNS tsvector LANGUAGE sql STABLE AS $$
+    SELECT
+        setweight(to_tsvector('english', coalesce((SELECT name FROM users WHERE id = owner_id), '')), 'A')
+        || setweight(to_tsvector('english', coalesce((
+            SELECT string_agg(concat_ws(' ', title, company), ' ')
+            FROM experiences WHERE professional_info_id = info_id
+        ), '')), 'A')
+        || setweight(to_tsvector('english', coalesce((
+            SELECT string_agg(skill, ' ')
+            FROM jsonb_array_elements_text(
+                CASE WHEN jsonb_typeof(info_skills) = 'array' THEN info_skills ELSE '[]'::jsonb END
+            ) AS skill
+        ), '')), 'B')
+        || setweight(to_tsvector('english', coalesce((
+            SELECT string_agg(concat_ws(' ', p.name, t.names), ' ')
+            FROM projects p
+            CROSS JOIN LATERAL (
+                SELECT string_agg(technology, ' ') AS names
+                FROM jsonb_array_elements_text(
+                    CASE WHEN jsonb_typeof(p.technologies::jsonb) = 'array' THEN p.technologies::jsonb ELSE '[]'::jsonb END
+                ) AS technology
+            ) t
+            WHERE p.professional_info_id = info_id
+        ), '')), 'B')
+        || setweight(to_tsvector('english', coalesce((SELECT bio FROM users WHERE id = owner_id), '')), 'C')
+        || setweight(to_tsvector('english', coalesce((
+            SELECT string_agg(description, ' ') FROM experiences WHERE professional_info_id = info_id
+        ), '')), 'D')
+        || setweight(to_tsvector('english', coalesce((
+            SELECT string_agg(description, ' ') FROM projects WHERE professional_info_id = info_id
+        ), '')), 'D')
+$$
+"""
+
+REFRESH = "UPDATE professional_info SET search_vector = professional_info_search_document(id, user_id, skills::jsonb)"
+
+TRIGGER_FUNCTIONS = [
+    """
+    CREATE OR REPLACE FUNCTION professional_info_search_vector_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.search_vector := professional_info_search_document(NEW.id, NEW.user_id, NEW.skills::jsonb);
+        RETURN NEW;
+    END
+    $$
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION refresh_professional_info_search() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            {REFRESH} WHERE id IN (SELECT professional_info_id FROM new_rows);
+        ELSIF TG_OP = 'DELETE' THEN
+            {REFRESH} WHERE id IN (SELECT professional_info_id FROM old_rows);
+        ELSE
+            {REFRESH} WHERE id IN (
+                SELECT professional_info_id FROM new_rows UNION SELECT professional_info_id FROM old_rows
+            );
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION refresh_user_search() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        {REFRESH} WHERE user_id = NEW.id;
+        RETURN NULL;
+    END
+    $$
+    """,
+]
+
+TRIGGERS = [
+    ('professional_info_search_vector', 'professional_info',
+     "BEFORE INSERT OR UPDATE OF user_id, skills ON professional_info "
+     "FOR EACH ROW EXECUTE FUNCTION professional_info_search_vector_trigger()"),
+    ('users_search_update', 'users',
+     "AFTER UPDATE OF name, bio ON users "
+     "FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name OR OLD.bio IS DISTINCT FROM NEW.bio) "
+     "EXECUTE FUNCTION refresh_user_search()"),
+]
+for table in ('experiences', 'projects'):
+    TRIGGERS += [
+        (f'{table}_search_insert', table,
+         f"AFTER INSERT ON {table} REFERENCING NEW TABLE AS new_rows "
+         "FOR EACH STATEMENT EXECUTE FUNCTION refresh_professional_info_search()"),
+        (f'{table}_search_update', table,
+         f"AFTER UPDATE ON {table} REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+         "FOR EACH STATEMENT EXECUTE FUNCTION refresh_professional_info_search()"),
+        (f'{table}_search_delete', table,
+         f"AFTER DELETE ON {table} REFERENCING OLD TABLE AS old_rows "
+         "FOR EACH STATEMENT EXECUTE FUNCTION refresh_professional_info_search()"),
+    ]
+
+# Built CONCURRENTLY, so reads and writes continue while they build
+INDEXES = [
+    ('ix_professional_info_user_id', "professional_info (user_id)"),
+    ('ix_projects_professional_info_id', "projects (professional_info_id)"),
+    ('ix_experiences_professional_info_id', "experiences (professional_info_id)"),
+    ('ix_professional_info_search_vector', "professional_info USING gin (search_vector)"),
+    ('ix_professional_info_skills', "professional_info USING gin ((skills::jsonb) jsonb_path_ops)"),
+    ('ix_projects_technologies', "projects USING gin ((technologies::jsonb) jsonb_path_ops)"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('professional_info', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.execute(SEARCH_DOCUMENT_FUNCTION)
+    for statement in TRIGGER_FUNCTIONS:
+        op.execute(statement)
+    # Triggers first, so rows written during the backfill stay current
+    for name, table, definition in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+        op.execute(f"CREATE TRIGGER {name} {definition}")
+
+    with op.get_context().autocommit_block():
+        # The foreign key indexes come first: every document build looks up
+        # a profile's experiences and projects by professional_info_id
+        for name, definition in INDEXES[:3]:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+
+        # Backfill in primary key order, one short transaction per batch,
+        # so no row stays locked for long
+        connection = op.get_bind()
+        last_id = '00000000-0000-0000-0000-000000000000'
+        while True:
+            count, batch_last_id = connection.execute(
+                sa.text(
+                    f"""
+                    WITH batch AS (
+                        SELECT id AS batch_id FROM professional_info
+                        WHERE id > CAST(:last_id AS uuid)
+                        ORDER BY id
+                        LIMIT :batch_size
+                    ), updated AS (
+                        {REFRESH} FROM batch WHERE professional_info.id = batch.batch_id
+                        RETURNING professional_info.id
+                    )
+                    SELECT count(*), max(id::text) FROM updated
+                    """
+                ),
+                {'last_id': last_id, 'batch_size': BACKFILL_BATCH_SIZE},
+            ).one()
+            if not count:
+                break
+            last_id = batch_last_id
+
+        for name, definition in INDEXES[3:]:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS refresh_user_search()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_professional_info_search()")
+    op.execute("DROP FUNCTION IF EXISTS professional_info_search_vector_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS professional_info_search_document(uuid, uuid, jsonb)")
+    for name, _ in reversed(INDEXES):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.drop_column('professional_info', 'search_vector')
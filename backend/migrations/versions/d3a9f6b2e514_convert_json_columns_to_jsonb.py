@@ -0,0 +1,175 @@
+"""Convert profile and project JSON columns to JSONB
+
+Revision ID: d3a9f6b2e514
+Revises: c7e2a5d91f08
+Create Date: 2026-10-18 14:00:00.000000
+
+ALTER COLUMN ... TYPE jsonb would rewrite each table under an ACCESS
+EXCLUSIVE lock for as long as the rewrite takes. Instead, for each column:
+
+1. add a <column>_jsonb shadow column and a trigger that keeps it in step
+   with every insert and update
+2. backfill the shadow columns in primary key batches, each its own short
+   transaction, and build their GIN indexes CONCURRENTLY
+3. in one brief transaction, drop the old columns and rename the shadows
+   into place (catalog changes only)
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a9f6b2e514'
+down_revision: Union[str, None] = 'c7e2a5d91f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+# Give up on the swap rather than queue behind long transactions while
+# holding up everything that queues behind us
+SWAP_LOCK_TIMEOUT = '10s'
+
+COLUMNS = {
+    'professional_info': ['contact_info', 'social_links', 'skills'],
+    'projects': ['technologies', 'achievements', 'images'],
+}
+
+# (index, table, column) for the search filters, replacing the expression
+# indexes on (column::jsonb)
+GIN_INDEXES = [
+    ('ix_professional_info_skills', 'professional_info', 'skills'),
+    ('ix_projects_technologies', 'projects', 'technologies'),
+]
+
+# refresh_professional_info_search, taught to stand down while the backfill
+# rewrites project rows whose content does not change
+REFRESH = "UPDATE professional_info SET search_vector = professional_info_search_document(id, user_id, skills::jsonb)"
+REFRESH_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION refresh_professional_info_search() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    -- Set by backfills that rewrite rows without changing their content
+    IF current_setting('showcasify.skip_search_refresh', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP = 'INSERT' THEN
+        {REFRESH} WHERE id IN (SELECT professional_info_id FROM new_rows);
+    ELSIF TG_OP = 'DELETE' THEN
+        {REFRESH} WHERE id IN (SELECT professional_info_id FROM old_rows);
+    ELSE
+        {REFRESH} WHERE id IN (
+            SELECT professional_info_id FROM new_rows UNION SELECT professional_info_id FROM old_rows
+        );
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+# Depends on the skills column, so it is recreated around the swap
+SEARCH_VECTOR_TRIGGER = (
+    "CREATE TRIGGER professional_info_search_vector "
+    "BEFORE INSERT OR UPDATE OF user_id, skills ON professional_info "
+    "FOR EACH ROW EXECUTE FUNCTION professional_info_search_vector_trigger()"
+)
+
+
+def _sync_function(table: str) -> str:
+    assignments = "\n".join(f"    NEW.{column}_jsonb := NEW.{column}::jsonb;" for column in COLUMNS[table])
+    return f"""
+CREATE OR REPLACE FUNCTION {table}_jsonb_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+{assignments}
+    RETURN NEW;
+END
+$$
+"""
+
+
+def _backfill(connection, table: str) -> None:
+    assignments = ", ".join(f"{column}_jsonb = {table}.{column}::jsonb" for column in COLUMNS[table])
+    statement = sa.text(
+        f"""
+        WITH batch AS (
+            SELECT id AS batch_id FROM {table}
+            WHERE id > CAST(:last_id AS uuid)
+            ORDER BY id
+            LIMIT :batch_size
+        ), updated AS (
+            UPDATE {table} SET {assignments}
+            FROM batch WHERE {table}.id = batch.batch_id
+            RETURNING {table}.id
+        )
+        SELECT count(*), max(id::text) FROM updated
+        """
+    )
+    last_id = '00000000-0000-0000-0000-000000000000'
+    while True:
+        count, batch_last_id = connection.execute(
+            statement, {'last_id': last_id, 'batch_size': BACKFILL_BATCH_SIZE}
+        ).one()
+        if not count:
+            return
+        last_id = batch_last_id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(REFRESH_FUNCTION)
+    for table, columns in COLUMNS.items():
+        for column in columns:
+            op.add_column(table, sa.Column(f'{column}_jsonb', postgresql.JSONB(), nullable=True))
+        op.execute(_sync_function(table))
+        op.execute(
+            f"CREATE TRIGGER {table}_jsonb_sync BEFORE INSERT OR UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {table}_jsonb_sync()"
+        )
+
+    # Commit the shadow columns and triggers first: from here on every write
+    # fills the shadows, so the backfill only has to cover older rows once
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        connection.execute(sa.text("SET showcasify.skip_search_refresh = 'on'"))
+        try:
+            for table in COLUMNS:
+                _backfill(connection, table)
+        finally:
+            connection.execute(sa.text("RESET showcasify.skip_search_refresh"))
+
+        for name, table, column in GIN_INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name}_jsonb "
+                f"ON {table} USING gin ({column}_jsonb jsonb_path_ops)"
+            )
+
+    op.execute(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'")
+    op.execute("DROP TRIGGER professional_info_search_vector ON professional_info")
+    for table, columns in COLUMNS.items():
+        op.execute(f"DROP TRIGGER {table}_jsonb_sync ON {table}")
+        op.execute(f"DROP FUNCTION {table}_jsonb_sync()")
+        for column in columns:
+            # Also drops the old (column::jsonb) expression indexes
+            op.drop_column(table, column)
+            op.alter_column(table, f'{column}_jsonb', new_column_name=column)
+    for name, _, _ in GIN_INDEXES:
+        op.execute(f"ALTER INDEX {name}_jsonb RENAME TO {name}")
+    op.execute(SEARCH_VECTOR_TRIGGER)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Rewrites both tables under an exclusive lock; not meant to run online
+    op.execute("DROP TRIGGER professional_info_search_vector ON professional_info")
+    for name, _, _ in GIN_INDEXES:
+        op.drop_index(name)
+    for table, columns in COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table, column, type_=sa.JSON(), existing_type=postgresql.JSONB(), postgresql_using=f'{column}::json'
+            )
+    for name, table, column in GIN_INDEXES:
+        op.execute(f"CREATE INDEX {name} ON {table} USING gin (({column}::jsonb) jsonb_path_ops)")
+    op.execute(SEARCH_VECTOR_TRIGGER)
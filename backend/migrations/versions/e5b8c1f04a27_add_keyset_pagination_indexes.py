@@ -0,0 +1,76 @@
+"""Index and require created_at for keyset pagination
+
+Revision ID: e5b8c1f04a27
+Revises: d3a9f6b2e514
+Create Date: 2026-10-18 16:00:00.000000
+
+List endpoints page through rows in (created_at, id) order. Top-level lists
+(users, unfiltered search) need an index on (created_at, id); the
+experience, education and project lists are scoped to one portfolio, so
+theirs lead with professional_info_id. The cursor is built from the last
+row's created_at, so the column also becomes NOT NULL.
+
+SET NOT NULL on its own scans the table under an ACCESS EXCLUSIVE lock.
+A NOT VALID check constraint, validated under a lock that lets reads and
+writes continue, lets Postgres (12+) skip that scan.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b8c1f04a27'
+down_revision: Union[str, None] = 'd3a9f6b2e514'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['users', 'professional_info', 'experiences', 'educations', 'projects']
+# Tables whose created_at was only ever filled in by the application
+NO_SERVER_DEFAULT = ['professional_info', 'educations', 'projects']
+
+# Built CONCURRENTLY, so reads and writes continue while they build
+INDEXES = {
+    'ix_users_created_at_id': 'users (created_at, id)',
+    'ix_professional_info_created_at_id': 'professional_info (created_at, id)',
+    'ix_experiences_professional_info_id_created_at_id': 'experiences (professional_info_id, created_at, id)',
+    'ix_educations_professional_info_id_created_at_id': 'educations (professional_info_id, created_at, id)',
+    'ix_projects_professional_info_id_created_at_id': 'projects (professional_info_id, created_at, id)',
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in NO_SERVER_DEFAULT:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN created_at SET DEFAULT now()")
+    for table in TABLES:
+        op.execute(
+            f"UPDATE {table} SET created_at = COALESCE(updated_at, now()) WHERE created_at IS NULL"
+        )
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {table}_created_at_not_null "
+            f"CHECK (created_at IS NOT NULL) NOT VALID"
+        )
+
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_created_at_not_null")
+        for name, definition in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+
+    for table in TABLES:
+        op.alter_column(table, 'created_at', existing_type=sa.DateTime(), nullable=False)
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {table}_created_at_not_null")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    for table in TABLES:
+        op.alter_column(table, 'created_at', existing_type=sa.DateTime(), nullable=True)
+    for table in NO_SERVER_DEFAULT:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN created_at DROP DEFAULT")
@@ -0,0 +1,25 @@
+import os
+import tempfile
+
+# A throwaway SQLite database, the same stand-in the benchmarks use (see
+# benchmarks.sqlite_compat). Set before the app reads its settings.
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='showcasify-tests-')}/test.db"
+os.environ["ASYNC_DB_ENABLED"] = "false"
+os.environ["DB_AUTO_CREATE"] = "false"
+
+import pytest
+
+import benchmarks.sqlite_compat  # noqa: E402,F401
+import app.models  # noqa: E402,F401
+from app.database.database import Base, SessionLocal, engine  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
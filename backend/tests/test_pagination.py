@@ -0,0 +1,73 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from app.crud import experiences as experience_crud
+from app.crud import user as user_crud
+from app.models import Experience, ProfessionalInfo, User
+
+
+def _page_through(fetch, limit):
+    ids, cursor = [], None
+    while True:
+        page = fetch(cursor, limit)
+        ids.extend(row.id for row in page.items)
+        if page.next_cursor is None:
+            return ids
+        assert page.items, "an empty page must not carry a cursor"
+        cursor = page.next_cursor
+
+
+def _add_users(db, count, created_at=None):
+    rows = [{"id": uuid.uuid4(), "email": f"user{index}@example.com", "name": "User"} for index in range(count)]
+    if created_at is not None:
+        for row in rows:
+            row["created_at"] = created_at
+    # Core insert, so rows without created_at get the server default
+    db.execute(insert(User), rows)
+    db.commit()
+    return sorted(row["id"] for row in rows)
+
+
+def test_users_sharing_created_at_are_all_paged_in_id_order(db):
+    expected = _add_users(db, 5, created_at=datetime(2024, 1, 1, 12, 0, 0))
+
+    ids = _page_through(lambda cursor, limit: user_crud.get_users(db, cursor=cursor, limit=limit), limit=2)
+
+    assert ids == expected
+
+
+def test_users_with_server_default_created_at_are_all_paged(db):
+    expected = _add_users(db, 5)
+
+    ids = _page_through(lambda cursor, limit: user_crud.get_users(db, cursor=cursor, limit=limit), limit=2)
+
+    assert sorted(ids) == expected
+    assert len(set(ids)) == len(ids)
+
+
+def test_experiences_sharing_created_at_are_all_paged(db):
+    user_id = _add_users(db, 1)[0]
+    professional_info_id = uuid.uuid4()
+    db.add(ProfessionalInfo(id=professional_info_id, user_id=user_id))
+    db.flush()
+    experience_ids = [uuid.uuid4() for _ in range(4)]
+    db.execute(insert(Experience), [
+        {
+            "id": experience_id,
+            "professional_info_id": professional_info_id,
+            "title": "Engineer",
+            "company": "Acme",
+            "start_date": datetime(2020, 1, 1).date(),
+        }
+        for experience_id in experience_ids
+    ])
+    db.commit()
+
+    ids = _page_through(
+        lambda cursor, limit: experience_crud.get_experiences(db, user_id, cursor=cursor, limit=limit), limit=2
+    )
+
+    assert sorted(ids) == sorted(experience_ids)
+    assert len(set(ids)) == len(ids)